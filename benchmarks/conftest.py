@@ -0,0 +1,36 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.fiken_object import FikenObject
+
+SAMPLES_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, "test", "sample_model_responses"
+)
+
+
+def get_sample(filename: str) -> dict:
+    with open(os.path.join(SAMPLES_DIR, f"{filename}.json"), "r") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="session")
+def fake_server():
+    FikenObject.clear_auth_token()
+    FikenObject.set_auth_token("BENCHMARK_TOKEN")
+    with FakeFikenServer() as server:
+        FikenObject.set_company_slug(server.company_slug)
+        yield server
+    FikenObject.clear_auth_token()
+    FikenObject.clear_company_slug()
+
+
+@pytest.fixture
+def server(fake_server: FakeFikenServer) -> FakeFikenServer:
+    """The shared fake server, emptied before each benchmark."""
+    fake_server.reset()
+    return fake_server
@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from fiken_py.dedup import DuplicateIndex
+from fiken_py.models import Contact
+
+EXISTING = 50_000
+IMPORTED = 20_000
+
+
+@pytest.fixture(scope="module")
+def contacts() -> list[Contact]:
+    return [
+        Contact(
+            contactId=i,
+            name=f"Kunde {i} AS",
+            organizationNumber=str(900_000_000 + i) if i % 2 else None,
+            email=f"post@kunde{i}.no" if i % 3 else None,
+        )
+        for i in range(EXISTING)
+    ]
+
+
+@pytest.fixture(scope="module")
+def imported() -> list[dict]:
+    rng = random.Random(1)
+    rows = []
+    for _ in range(IMPORTED):
+        i = rng.randrange(2 * EXISTING)
+        rows.append({"name": f"KUNDE {i}", "organizationNumber": str(900_000_000 + i)})
+    return rows
+
+
+def test_build_index(benchmark, contacts):
+    benchmark.pedantic(DuplicateIndex, args=(contacts,), rounds=3)
+
+
+def test_plan_import(benchmark, contacts, imported):
+    plan = benchmark.pedantic(
+        lambda: DuplicateIndex(contacts).plan(imported), rounds=3, iterations=1
+    )
+
+    assert len(plan.creates) + len(plan.updates) + plan.merged == IMPORTED
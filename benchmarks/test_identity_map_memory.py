@@ -0,0 +1,54 @@
+import copy
+import gc
+import tracemalloc
+
+import pytest
+
+from fiken_py.identity_map import IdentityMap
+from fiken_py.models import Invoice
+from conftest import get_sample
+
+INVOICES = 2000
+CUSTOMERS = 20
+
+
+def _invoice_page() -> list[dict]:
+    sample = get_sample("invoice")
+    page = []
+    for i in range(INVOICES):
+        data = copy.deepcopy(sample)
+        data["invoiceId"] = i
+        data["customer"]["contactId"] = i % CUSTOMERS
+        page.append(data)
+    return page
+
+
+def _parse(page: list[dict], shared: bool) -> list[Invoice]:
+    if not shared:
+        return [Invoice._from_response_data(item) for item in page]
+    with IdentityMap():
+        return [Invoice._from_response_data(item) for item in page]
+
+
+def _retained_bytes(page: list[dict], shared: bool) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        invoices = _parse(page, shared)
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(invoices) == INVOICES
+    return retained
+
+
+@pytest.mark.parametrize("shared", [False, True], ids=["separate", "identity_map"])
+def test_parse_invoices_memory(benchmark, shared):
+    """Parses 2000 invoices with 20 distinct customers, and records the memory they retain."""
+    page = _invoice_page()
+
+    benchmark.extra_info["retained_bytes"] = _retained_bytes(page, shared)
+    invoices = benchmark(_parse, page, shared)
+
+    customers = {id(invoice.customer) for invoice in invoices}
+    assert len(customers) == (CUSTOMERS if shared else INVOICES)
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import fiken_py.models",
+        "from fiken_py.models import Contact",
+        "from fiken_py.models import Invoice",
+        "from fiken_py.models import Company",
+        "from fiken_py.models import Contact; Contact.model_validate({'name': 'x'})",
+    ],
+    ids=["package", "contact", "invoice", "company", "contact-validated"],
+)
+def test_cold_import(benchmark, statement):
+    """A fresh interpreter running the statement, as a CLI tool or serverless handler starts."""
+    command = [sys.executable, "-c", statement]
+
+    benchmark.pedantic(subprocess.run, args=(command,), kwargs={"check": True}, rounds=5)
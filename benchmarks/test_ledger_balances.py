@@ -0,0 +1,55 @@
+import datetime
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from fiken_py.ledger import Ledger  # noqa: E402
+
+ACCOUNTS = ["1500:1000%d" % i for i in range(50)] + ["1920", "2400", "2700", "3000", "4000", "6300"]
+MONTH_ENDS = [
+    datetime.date(2024, month + 1, 1) - datetime.timedelta(days=1) for month in range(1, 12)
+] + [datetime.date(2024, 12, 31)]
+
+
+@pytest.fixture(scope="module")
+def entries() -> list[dict]:
+    rng = random.Random(1)
+    start = datetime.date(2024, 1, 1)
+    return [
+        {
+            "journalEntryId": i,
+            "date": (start + datetime.timedelta(days=rng.randrange(366))).isoformat(),
+            "lines": [
+                {
+                    "amount": (amount := rng.randrange(1, 100_000)),
+                    "account": rng.choice(ACCOUNTS),
+                    "projectId": [rng.randrange(10)],
+                },
+                {"amount": -amount, "account": rng.choice(ACCOUNTS)},
+            ],
+        }
+        for i in range(100_000)
+    ]
+
+
+def test_build_ledger(benchmark, entries):
+    ledger = benchmark.pedantic(Ledger, args=(entries,), rounds=3)
+
+    assert len(ledger) == 200_000
+
+
+def test_month_end_balances(benchmark, entries):
+    """Balances for 12 month-ends, per main account and for one project."""
+    ledger = Ledger(entries)
+
+    def month_ends():
+        return (
+            ledger.balances(MONTH_ENDS, main_accounts=True),
+            ledger.balances(MONTH_ENDS, project=3),
+        )
+
+    table, _ = benchmark(month_ends)
+
+    assert table.values[:, -1].sum() == 0
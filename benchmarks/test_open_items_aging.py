@@ -0,0 +1,46 @@
+import datetime
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from fiken_py.open_items import OpenItems  # noqa: E402
+
+AS_OF = datetime.date(2024, 12, 31)
+
+
+@pytest.fixture(scope="module")
+def sales() -> list[dict]:
+    rng = random.Random(1)
+    start = datetime.date(2024, 1, 1)
+    documents = []
+    for i in range(300_000):
+        date = start + datetime.timedelta(days=rng.randrange(366))
+        documents.append(
+            {
+                "saleId": i,
+                "date": date.isoformat(),
+                "dueDate": (date + datetime.timedelta(days=14)).isoformat(),
+                "netAmount": 8000,
+                "vatAmount": 2000,
+                "outstandingBalance": rng.choice((0, 5000, 10000)),
+                "settled": False,
+                "customer": {"contactId": rng.randrange(5000), "name": "Customer"},
+            }
+        )
+    return documents
+
+
+def test_build_open_items(benchmark, sales):
+    items = benchmark.pedantic(OpenItems.from_documents, kwargs={"sales": sales}, rounds=3)
+
+    assert len(items) > 150_000
+
+
+def test_aging_per_customer(benchmark, sales):
+    items = OpenItems.from_documents(sales=sales)
+
+    report = benchmark(items.aging, AS_OF)
+
+    assert len(report.contacts) > 4000
@@ -0,0 +1,36 @@
+import pytest
+
+from fiken_py.models import Contact
+
+PAGE_SIZE = 100
+
+
+@pytest.mark.parametrize("pages", [1, 10, 40])
+def test_get_all(benchmark, server, pages):
+    server.add(
+        Contact,
+        [{"name": f"Contact {i}", "customer": True} for i in range(pages * PAGE_SIZE)],
+    )
+
+    contacts = benchmark(Contact.getAll, pageSize=PAGE_SIZE)
+
+    assert len(contacts) == pages * PAGE_SIZE
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+def test_iter_pages_concurrent(benchmark, server, max_workers):
+    server.latency = 0.005
+    server.add(Contact, [{"name": f"Contact {i}"} for i in range(20 * PAGE_SIZE)])
+
+    def fetch():
+        return sum(
+            len(page)
+            for page in Contact.iter_pages(pageSize=PAGE_SIZE, max_workers=max_workers)
+        )
+
+    try:
+        count = benchmark(fetch)
+    finally:
+        server.latency = 0.0
+
+    assert count == 20 * PAGE_SIZE
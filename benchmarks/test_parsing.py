@@ -0,0 +1,41 @@
+import copy
+
+import pytest
+
+from fiken_py.models import Invoice, JournalEntry
+from conftest import get_sample
+
+
+def _with_lines(sample: dict, count: int) -> dict:
+    data = copy.deepcopy(sample)
+    data["lines"] = [
+        copy.deepcopy(sample["lines"][i % len(sample["lines"])]) for i in range(count)
+    ]
+    return data
+
+
+@pytest.mark.parametrize("lines", [10, 500])
+def test_parse_invoice(benchmark, lines):
+    data = _with_lines(get_sample("invoice"), lines)
+
+    invoice = benchmark(Invoice.model_validate, data)
+
+    assert len(invoice.lines) == lines
+
+
+@pytest.mark.parametrize("lines", [10, 1000])
+def test_parse_journal_entry(benchmark, lines):
+    data = _with_lines(get_sample("journal_entry"), lines)
+
+    entry = benchmark(JournalEntry.model_validate, data)
+
+    assert len(entry.lines) == lines
+
+
+def test_parse_invoice_page(benchmark):
+    """A full page of 100 invoices, as getAll parses it."""
+    page = [get_sample("invoice") for _ in range(100)]
+
+    invoices = benchmark(lambda: [Invoice(**item) for item in page])
+
+    assert len(invoices) == 100
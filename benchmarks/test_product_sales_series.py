@@ -0,0 +1,56 @@
+import datetime
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from fiken_py.sales_analytics import ProductSales  # noqa: E402
+
+INVOICES = 50_000
+LINES_PER_INVOICE = 4
+PRODUCTS = 2_000
+START = datetime.date(2024, 1, 1)
+
+
+@pytest.fixture(scope="module")
+def invoices() -> list[dict]:
+    rng = random.Random(1)
+    invoices = []
+    for i in range(INVOICES):
+        lines = []
+        for _ in range(LINES_PER_INVOICE):
+            net = rng.randrange(100, 100_000)
+            lines.append(
+                {
+                    "productId": rng.randrange(PRODUCTS),
+                    "quantity": rng.randrange(1, 10),
+                    "netInNok": net,
+                    "vatInNok": net // 4,
+                    "grossInNok": net + net // 4,
+                }
+            )
+        issued = START + datetime.timedelta(days=rng.randrange(366))
+        invoices.append({"invoiceId": i, "issueDate": issued.isoformat(), "lines": lines})
+    return invoices
+
+
+@pytest.fixture(scope="module")
+def sales(invoices) -> ProductSales:
+    return ProductSales(invoices=invoices)
+
+
+def test_build(benchmark, invoices):
+    benchmark.pedantic(ProductSales, kwargs={"invoices": invoices}, rounds=3)
+
+
+def test_daily_and_weekly_series(benchmark, sales):
+    days = [(START + datetime.timedelta(days=i),) * 2 for i in range(366)]
+    weeks = [
+        (START + datetime.timedelta(weeks=i), START + datetime.timedelta(weeks=i, days=6))
+        for i in range(52)
+    ]
+
+    series = benchmark(sales.series, days + weeks)
+
+    assert series.sold.shape == (PRODUCTS, 418, 5)
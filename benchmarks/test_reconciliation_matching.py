@@ -0,0 +1,68 @@
+import datetime
+import random
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from fiken_py.open_items import OpenItems  # noqa: E402
+from fiken_py.reconciliation import Reconciler, StatementLine  # noqa: E402
+
+OPEN_ITEMS = 100_000
+LINES = 20_000
+
+
+@pytest.fixture(scope="module")
+def items() -> OpenItems:
+    rng = random.Random(1)
+    start = datetime.date(2024, 1, 1)
+    sales = []
+    for i in range(OPEN_ITEMS):
+        due = start + datetime.timedelta(days=rng.randrange(366))
+        amount = rng.randrange(100, 10_000_000)
+        contact = rng.randrange(10_000)
+        sales.append(
+            {
+                "saleId": i,
+                "saleNumber": f"S{i}",
+                "date": due.isoformat(),
+                "dueDate": due.isoformat(),
+                "netAmount": amount,
+                "vatAmount": 0,
+                "outstandingBalance": amount,
+                "kid": f"{i:09d}" if i % 2 else None,
+                "customer": {"contactId": contact, "name": f"Customer {contact} AS"},
+            }
+        )
+    return OpenItems.from_documents(sales=sales)
+
+
+@pytest.fixture(scope="module")
+def lines(items: OpenItems) -> list[StatementLine]:
+    rng = random.Random(2)
+    lines = []
+    for row in rng.sample(range(len(items)), LINES):
+        item = items.item(*items.keys[row])
+        date = item.dueDate + datetime.timedelta(days=rng.randrange(-5, 6))
+        kind = rng.randrange(3)
+        lines.append(
+            StatementLine(
+                date=date,
+                amount=item.outstanding,
+                kid=item.kid if kind == 0 else None,
+                reference=f"Betaling {item.number}" if kind == 2 else None,
+            )
+        )
+    return lines
+
+
+def test_build_indexes(benchmark, items):
+    benchmark.pedantic(Reconciler, args=(items,), rounds=3)
+
+
+def test_match_statement(benchmark, items, lines):
+    result = benchmark.pedantic(
+        lambda: Reconciler(items).match(lines), rounds=3, iterations=1
+    )
+
+    assert len(result.matches) > 0.95 * LINES
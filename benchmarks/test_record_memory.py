@@ -0,0 +1,53 @@
+import copy
+import gc
+import tracemalloc
+
+import pytest
+
+from fiken_py.models import JournalEntry
+from fiken_py.records import record_type
+from conftest import get_sample
+
+ENTRIES = 2000
+
+
+def _journal_page() -> list[dict]:
+    sample = get_sample("journal_entry")
+    page = []
+    for i in range(ENTRIES):
+        data = copy.deepcopy(sample)
+        data["journalEntryId"] = i
+        page.append(data)
+    return page
+
+
+def _as_models(page: list[dict]) -> list:
+    return [JournalEntry(**item) for item in page]
+
+
+def _as_records(page: list[dict]) -> list:
+    cls = record_type(JournalEntry)
+    return [cls.from_dict(item) for item in page]
+
+
+def _retained_bytes(build, page: list[dict]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        built = build(page)
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert len(built) == ENTRIES
+    return retained
+
+
+@pytest.mark.parametrize("build", [_as_models, _as_records], ids=["models", "records"])
+def test_journal_entries_memory(benchmark, build):
+    """Builds 2000 journal entries, and records the memory they retain."""
+    page = _journal_page()
+
+    benchmark.extra_info["retained_bytes"] = _retained_bytes(build, page)
+    entries = benchmark(build, page)
+
+    assert len(entries) == ENTRIES
@@ -0,0 +1,37 @@
+import copy
+
+import pytest
+
+from fiken_py.models import Invoice, Purchase, Sale
+from conftest import get_sample
+
+# Each object has this many lines, and a batch is this many objects
+LINES = 20
+BATCH = 200
+
+
+def _batch(model, filename: str, **changes) -> list:
+    data = copy.deepcopy(get_sample(filename))
+    data.update(changes)
+    data["lines"] = [data["lines"][i % len(data["lines"])] for i in range(LINES)]
+    obj = model.model_validate(data)
+    return [obj.model_copy() for _ in range(BATCH)]
+
+
+@pytest.mark.parametrize(
+    "model,filename,changes,kwargs",
+    [
+        (Invoice, "invoice", {}, {"bankAccountCode": "1920:10001", "paymentAccount": "1920:10001"}),
+        (Sale, "sale", {"paymentAccount": "1920:10001"}, {}),
+        (Purchase, "purchase", {"paymentAccount": "1920:10001", "paymentDate": "2024-01-01"}, {}),
+    ],
+    ids=["invoice", "sale", "purchase"],
+)
+def test_build_requests(benchmark, model, filename, changes, kwargs):
+    """Request objects for a batch of objects, as bulk_save builds them."""
+    objects = _batch(model, filename, **changes)
+
+    requests = benchmark(lambda: [obj._to_request_object(**kwargs) for obj in objects])
+
+    assert len(requests) == BATCH
+    assert len(requests[0].lines) == LINES
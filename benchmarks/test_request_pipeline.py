@@ -0,0 +1,44 @@
+from fiken_py.fiken_object import RequestMethod
+from fiken_py.models import Contact
+
+
+def test_execute_method_overhead(benchmark, server):
+    """Per-request client overhead, against a local server with no latency."""
+    contact_id = server.add(Contact, [{"name": "Benchmark"}])[0]["contactId"]
+
+    response = benchmark(
+        Contact._execute_method,
+        RequestMethod.GET,
+        contactId=contact_id,
+        companySlug=server.company_slug,
+    )
+
+    assert response.status_code == 200
+
+
+def test_get_single(benchmark, server):
+    contact_id = server.add(Contact, [{"name": "Benchmark"}])[0]["contactId"]
+
+    contact = benchmark(Contact.get, contactId=contact_id)
+
+    assert contact.contactId == contact_id
+
+
+def test_save_new(benchmark, server):
+    """POST followed by GET of the Location."""
+
+    def save():
+        return Contact(name="Benchmark", customer=True).save()
+
+    contact = benchmark(save)
+
+    assert contact.contactId is not None
+
+
+def test_save_existing(benchmark, server):
+    """PUT followed by GET of the Location."""
+    contact = Contact(name="Benchmark", customer=True).save()
+
+    saved = benchmark(contact.save)
+
+    assert saved.contactId == contact.contactId
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from fiken_py.models import Contact, Invoice
+from fiken_py.search import SearchIndex
+
+CONTACTS = 50_000
+INVOICES = 50_000
+WORDS = ["bygg", "regnskap", "transport", "eiendom", "consulting", "marin", "data", "handel"]
+CITIES = ["Oslo", "Bergen", "Trondheim", "Tromsø", "Stavanger", "Bodø"]
+
+
+@pytest.fixture(scope="module")
+def objects() -> list:
+    rng = random.Random(1)
+    contacts = [
+        Contact(
+            contactId=i,
+            name=f"{rng.choice(['Hansen', 'Olsen', 'Berg', 'Lie', 'Dahl'])}{i} {rng.choice(WORDS)} AS",
+            email=f"post@firma{i}.no",
+            phoneNumber=f"+47 9{i:07d}",
+            address={"streetAddress": f"Gate {i}", "city": rng.choice(CITIES), "country": "Norge"},
+        )
+        for i in range(CONTACTS)
+    ]
+    invoices = [
+        Invoice(
+            invoiceId=i,
+            invoiceNumber=10_000 + i,
+            kid=f"{i:09d}",
+            yourReference=f"Ordre {rng.randrange(100_000)}",
+            customer=contacts[rng.randrange(CONTACTS)],
+        )
+        for i in range(INVOICES)
+    ]
+    return contacts + invoices
+
+
+@pytest.fixture(scope="module")
+def index(objects) -> SearchIndex:
+    return SearchIndex(objects)
+
+
+def test_build_index(benchmark, objects):
+    benchmark.pedantic(SearchIndex, args=(objects,), rounds=1)
+
+
+@pytest.mark.parametrize("query", ["hansen12", "olsen bygg oslo", "9001", "ordre 4", "b"])
+def test_query(benchmark, index, query):
+    results = benchmark(index.search, query)
+
+    assert results
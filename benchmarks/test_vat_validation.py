@@ -0,0 +1,61 @@
+import itertools
+
+import pytest
+
+from fiken_py.shared_enums import VatTypeProductSale
+from fiken_py.vat_validation import VATValidator
+
+ACCOUNTS = ["3000", "3030", "3050", "3100", "3129", "3200", "3210", "3909"]
+LINES = list(itertools.product(VATValidator.vat_types_product_sale, ACCOUNTS))
+
+
+def test_validate_account_per_line(benchmark):
+    def validate():
+        return [
+            VATValidator.validate_vat_type_sale(vat_type, account_code=account)
+            for vat_type, account in LINES
+        ]
+
+    results = benchmark(validate)
+
+    assert len(results) == len(LINES)
+
+
+def test_validate_percentage(benchmark):
+    result = benchmark(
+        VATValidator.validate_vat_type_sale, VatTypeProductSale.HIGH, percentage=25
+    )
+
+    assert result
+
+
+def test_validate_million_lines(benchmark):
+    lines = (LINES * (1_000_000 // len(LINES) + 1))[:1_000_000]
+
+    def validate():
+        validate_sale = VATValidator.validate_vat_type_sale
+        return sum(
+            validate_sale(vat_type, account_code=account) for vat_type, account in lines
+        )
+
+    valid = benchmark.pedantic(validate, rounds=3, iterations=1)
+
+    assert 0 < valid < len(lines)
+
+
+def test_validate_sale_lines_bulk(benchmark):
+    """500k lines validated in one vectorized call."""
+    pytest.importorskip("numpy")
+    lines = (LINES * (500_000 // len(LINES) + 1))[:500_000]
+    vat_types = [vat_type for vat_type, _ in lines]
+    accounts = [account for _, account in lines]
+
+    result = benchmark.pedantic(
+        VATValidator.validate_sale_lines,
+        args=(vat_types,),
+        kwargs={"account_codes": accounts},
+        rounds=3,
+        iterations=1,
+    )
+
+    assert 0 < int(result.valid.sum()) < len(lines)
@@ -0,0 +1,5 @@
+import sys
+
+from fiken_py.cli import main
+
+sys.exit(main())
@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Iterable, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from fiken_py.fiken_object import FikenObject, OptionalAccessToken
+
+logger = logging.getLogger("fiken_py")
+
+
+class BulkProgress(BaseModel):
+    done: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Items processed per second."""
+        return (self.done + self.failed) / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class BulkResult(BaseModel):
+    """Outcome of a bulk operation.
+    results holds the return values of the successful calls, in completion order,
+    and errors holds (item, exception) pairs for the failed ones.
+    For bulk_save, unchanged counts the objects that were skipped because nothing had changed."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    results: list[Any] = []
+    errors: list[tuple[Any, Exception]] = []
+    unchanged: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def succeeded(self) -> int:
+        return len(self.results)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+
+def run_bulk(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    max_workers: int = 4,
+    on_progress: Optional[Callable[[BulkProgress], None]] = None,
+) -> BulkResult:
+    """Calls func on every item with bounded concurrency.
+    Items are consumed lazily, so at most 2 * max_workers items are in flight at a time.
+    Failures are collected in the result instead of stopping the run.
+    """
+    result = BulkResult()
+    progress = BulkProgress()
+    lock = threading.Lock()
+    start = time.monotonic()
+
+    def finished(item, future):
+        with lock:
+            try:
+                result.results.append(future.result())
+                progress.done += 1
+            except Exception as e:
+                logger.warning(f"Bulk operation failed for {item!r}: {e}")
+                result.errors.append((item, e))
+                progress.failed += 1
+            progress.elapsed = time.monotonic() - start
+            if on_progress is not None:
+                on_progress(progress.model_copy())
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight = {}
+        for item in items:
+            if len(in_flight) >= 2 * max_workers:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished(in_flight.pop(future), future)
+            in_flight[executor.submit(func, item)] = item
+
+        for future in list(in_flight):
+            future.exception()
+            finished(in_flight.pop(future), future)
+
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+def bulk_save(
+    objects: Iterable[FikenObject],
+    token: OptionalAccessToken = None,
+    max_workers: int = 4,
+    on_progress: Optional[Callable[[BulkProgress], None]] = None,
+    **kwargs,
+) -> BulkResult:
+    """Saves many objects concurrently. kwargs are passed on to every save() call.
+    Objects which are unchanged since they were loaded are not sent, but counted in result.unchanged.
+    :return: BulkResult with the saved objects, and the objects which failed"""
+    unchanged = 0
+    lock = threading.Lock()
+
+    def save(obj: FikenObject) -> FikenObject:
+        nonlocal unchanged
+        if obj.is_unchanged():
+            with lock:
+                unchanged += 1
+            return obj
+        return obj.save(token=token, **kwargs)
+
+    result = run_bulk(
+        save, objects, max_workers=max_workers, on_progress=on_progress
+    )
+    result.unchanged = unchanged
+    return result
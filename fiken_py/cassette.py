@@ -0,0 +1,212 @@
+import base64
+import collections
+import datetime
+import gzip
+import http
+import json
+import logging
+import os
+import threading
+import time
+from typing import IO, Any, Callable, Literal, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from fiken_py.errors import RequestNotRecordedException
+from fiken_py.fiken_object import FikenObject
+
+logger = logging.getLogger("fiken_py")
+
+type CassetteMode = Literal["record", "replay"]
+
+# Request headers that are not written to the cassette
+_SKIPPED_HEADERS = {"x-request-id"}
+
+
+def _open(path: str, mode: str) -> IO[str]:
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _prepare(
+    method: str, url: str, params: Optional[dict], data: Optional[str | dict], files
+) -> tuple[str, Optional[str]]:
+    """The full URL (with query) and the body of the request, as requests sends them.
+    Multipart bodies have random boundaries, so they are not recorded."""
+    prepared = requests.Request(
+        method, url, params=params, data=data if files is None else None
+    ).prepare()
+    body = prepared.body
+    if files is not None:
+        body = None
+    elif isinstance(body, bytes):
+        body = body.decode("utf-8")
+    return prepared.url, body
+
+
+class Cassette:
+    """Records requests and responses to a file, and serves them again without a network.
+
+    Used as a context manager, which sets it as the transport of FikenObject:
+        with Cassette("contacts.ndjson.gz", mode="record"):
+            Contact.getAll()
+        with Cassette("contacts.ndjson.gz"):
+            Contact.getAll()  # Served from the cassette
+
+    The file has one JSON object per line (gzipped if the name ends in .gz). The Authorization
+    header is redacted. Requests are matched on method, URL with query and body. Repeated identical
+    requests are served in the recorded order, and the last one is served again when they run out.
+    :param path: the cassette file
+    :param mode: "record" sends the requests and writes the cassette on exit, "replay" reads it
+    :param replay_timing: if True, replayed responses take as long as when they were recorded
+    :param speed: divides the recorded timing, e.g. 2.0 replays twice as fast
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        mode: CassetteMode = "replay",
+        replay_timing: bool = False,
+        speed: float = 1.0,
+    ):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Unknown cassette mode {mode!r}")
+        self.path = os.fspath(path)
+        self.mode = mode
+        self.replay_timing = replay_timing
+        self.speed = speed
+        self.interactions: list[dict] = []
+
+        self._served: dict[tuple, collections.deque] = {}
+        self._lock = threading.Lock()
+        self._previous_transport = None
+        self._previous_rate_limit = True
+
+        if mode == "replay":
+            self.load()
+
+    def __enter__(self) -> "Cassette":
+        self._previous_transport = FikenObject._TRANSPORT
+        FikenObject.set_transport(self)
+        if self.mode == "replay":
+            self._previous_rate_limit = FikenObject._RATE_LIMIT_ENABLED
+            FikenObject.set_rate_limit(False)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        FikenObject.set_transport(self._previous_transport)
+        if self.mode == "replay":
+            FikenObject.set_rate_limit(self._previous_rate_limit)
+        else:
+            self.save()
+
+    def load(self):
+        with _open(self.path, "r") as f:
+            self.interactions = [json.loads(line) for line in f if line.strip()]
+
+        self._served = collections.defaultdict(collections.deque)
+        for interaction in self.interactions:
+            self._served[self._key(interaction["request"])].append(interaction)
+        logger.debug(f"Loaded {len(self.interactions)} interactions from {self.path}")
+
+    def save(self):
+        with self._lock, _open(self.path, "w") as f:
+            for interaction in self.interactions:
+                f.write(json.dumps(interaction, ensure_ascii=False, separators=(",", ":")))
+                f.write("\n")
+        logger.debug(f"Saved {len(self.interactions)} interactions to {self.path}")
+
+    @staticmethod
+    def _key(request: dict) -> tuple:
+        return request["method"], request["url"], request["body"]
+
+    def __call__(
+        self,
+        method: str,
+        url: str,
+        headers: Optional[dict] = None,
+        params: Optional[dict] = None,
+        data: Optional[str | dict] = None,
+        files: Optional[dict] = None,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> requests.Response:
+        full_url, body = _prepare(method, url, params, data, files)
+        request = {"method": method, "url": full_url, "body": body}
+
+        if self.mode == "replay":
+            return self._replay(request)
+
+        transport: Callable[..., requests.Response] = (
+            self._previous_transport or requests.request
+        )
+        start = time.perf_counter()
+        response = transport(
+            method,
+            url,
+            headers=headers,
+            params=params,
+            data=data,
+            files=files,
+            stream=stream,
+            **kwargs,
+        )
+        content = response.content  # Read the body, also for streamed responses
+        elapsed = time.perf_counter() - start
+
+        request["headers"] = self._redact(headers or {})
+        recorded_response = {
+            "status": response.status_code,
+            "headers": dict(response.headers),
+            "elapsed": elapsed,
+        }
+        try:
+            recorded_response["body"] = content.decode("utf-8")
+        except UnicodeDecodeError:
+            recorded_response["bodyBase64"] = base64.b64encode(content).decode("ascii")
+
+        with self._lock:
+            self.interactions.append({"request": request, "response": recorded_response})
+        return response
+
+    @staticmethod
+    def _redact(headers: dict) -> dict:
+        redacted = {}
+        for name, value in headers.items():
+            if name.lower() in _SKIPPED_HEADERS:
+                continue
+            if name.lower() == "authorization":
+                value = "Bearer [REDACTED]"
+            redacted[name] = value
+        return redacted
+
+    def _replay(self, request: dict) -> requests.Response:
+        with self._lock:
+            queue = self._served.get(self._key(request))
+            if not queue:
+                raise RequestNotRecordedException(
+                    f"No recorded response for {request['method']} {request['url']} in {self.path}"
+                )
+            interaction = queue[0]
+            if len(queue) > 1:
+                queue.popleft()
+
+        recorded = interaction["response"]
+        if self.replay_timing and recorded.get("elapsed"):
+            time.sleep(recorded["elapsed"] / self.speed)
+
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = http.HTTPStatus(recorded["status"]).phrase
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.url = request["url"]
+        response.encoding = "utf-8"
+        if "bodyBase64" in recorded:
+            response._content = base64.b64decode(recorded["bodyBase64"])
+        else:
+            response._content = recorded.get("body", "").encode("utf-8")
+        response._content_consumed = True
+        response.elapsed = datetime.timedelta(seconds=recorded.get("elapsed", 0.0))
+        return response
@@ -0,0 +1,297 @@
+import argparse
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+from typing import IO, Callable, Iterator, Optional
+
+from fiken_py.bulk import bulk_save, BulkProgress
+from fiken_py.fiken_object import FikenObject
+from fiken_py.models import (
+    BalanceAccount,
+    BankAccount,
+    Contact,
+    CreditNote,
+    CreditNoteDraft,
+    InboxDocument,
+    Invoice,
+    InvoiceDraft,
+    JournalEntry,
+    Offer,
+    OfferDraft,
+    OrderConfirmation,
+    OrderConfirmationDraft,
+    Product,
+    Project,
+    Purchase,
+    PurchaseDraft,
+    Sale,
+    SaleDraft,
+    Transaction,
+)
+
+logger = logging.getLogger("fiken_py")
+
+# Collection names accepted on the command line, named after the API paths
+COLLECTIONS: dict[str, type[FikenObject]] = {
+    "accounts": BalanceAccount,
+    "bank-accounts": BankAccount,
+    "contacts": Contact,
+    "credit-notes": CreditNote,
+    "credit-note-drafts": CreditNoteDraft,
+    "inbox": InboxDocument,
+    "invoices": Invoice,
+    "invoice-drafts": InvoiceDraft,
+    "journal-entries": JournalEntry,
+    "offers": Offer,
+    "offer-drafts": OfferDraft,
+    "order-confirmations": OrderConfirmation,
+    "order-confirmation-drafts": OrderConfirmationDraft,
+    "products": Product,
+    "projects": Project,
+    "purchases": Purchase,
+    "purchase-drafts": PurchaseDraft,
+    "sales": Sale,
+    "sale-drafts": SaleDraft,
+    "transactions": Transaction,
+}
+
+# How often progress is written to stderr, in seconds
+PROGRESS_INTERVAL = 1.0
+
+
+def _open(path: Optional[str], mode: str, compress: bool = False) -> IO[str]:
+    """Opens path for reading or writing text, using stdin/stdout for None or "-".
+    Files ending in .gz (or any file when compress is set) are gzipped."""
+    if path is None or path == "-":
+        stream = sys.stdout if "w" in mode else sys.stdin
+        if compress:
+            return gzip.open(stream.buffer, mode + "t", encoding="utf-8")
+        return stream
+    if compress or path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _parse_params(params: list[str]) -> dict[str, str]:
+    parsed = {}
+    for param in params:
+        key, sep, value = param.partition("=")
+        if not sep:
+            raise argparse.ArgumentTypeError(
+                f"Parameter {param!r} must be on the form key=value"
+            )
+        parsed[key] = value
+    return parsed
+
+
+class _ProgressReporter:
+    """Writes progress and throughput to stderr, at most once per PROGRESS_INTERVAL."""
+
+    def __init__(self, verb: str, quiet: bool = False):
+        self.verb = verb
+        self.quiet = quiet
+        self.start = time.monotonic()
+        self.last_report = 0.0
+
+    def __call__(self, count: int, failed: int = 0, final: bool = False):
+        if self.quiet:
+            return
+        now = time.monotonic()
+        if not final and now - self.last_report < PROGRESS_INTERVAL:
+            return
+        self.last_report = now
+
+        elapsed = now - self.start
+        rate = (count + failed) / elapsed if elapsed > 0 else 0.0
+        message = f"{self.verb} {count} objects"
+        if failed:
+            message += f", {failed} failed"
+        message += f" ({rate:.1f}/s, {elapsed:.1f}s)"
+        print(message, file=sys.stderr, flush=True)
+
+
+def export_collection(
+    model: type[FikenObject],
+    output: IO[str],
+    token: Optional[str] = None,
+    companySlug: Optional[str] = None,
+    max_workers: int = 1,
+    on_progress=None,
+    **kwargs,
+) -> int:
+    """Writes all objects in the collection to output as NDJSON (one JSON object per line).
+    The JSON is written as returned by the API, pages are fetched max_workers at a time.
+    :return: number of exported objects"""
+    count = 0
+    for page in model._iter_raw_pages(
+        token=token, companySlug=companySlug, max_workers=max_workers, **kwargs
+    ):
+        for item in page:
+            output.write(json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+            output.write("\n")
+        count += len(page)
+        if on_progress is not None:
+            on_progress(count)
+    return count
+
+
+def read_ndjson(
+    model: type[FikenObject],
+    lines: IO[str],
+    on_error: Optional[Callable[[int, ValueError], None]] = None,
+) -> Iterator[FikenObject]:
+    """Parses NDJSON lines into objects of the model, skipping blank lines.
+    :param on_error: called with the line number and error of each invalid line, which is skipped.
+    Without it, an invalid line raises ValueError."""
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield model.model_validate_json(line)
+        except ValueError as e:
+            if on_error is None:
+                raise ValueError(f"Invalid {model.__name__} on line {line_number}: {e}") from e
+            on_error(line_number, e)
+
+
+def _export(args) -> int:
+    model = COLLECTIONS[args.collection]
+    report = _ProgressReporter("Exported", args.quiet)
+
+    output = _open(args.output, "w", compress=args.gzip)
+    try:
+        count = export_collection(
+            model,
+            output,
+            token=args.token,
+            companySlug=args.company,
+            max_workers=args.workers,
+            on_progress=report,
+            **_parse_params(args.param),
+        )
+    finally:
+        if output not in (sys.stdout, sys.stdin):
+            output.close()
+
+    report(count, final=True)
+    return 0
+
+
+def _import(args) -> int:
+    model = COLLECTIONS[args.collection]
+    report = _ProgressReporter("Imported", args.quiet)
+    invalid: list[tuple[int, ValueError]] = []
+
+    def on_invalid(line_number: int, error: ValueError):
+        invalid.append((line_number, error))
+
+    def on_progress(progress: BulkProgress):
+        report(progress.done, progress.failed + len(invalid))
+
+    source = _open(args.input, "r")
+    try:
+        result = bulk_save(
+            read_ndjson(model, source, on_error=on_invalid),
+            token=args.token,
+            max_workers=args.workers,
+            on_progress=on_progress,
+            companySlug=args.company,
+            **_parse_params(args.param),
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    failed = result.failed + len(invalid)
+    report(result.succeeded, failed, final=True)
+    for line_number, error in invalid:
+        print(f"Invalid {model.__name__} on line {line_number}: {error}", file=sys.stderr)
+    for obj, error in result.errors:
+        print(f"Failed to import {obj.id_attr}: {error}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="fiken-py", description="Export and import Fiken company data as NDJSON"
+    )
+    parser.add_argument(
+        "--token",
+        default=os.environ.get("FIKEN_API_TOKEN"),
+        help="API token (default: $FIKEN_API_TOKEN)",
+    )
+    parser.add_argument(
+        "--company",
+        default=os.environ.get("FIKEN_COMPANY_SLUG"),
+        help="company slug (default: $FIKEN_COMPANY_SLUG)",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true", help="do not report progress"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export = subparsers.add_parser("export", help="write a collection as NDJSON")
+    export.add_argument("collection", choices=sorted(COLLECTIONS))
+    export.add_argument(
+        "-o", "--output", help="output file, .gz files are compressed (default: stdout)"
+    )
+    export.add_argument("--gzip", action="store_true", help="gzip the output")
+    export.add_argument(
+        "-w", "--workers", type=int, default=4, help="pages fetched concurrently"
+    )
+    export.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="query parameter, e.g. -p issueDateGe=2024-01-01",
+    )
+    export.set_defaults(func=_export)
+
+    import_ = subparsers.add_parser("import", help="create or update objects from NDJSON")
+    import_.add_argument("collection", choices=sorted(COLLECTIONS))
+    import_.add_argument(
+        "-i", "--input", help="input file, .gz files are decompressed (default: stdin)"
+    )
+    import_.add_argument(
+        "-w", "--workers", type=int, default=4, help="objects saved concurrently"
+    )
+    import_.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="extra argument for save, e.g. -p bankAccountCode=1920:10001",
+    )
+    import_.set_defaults(func=_import)
+
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    if args.token is None:
+        parser.error("No API token given, use --token or set FIKEN_API_TOKEN")
+    if args.company is None:
+        parser.error("No company given, use --company or set FIKEN_COMPANY_SLUG")
+
+    try:
+        return args.func(args)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
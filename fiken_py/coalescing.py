@@ -0,0 +1,38 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time. Callers asking for a key that is already
+    in flight wait for that call, and get its result (or exception) instead of running their own."""
+
+    def __init__(self):
+        self._calls: dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key: Hashable, func: Callable[[], T]) -> T:
+        with self._lock:
+            in_flight = self._calls.get(key)
+            if in_flight is None:
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+
+        if in_flight is not None:
+            return in_flight.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
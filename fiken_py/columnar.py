@@ -0,0 +1,439 @@
+import datetime
+import logging
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from fiken_py.fiken_object import FikenObject, OptionalAccessToken
+from fiken_py.models import Invoice, JournalEntry, Purchase, Sale, Transaction
+from fiken_py.util import import_optional
+
+logger = logging.getLogger("fiken_py")
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+type Row = tuple
+type RowBuilder = Callable[[dict], Iterable[Row]]
+
+
+class ColumnarExport:
+    """Flattened, typed column layout for exporting one model to Arrow/Parquet.
+
+    Rows are built directly from the decoded JSON pages as they are fetched, without building
+    pydantic objects, and are flushed in chunks of chunk_rows so memory use stays bounded.
+    Nested lines are flattened, with the parent's columns repeated on every line.
+
+    pyarrow is only needed for the Arrow/Parquet methods (pip install fiken_py[arrow]).
+    iter_columns() yields plain dicts of lists, which can be passed to e.g. pandas.DataFrame.
+
+    :param columns: (name, type) pairs, type being one of int, float, str, bool, date or list[int]
+    :param rows: function returning the rows for one object (as decoded JSON)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: type[FikenObject],
+        columns: list[tuple[str, str]],
+        rows: RowBuilder,
+    ):
+        self.name = name
+        self.model = model
+        self.columns = columns
+        self.rows = rows
+
+    @property
+    def column_names(self) -> list[str]:
+        return [name for name, _ in self.columns]
+
+    def fetch_pages(
+        self, token: OptionalAccessToken = None, **kwargs
+    ) -> Iterator[list[dict]]:
+        return self.model._iter_raw_pages(token=token, **kwargs)
+
+    def iter_columns(
+        self,
+        pages: Optional[Iterable[list[dict]]] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        token: OptionalAccessToken = None,
+        **kwargs,
+    ) -> Iterator[dict[str, list]]:
+        """Yields chunks of at most chunk_rows rows, as dicts of column name to values.
+        :param pages: pages of decoded JSON to export. If None, fetched from the API using kwargs.
+        """
+        if pages is None:
+            pages = self.fetch_pages(token=token, **kwargs)
+
+        converters = [_CONVERTERS[column_type] for _, column_type in self.columns]
+        buffer: list[Row] = []
+        for page in pages:
+            for item in page:
+                buffer.extend(self.rows(item))
+            while len(buffer) >= chunk_rows:
+                yield self._to_columns(buffer[:chunk_rows], converters)
+                buffer = buffer[chunk_rows:]
+
+        if buffer:
+            yield self._to_columns(buffer, converters)
+
+    def arrow_schema(self):
+        pa = import_optional("pyarrow", "arrow")
+        return pa.schema(
+            [(name, _arrow_type(pa, column_type)) for name, column_type in self.columns]
+        )
+
+    def iter_record_batches(
+        self,
+        pages: Optional[Iterable[list[dict]]] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        token: OptionalAccessToken = None,
+        **kwargs,
+    ):
+        """Yields pyarrow.RecordBatch objects of at most chunk_rows rows."""
+        pa = import_optional("pyarrow", "arrow")
+        schema = self.arrow_schema()
+        for chunk in self.iter_columns(pages, chunk_rows, token=token, **kwargs):
+            yield pa.RecordBatch.from_pydict(chunk, schema=schema)
+
+    def to_arrow(
+        self,
+        pages: Optional[Iterable[list[dict]]] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        token: OptionalAccessToken = None,
+        **kwargs,
+    ):
+        """Returns the whole export as one pyarrow.Table."""
+        pa = import_optional("pyarrow", "arrow")
+        return pa.Table.from_batches(
+            list(self.iter_record_batches(pages, chunk_rows, token=token, **kwargs)),
+            schema=self.arrow_schema(),
+        )
+
+    def to_parquet(
+        self,
+        path,
+        pages: Optional[Iterable[list[dict]]] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        token: OptionalAccessToken = None,
+        **kwargs,
+    ) -> int:
+        """Streams the export into a Parquet file, one row group per chunk.
+        :return: number of rows written"""
+        import_optional("pyarrow", "arrow")
+        pq = import_optional("pyarrow.parquet", "arrow")
+
+        written = 0
+        with pq.ParquetWriter(path, self.arrow_schema()) as writer:
+            for batch in self.iter_record_batches(
+                pages, chunk_rows, token=token, **kwargs
+            ):
+                writer.write_batch(batch)
+                written += batch.num_rows
+                logger.debug(f"Wrote {written} {self.name} rows to {path}")
+
+        return written
+
+    def _to_columns(self, rows: list[Row], converters) -> dict[str, list]:
+        return {
+            name: [convert(row[i]) for row in rows]
+            for i, (name, convert) in enumerate(zip(self.column_names, converters))
+        }
+
+
+def _to_date(value: Any) -> Optional[datetime.date]:
+    if value is None or isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(value)
+
+
+def _to_str(value: Any) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+_CONVERTERS: dict[str, Callable[[Any], Any]] = {
+    "int": _identity,
+    "float": _identity,
+    "bool": _identity,
+    "str": _to_str,
+    "date": _to_date,
+    "list[int]": _identity,
+}
+
+
+def _arrow_type(pa, column_type: str):
+    return {
+        "int": pa.int64(),
+        "float": pa.float64(),
+        "bool": pa.bool_(),
+        "str": pa.string(),
+        "date": pa.date32(),
+        "list[int]": pa.list_(pa.int64()),
+    }[column_type]
+
+
+def _lines_or_none(item: dict, key: str) -> list[Optional[dict]]:
+    """Returns the lines of an object, or [None] so that objects without lines still get a row."""
+    return item.get(key) or [None]
+
+
+def _contact_id(contact: Optional[dict]) -> Optional[int]:
+    return contact.get("contactId") if contact else None
+
+
+# Journal entries
+
+_JOURNAL_LINE_COLUMNS = [
+    ("lineNumber", "int"),
+    ("amount", "int"),
+    ("account", "str"),
+    ("vatCode", "str"),
+    ("debitAccount", "str"),
+    ("debitVatCode", "int"),
+    ("creditAccount", "str"),
+    ("creditVatCode", "int"),
+    ("projectId", "list[int]"),
+]
+
+
+def _journal_line_values(number: Optional[int], line: Optional[dict]) -> tuple:
+    if line is None:
+        return (None,) * len(_JOURNAL_LINE_COLUMNS)
+    return (
+        number,
+        line.get("amount"),
+        line.get("account"),
+        line.get("vatCode"),
+        line.get("debitAccount"),
+        line.get("debitVatCode"),
+        line.get("creditAccount"),
+        line.get("creditVatCode"),
+        line.get("projectId"),
+    )
+
+
+def _journal_entry_values(entry: dict) -> tuple:
+    return (
+        entry.get("journalEntryId"),
+        entry.get("journalEntryNumber"),
+        entry.get("transactionId"),
+        entry.get("date"),
+        entry.get("description"),
+    )
+
+
+def _journal_entry_rows(entry: dict) -> Iterator[Row]:
+    header = _journal_entry_values(entry)
+    for i, line in enumerate(_lines_or_none(entry, "lines")):
+        yield header + _journal_line_values(i if line is not None else None, line)
+
+
+JOURNAL_ENTRY_LINES = ColumnarExport(
+    "journal_entry_lines",
+    JournalEntry,
+    [
+        ("journalEntryId", "int"),
+        ("journalEntryNumber", "int"),
+        ("transactionId", "int"),
+        ("date", "date"),
+        ("description", "str"),
+    ]
+    + _JOURNAL_LINE_COLUMNS,
+    _journal_entry_rows,
+)
+
+
+def _transaction_rows(transaction: dict) -> Iterator[Row]:
+    header = (
+        transaction.get("transactionId"),
+        transaction.get("type"),
+        transaction.get("description"),
+    )
+    for entry in transaction.get("entries") or []:
+        for row in _journal_entry_rows(entry):
+            # Transaction ID is already in the header
+            yield header + row[:2] + row[3:]
+
+
+TRANSACTION_LINES = ColumnarExport(
+    "transaction_lines",
+    Transaction,
+    [
+        ("transactionId", "int"),
+        ("transactionType", "str"),
+        ("transactionDescription", "str"),
+        ("journalEntryId", "int"),
+        ("journalEntryNumber", "int"),
+        ("date", "date"),
+        ("description", "str"),
+    ]
+    + _JOURNAL_LINE_COLUMNS,
+    _transaction_rows,
+)
+
+
+# Invoices
+
+_INVOICE_LINE_FIELDS = [
+    ("productId", "int"),
+    ("productName", "str"),
+    ("description", "str"),
+    ("quantity", "int"),
+    ("unitPrice", "int"),
+    ("discount", "int"),
+    ("net", "int"),
+    ("vat", "int"),
+    ("gross", "int"),
+    ("netInNok", "int"),
+    ("vatInNok", "int"),
+    ("grossInNok", "int"),
+    ("vatType", "str"),
+    ("vatInPercent", "float"),
+    ("incomeAccount", "str"),
+]
+
+
+def _invoice_rows(invoice: dict) -> Iterator[Row]:
+    header = (
+        invoice.get("invoiceId"),
+        invoice.get("invoiceNumber"),
+        invoice.get("issueDate"),
+        invoice.get("dueDate"),
+        _contact_id(invoice.get("customer")),
+        invoice.get("currency"),
+        invoice.get("kid"),
+    )
+    for i, line in enumerate(_lines_or_none(invoice, "lines")):
+        if line is None:
+            yield header + (None,) * (len(_INVOICE_LINE_FIELDS) + 1)
+        else:
+            yield header + (i,) + tuple(
+                line.get(field) for field, _ in _INVOICE_LINE_FIELDS
+            )
+
+
+INVOICE_LINES = ColumnarExport(
+    "invoice_lines",
+    Invoice,
+    [
+        ("invoiceId", "int"),
+        ("invoiceNumber", "int"),
+        ("issueDate", "date"),
+        ("dueDate", "date"),
+        ("customerId", "int"),
+        ("currency", "str"),
+        ("kid", "str"),
+        ("lineNumber", "int"),
+    ]
+    + [(f"line_{field}", column_type) for field, column_type in _INVOICE_LINE_FIELDS],
+    _invoice_rows,
+)
+
+
+# Sales and purchases (both with OrderLine lines)
+
+_ORDER_LINE_FIELDS = [
+    ("description", "str"),
+    ("netPrice", "int"),
+    ("vat", "int"),
+    ("account", "str"),
+    ("vatType", "str"),
+    ("netPriceInCurrency", "int"),
+    ("vatInCurrency", "int"),
+    ("projectId", "int"),
+]
+
+
+def _order_line_rows(header: tuple, item: dict) -> Iterator[Row]:
+    for i, line in enumerate(_lines_or_none(item, "lines")):
+        if line is None:
+            yield header + (None,) * (len(_ORDER_LINE_FIELDS) + 1)
+        else:
+            yield header + (i,) + tuple(
+                line.get(field) for field, _ in _ORDER_LINE_FIELDS
+            )
+
+
+def _sale_rows(sale: dict) -> Iterator[Row]:
+    header = (
+        sale.get("saleId"),
+        sale.get("saleNumber"),
+        sale.get("date"),
+        sale.get("dueDate"),
+        sale.get("kind"),
+        _contact_id(sale.get("customer")),
+        sale.get("currency"),
+        sale.get("kid"),
+        sale.get("settled"),
+        sale.get("outstandingBalance"),
+    )
+    return _order_line_rows(header, sale)
+
+
+SALE_LINES = ColumnarExport(
+    "sale_lines",
+    Sale,
+    [
+        ("saleId", "int"),
+        ("saleNumber", "str"),
+        ("date", "date"),
+        ("dueDate", "date"),
+        ("kind", "str"),
+        ("customerId", "int"),
+        ("currency", "str"),
+        ("kid", "str"),
+        ("settled", "bool"),
+        ("outstandingBalance", "int"),
+        ("lineNumber", "int"),
+    ]
+    + [(f"line_{field}", column_type) for field, column_type in _ORDER_LINE_FIELDS],
+    _sale_rows,
+)
+
+
+def _purchase_rows(purchase: dict) -> Iterator[Row]:
+    header = (
+        purchase.get("purchaseId"),
+        purchase.get("identifier"),
+        purchase.get("date"),
+        purchase.get("dueDate"),
+        purchase.get("kind"),
+        _contact_id(purchase.get("supplier")),
+        purchase.get("currency"),
+        purchase.get("kid"),
+        purchase.get("paid"),
+    )
+    return _order_line_rows(header, purchase)
+
+
+PURCHASE_LINES = ColumnarExport(
+    "purchase_lines",
+    Purchase,
+    [
+        ("purchaseId", "int"),
+        ("identifier", "str"),
+        ("date", "date"),
+        ("dueDate", "date"),
+        ("kind", "str"),
+        ("supplierId", "int"),
+        ("currency", "str"),
+        ("kid", "str"),
+        ("paid", "bool"),
+        ("lineNumber", "int"),
+    ]
+    + [(f"line_{field}", column_type) for field, column_type in _ORDER_LINE_FIELDS],
+    _purchase_rows,
+)
+
+
+EXPORTS: dict[str, ColumnarExport] = {
+    export.name: export
+    for export in (
+        JOURNAL_ENTRY_LINES,
+        TRANSACTION_LINES,
+        INVOICE_LINES,
+        SALE_LINES,
+        PURCHASE_LINES,
+    )
+}
@@ -0,0 +1,308 @@
+import functools
+import logging
+import re
+from typing import Any, Callable, Iterable, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from fiken_py.bulk import BulkProgress, bulk_save
+from fiken_py.fiken_object import FikenObject, OptionalAccessToken
+from fiken_py.models import Contact, Product
+from fiken_py.util import fold
+
+logger = logging.getLogger("fiken_py")
+
+# A key of an object: its label, a function giving its normalized value or None, and whether
+# different values mean different objects (an identifier such as the organization number)
+type KeyFunction = tuple[str, Callable[[Any], Optional[str]], bool]
+
+_WORD_REGEX = re.compile(r"[0-9a-z]+")
+_NON_DIGIT_REGEX = re.compile(r"\D+")
+# Company forms left out of names, so that "Acme AS" and "ACME" match
+_LEGAL_FORMS = frozenset(
+    {"as", "asa", "ans", "da", "enk", "nuf", "sa", "ba", "ltd", "inc", "ab", "gmbh", "aps", "oy"}
+)
+_SOUNDEX_CODES = {
+    **dict.fromkeys("bfpv", "1"),
+    **dict.fromkeys("cgjkqsxz", "2"),
+    **dict.fromkeys("dt", "3"),
+    "l": "4",
+    **dict.fromkeys("mn", "5"),
+    "r": "6",
+}
+
+
+class UpsertPlan(BaseModel):
+    """What an upsert would do. creates are new objects, updates are copies of existing objects with
+    the imported fields set, and ambiguous holds the candidates matching several existing objects,
+    with those objects. merged counts candidates which were duplicates of an earlier candidate."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    creates: list[Any] = []
+    updates: list[Any] = []
+    merged: int = 0
+    ambiguous: list[tuple[Any, list[Any]]] = []
+
+
+class UpsertResult(BaseModel):
+    """Outcome of an upsert: the created and updated objects, and (object, exception) pairs for
+    failed saves. unchanged counts the updated objects which already had the imported values, and
+    were not sent."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    created: list[Any] = []
+    updated: list[Any] = []
+    unchanged: int = 0
+    merged: int = 0
+    ambiguous: list[tuple[Any, list[Any]]] = []
+    errors: list[tuple[Any, Exception]] = []
+
+
+class DuplicateIndex:
+    """In-memory index of existing contacts or products, for finding whether an imported one already
+    exists in one dict lookup per key instead of scanning all of them:
+
+        index = DuplicateIndex.from_api(Contact)
+        index.find(Contact(name="ACME as", organizationNumber="987 654 321"))
+        result = index.upsert(imported_contacts, max_workers=4)
+
+    Objects are matched by their keys, strongest first: for contacts the organization number, the
+    email, the name and the name's phonetic key; for products the product number, the name and its
+    phonetic key. Names are compared without case, punctuation and company forms (AS, ASA, ...), and
+    the phonetic key is a Soundex code of each word, so "Hansen Regnskap" finds "Hanssen Regnskap AS".
+    A match on a weaker key is rejected when both objects have different organization (or product)
+    numbers, e.g. two companies of the same name. A key shared by several
+    existing objects is ambiguous, and such candidates are left for manual handling.
+    """
+
+    def __init__(
+        self,
+        objects: Iterable[FikenObject],
+        model: Optional[type[FikenObject]] = None,
+        keys: Optional[tuple[KeyFunction, ...]] = None,
+    ):
+        objects = list(objects)
+        if model is None:
+            if not objects:
+                raise ValueError("model must be given for an empty DuplicateIndex")
+            model = type(objects[0])
+        if keys is None:
+            if model not in DEFAULT_KEYS:
+                raise ValueError(f"No default duplicate keys for {model.__name__}, pass keys")
+            keys = DEFAULT_KEYS[model]
+        self.model = model
+        self.keys = keys
+        self._index: dict[tuple[str, str], list[FikenObject]] = {}
+        for obj in objects:
+            self.add(obj)
+        logger.debug(f"DuplicateIndex of {len(objects)} {model.__name__} objects")
+
+    @classmethod
+    def from_api(
+        cls,
+        model: type[FikenObject],
+        token: OptionalAccessToken = None,
+        companySlug: Optional[str] = None,
+        keys: Optional[tuple[KeyFunction, ...]] = None,
+    ) -> "DuplicateIndex":
+        """Indexes all existing objects of model, read with getAll."""
+        objects = model.getAll(token=token, companySlug=companySlug)
+        return cls(objects, model=model, keys=keys)
+
+    def add(self, obj: FikenObject):
+        """Adds an object (e.g. one created outside the index) under all its keys."""
+        for key in self._keys_of(obj):
+            rows = self._index.setdefault(key, [])
+            if not any(row is obj for row in rows):
+                rows.append(obj)
+
+    def find(self, candidate: FikenObject | dict) -> Optional[FikenObject]:
+        """The existing object the candidate is a duplicate of, or None.
+        Raises ValueError if it matches several existing objects equally well."""
+        matches = self._find(self._as_model(candidate))
+        if len(matches) > 1:
+            raise ValueError(
+                f"{self.model.__name__} matches {len(matches)} existing objects: {candidate!r}"
+            )
+        return matches[0] if matches else None
+
+    def plan(self, candidates: Iterable[FikenObject | dict], update: bool = True) -> UpsertPlan:
+        """Matches the candidates against the index, without saving anything. New objects are
+        added to the index, so that later duplicates in the same import are merged into them.
+        :param update: set the candidates' fields on the existing objects they match
+        """
+        plan = UpsertPlan()
+        # Objects of this plan, by id(), so that they are created or updated once
+        planned: set[int] = set()
+
+        for candidate in candidates:
+            obj = self._as_model(candidate)
+            matches = self._find(obj)
+            if len(matches) > 1:
+                plan.ambiguous.append((obj, matches))
+                continue
+            if not matches:
+                plan.creates.append(obj)
+                planned.add(id(obj))
+                self.add(obj)
+                continue
+
+            existing = matches[0]
+            fields = self._imported_fields(obj)
+            if id(existing) in planned:
+                plan.merged += 1
+                if update:
+                    for name, value in fields.items():
+                        setattr(existing, name, value)
+                    self.add(existing)
+            elif update:
+                updated = existing.model_copy(update=fields)
+                self._replace(existing, updated)
+                plan.updates.append(updated)
+                planned.add(id(updated))
+        return plan
+
+    def upsert(
+        self,
+        candidates: Iterable[FikenObject | dict],
+        update: bool = True,
+        token: OptionalAccessToken = None,
+        companySlug: Optional[str] = None,
+        max_workers: int = 4,
+        on_progress: Optional[Callable[[BulkProgress], None]] = None,
+    ) -> UpsertResult:
+        """Creates the candidates which do not exist and updates those which do, concurrently with
+        bulk_save. Updates which change nothing are not sent."""
+        plan = self.plan(candidates, update=update)
+        created = bulk_save(
+            plan.creates,
+            token=token,
+            max_workers=max_workers,
+            on_progress=on_progress,
+            companySlug=companySlug,
+        )
+        updated = bulk_save(
+            plan.updates,
+            token=token,
+            max_workers=max_workers,
+            on_progress=on_progress,
+            companySlug=companySlug,
+        )
+        return UpsertResult(
+            created=created.results,
+            updated=updated.results,
+            unchanged=updated.unchanged,
+            merged=plan.merged,
+            ambiguous=plan.ambiguous,
+            errors=created.errors + updated.errors,
+        )
+
+    def _as_model(self, candidate: FikenObject | dict) -> FikenObject:
+        if isinstance(candidate, self.model):
+            return candidate
+        return self.model.model_validate(candidate)
+
+    def _imported_fields(self, candidate: FikenObject) -> dict[str, Any]:
+        id_field = candidate.id_attr[0]
+        return {
+            name: getattr(candidate, name)
+            for name in candidate.model_fields_set
+            if name != id_field
+        }
+
+    def _keys_of(self, obj: FikenObject) -> list[tuple[str, str]]:
+        keys = []
+        for label, key_function, _ in self.keys:
+            value = key_function(obj)
+            if value:
+                keys.append((label, value))
+        return keys
+
+    def _find(self, candidate: FikenObject) -> list[FikenObject]:
+        for strength, (label, key_function, _) in enumerate(self.keys):
+            value = key_function(candidate)
+            if not value or (label, value) not in self._index:
+                continue
+            matches = [
+                obj
+                for obj in self._index[(label, value)]
+                if not self._conflicts(candidate, obj, strength)
+            ]
+            if matches:
+                return matches
+        return []
+
+    def _conflicts(self, candidate: FikenObject, obj: FikenObject, strength: int) -> bool:
+        """True if the objects have different values for an identifier stronger than the matching key."""
+        for _, key_function, identifier in self.keys[:strength]:
+            if not identifier:
+                continue
+            ours, theirs = key_function(candidate), key_function(obj)
+            if ours and theirs and ours != theirs:
+                return True
+        return False
+
+    def _replace(self, old: FikenObject, new: FikenObject):
+        for key in self._keys_of(old):
+            self._index[key] = [obj for obj in self._index[key] if obj is not old]
+        self.add(new)
+
+
+# Cached, as the name and phonetic keys of an object both normalize its name
+@functools.lru_cache(maxsize=1024)
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    """The words of a name in lower case, without punctuation, accents and company forms."""
+    if not name:
+        return None
+    words = [word for word in _WORD_REGEX.findall(fold(name)) if word not in _LEGAL_FORMS]
+    return " ".join(words) or None
+
+
+def phonetic_name(name: Optional[str]) -> Optional[str]:
+    """The Soundex codes of the words of a normalized name, e.g. "h525 r252" for "Hansen Regnskap"."""
+    normalized = normalize_name(name)
+    if normalized is None:
+        return None
+    return " ".join(_soundex(word) for word in normalized.split())
+
+
+@functools.lru_cache(maxsize=65536)
+def _soundex(word: str) -> str:
+    if word.isdigit():
+        return word
+    code = word[0]
+    previous = _SOUNDEX_CODES.get(word[0])
+    for letter in word[1:]:
+        digit = _SOUNDEX_CODES.get(letter)
+        if digit is not None and digit != previous:
+            code += digit
+        if letter not in "hw":
+            previous = digit
+    return (code + "000")[:4]
+
+
+def _digits(value: Optional[str]) -> Optional[str]:
+    if not value:
+        return None
+    return _NON_DIGIT_REGEX.sub("", value) or None
+
+
+def _casefold(value: Optional[str]) -> Optional[str]:
+    return value.strip().casefold() if value else None
+
+
+DEFAULT_KEYS: dict[type[FikenObject], tuple[KeyFunction, ...]] = {
+    Contact: (
+        ("organizationNumber", lambda c: _digits(c.organizationNumber), True),
+        ("email", lambda c: _casefold(c.email), False),
+        ("name", lambda c: normalize_name(c.name), False),
+        ("phonetic", lambda c: phonetic_name(c.name), False),
+    ),
+    Product: (
+        ("productNumber", lambda p: _casefold(p.productNumber), True),
+        ("name", lambda p: normalize_name(p.name), False),
+        ("phonetic", lambda p: phonetic_name(p.name), False),
+    ),
+}
@@ -0,0 +1,183 @@
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, Callable, Iterable, Iterator, Optional
+
+from fiken_py.fiken_object import FikenObject, OptionalAccessToken, RequestMethod
+from fiken_py.shared_types import Attachment
+
+logger = logging.getLogger("fiken_py")
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w.\-]")
+
+
+class AttachmentCache:
+    """On-disk, content-addressed cache for attachment downloads.
+
+    File contents are stored once under their SHA-256 digest (objects/ab/abcdef...).
+    Each attachment (keyed by its identifier, or download URL if it has none) points
+    to a digest in refs/, so a file is only fetched once, and identical files attached
+    to several documents are only stored once.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "refs"), exist_ok=True)
+
+    @staticmethod
+    def _attachment_key(attachment: Attachment) -> str:
+        key = attachment.identifier or attachment.downloadUrl
+        if key is None:
+            raise ValueError("Attachment has neither identifier nor downloadUrl")
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _ref_path(self, attachment: Attachment) -> str:
+        return os.path.join(self.directory, "refs", self._attachment_key(attachment))
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def lookup(self, attachment: Attachment) -> Optional[str]:
+        """Returns the path of the cached content for the attachment, or None if not cached."""
+        try:
+            with open(self._ref_path(attachment), "r") as f:
+                digest = f.read().strip()
+        except FileNotFoundError:
+            return None
+
+        path = self._object_path(digest)
+        return path if os.path.exists(path) else None
+
+    def store(self, attachment: Attachment, chunks: Iterable[bytes]) -> str:
+        """Streams the chunks into the cache and returns the path of the stored content."""
+        hasher = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    hasher.update(chunk)
+                    f.write(chunk)
+
+            digest = hasher.hexdigest()
+            path = self._object_path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with open(self._ref_path(attachment), "w") as f:
+            f.write(digest)
+
+        return path
+
+
+def iter_attachment_content(
+    attachment: Attachment,
+    token: OptionalAccessToken = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Streams the content of an attachment in chunks, using the authenticated transport."""
+    if attachment.downloadUrl is None:
+        raise ValueError("Attachment has no downloadUrl")
+
+    response = FikenObject._execute_method(
+        RequestMethod.GET, url=attachment.downloadUrl, token=token, stream=True
+    )
+    try:
+        yield from response.iter_content(chunk_size=chunk_size)
+    finally:
+        response.close()
+
+
+def download_attachment(
+    attachment: Attachment,
+    path_or_file: str | os.PathLike | IO[bytes],
+    token: OptionalAccessToken = None,
+    cache: Optional[AttachmentCache] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """Downloads an attachment to a path or a binary file object.
+    :return: number of bytes written"""
+    if cache is not None:
+        cached_path = cache.lookup(attachment)
+        if cached_path is None:
+            cached_path = cache.store(
+                attachment, iter_attachment_content(attachment, token, chunk_size)
+            )
+        else:
+            logger.debug(f"Attachment {attachment.identifier} served from cache")
+
+        with open(cached_path, "rb") as source:
+            chunks = iter(lambda: source.read(chunk_size), b"")
+            return _write_chunks(chunks, path_or_file)
+
+    return _write_chunks(
+        iter_attachment_content(attachment, token, chunk_size), path_or_file
+    )
+
+
+def download_attachments(
+    attachments: list[Attachment],
+    directory: str,
+    token: OptionalAccessToken = None,
+    cache: Optional[AttachmentCache] = None,
+    max_workers: int = 4,
+    filename_for: Optional[Callable[[Attachment], str]] = None,
+) -> list[str]:
+    """Downloads several attachments concurrently into a directory.
+    :param filename_for: function naming the file for an attachment. Defaults to its identifier.
+    :return: paths of the downloaded files, in the same order as attachments"""
+    os.makedirs(directory, exist_ok=True)
+
+    if filename_for is None:
+        filename_for = _default_filename
+
+    paths = []
+    used_names = set()
+    for i, attachment in enumerate(attachments):
+        name = filename_for(attachment) or f"attachment_{i}"
+        if name in used_names:
+            name = f"{i}_{name}"
+        used_names.add(name)
+        paths.append(os.path.join(directory, name))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(download_attachment, attachment, path, token, cache)
+            for attachment, path in zip(attachments, paths)
+        ]
+        for future in futures:
+            future.result()
+
+    return paths
+
+
+def _default_filename(attachment: Attachment) -> str:
+    name = attachment.identifier
+    if name is None and attachment.downloadUrl is not None:
+        name = attachment.downloadUrl.rstrip("/").split("/")[-1].split("?")[0]
+    if not name:
+        return ""
+    return _UNSAFE_FILENAME_CHARS.sub("_", name)
+
+
+def _write_chunks(
+    chunks: Iterable[bytes], path_or_file: str | os.PathLike | IO[bytes]
+) -> int:
+    if isinstance(path_or_file, (str, os.PathLike)):
+        with open(path_or_file, "wb") as f:
+            return _write_chunks(chunks, f)
+
+    written = 0
+    for chunk in chunks:
+        path_or_file.write(chunk)
+        written += len(chunk)
+    return written
@@ -59,3 +59,15 @@ class RequestWrongMediaTypeException(RequestErrorException):
     """Raised when the response is 415 Unsupported Media Type."""
 
     pass
+
+
+class RequestTooManyRequestsException(RequestErrorException):
+    """Raised when the response is 429 Too Many Requests, and retrying did not help."""
+
+    pass
+
+
+class RequestNotRecordedException(RequestConnectionException):
+    """Raised when replaying a cassette, and the request was not recorded."""
+
+    pass
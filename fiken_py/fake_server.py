@@ -0,0 +1,931 @@
+import collections
+import datetime
+import email.parser
+import email.policy
+import itertools
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import urlsplit, parse_qs
+
+from fiken_py.fiken_object import FikenObject, RequestMethod
+
+logger = logging.getLogger("fiken_py")
+
+_PLACEHOLDER_REGEX = re.compile(r"{(\w+)}")
+
+# Path attributes of the models which are served as collections or single objects
+_COLLECTION_ATTRS = ("_GET_PATH_MULTIPLE", "_POST_PATH", "_UPLOAD_PATH")
+_SINGLE_ATTRS = ("_GET_PATH_SINGLE", "_PUT_PATH", "_PATCH_PATH")
+
+# Request fields which refer to another object, and are returned as the embedded object
+_REFERENCES = {
+    "customerId": ("customer", "contacts"),
+    "supplierId": ("supplier", "contacts"),
+    "contactId": ("contact", "contacts"),
+    "projectId": ("project", "projects"),
+}
+
+# ID placeholders in paths which are called something else in the objects
+_ID_ALIASES = {"inboxDocumentId": "documentId", "companySlug": "slug"}
+
+# Fields in which objects list their own attachments, by collection name (default "attachments")
+_ATTACHMENT_FIELDS = {
+    "contacts": "documents",
+    "sales": "saleAttachments",
+    "purchases": "purchaseAttachments",
+}
+
+# Values the API fills in for new objects, by collection name. Callables get the new object ID
+_DEFAULTS = {
+    "bankAccounts": {"accountCode": lambda object_id: f"1920:{10000 + object_id}"},
+    "projects": {"completed": False},
+    "sales": {"settled": False, "deleted": False},
+    "purchases": {"deleted": False},
+}
+
+# Nested collections which are also listed in a field of the parent object, by "parent/child" name
+_CHILD_FIELDS = {
+    "contacts/contactPerson": "contactPerson",
+    "sales/payments": "salePayments",
+    "purchases/payments": "payments",
+}
+
+# Counted document types, and the field holding their number
+_NUMBER_FIELDS = {
+    "invoices": "invoiceNumber",
+    "creditNotes": "creditNoteNumber",
+    "offers": "offerNumber",
+    "orderConfirmations": "confirmationNumber",
+}
+
+_VAT_RATES = {"HIGH": 0.25, "MEDIUM": 0.15, "LOW": 0.12, "RAW_FISH": 0.1111}
+
+# Accounts in the seeded chart of accounts
+_ACCOUNTS = {
+    "1500": "Kundefordringer",
+    "1920": "Bankinnskudd",
+    "2400": "Leverandørgjeld",
+    "2700": "Utgående merverdiavgift",
+    "2710": "Inngående merverdiavgift",
+    "3000": "Salgsinntekt, avgiftspliktig",
+    "4000": "Innkjøp av råvarer og halvfabrikater",
+    "6300": "Leie lokale",
+}
+
+DEFAULT_COUNTER = 10000
+
+# Fields in PATCH bodies which are stored under another name
+_PATCH_RENAMES = {"newDueDate": "dueDate"}
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+class _Route:
+    """A collection of objects, with the template of its list path and single object path."""
+
+    def __init__(self, collection: str, single: Optional[str]):
+        self.collection = collection
+        self.single = single
+        self.id_field: Optional[str] = None
+        if single is not None:
+            placeholders = _PLACEHOLDER_REGEX.findall(single)
+            if placeholders and placeholders[-1] not in collection:
+                self.id_field = placeholders[-1]
+
+        self.collection_regex = self._compile(collection)
+        self.single_regex = self._compile(single) if single is not None else None
+
+    @staticmethod
+    def _compile(template: str) -> re.Pattern:
+        parts = _PLACEHOLDER_REGEX.split(template)
+        # Every second part is a placeholder name
+        pattern = "".join(
+            f"(?P<{part}>[^/]+)" if i % 2 else re.escape(part)
+            for i, part in enumerate(parts)
+        )
+        return re.compile(f"^{pattern}$")
+
+
+def _is_invoiceish_draft(collection: str) -> bool:
+    """Invoice, offer, credit note and order confirmation drafts list their customers."""
+    parts = collection.split("/")
+    return parts[-1] == "drafts" and parts[-2] not in ("sales", "purchases")
+
+
+def _normalize(path: str) -> str:
+    return path.rstrip("/") or "/"
+
+
+def _build_routes() -> list[_Route]:
+    """Builds the routes from the path attributes of all models."""
+    import fiken_py.models as models
+
+    # getattr loads every model module, as fiken_py.models imports them lazily
+    classes = [
+        cls
+        for cls in (getattr(models, name) for name in models.__all__)
+        if isinstance(cls, type) and issubclass(cls, FikenObject)
+    ]
+    seen = set()
+    routes = []
+    for cls in classes:
+        collection = next(
+            (
+                getattr(cls, attr).default
+                for attr in _COLLECTION_ATTRS
+                if hasattr(cls, attr)
+            ),
+            None,
+        )
+        single = next(
+            (getattr(cls, attr).default for attr in _SINGLE_ATTRS if hasattr(cls, attr)),
+            None,
+        )
+        if collection is None and single is None:
+            continue
+        collection = _normalize(collection) if collection is not None else None
+        single = _normalize(single) if single is not None else None
+
+        if collection is None:
+            # Singleton resources (/user, /companies/{companySlug}/...)
+            collection, single = single, None
+        if (collection, single) in seen:
+            continue
+        seen.add((collection, single))
+        routes.append(_Route(collection, single))
+
+    # Longer templates first, so that e.g. /invoices/drafts wins over /invoices/{invoiceId}
+    routes.sort(key=lambda r: r.collection.count("/"), reverse=True)
+    return routes
+
+
+class FakeFikenServer:
+    """A local stand-in for the Fiken API, for offline tests and benchmarks.
+
+    The endpoints are built from the path attributes of the models, and objects are kept in memory as JSON.
+    Supports:
+    - lists with pagination headers (page, pageSize, Fiken-Api-Page-Count, ...) and simple filters
+      (field=value, and fieldGe/fieldLe/fieldGt/fieldLt for dates and numbers)
+    - POST/PUT/PATCH answering with a Location header, DELETE, and soft deletes (/delete)
+    - attachments, counters, inbox uploads and creating objects from drafts
+    - configurable latency, and injected errors (e.g. 429 Too Many Requests with Retry-After)
+
+    Used as a context manager, the server points FikenObject.PATH_BASE at itself and disables the
+    client side rate limit while active:
+
+        with FakeFikenServer() as server:
+            server.add(Contact, [{"name": "Test"}])
+            Contact.getAll(companySlug=server.company_slug)
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        company_slug: str = "fiken-demo",
+        token: Optional[str] = None,
+    ):
+        """
+        :param port: port to listen on, 0 picks a free port
+        :param latency: seconds to wait before answering each request
+        :param token: if set, requests with another bearer token are rejected with 401
+        """
+        self.latency = latency
+        self.company_slug = company_slug
+        self.token = token
+
+        self.requests: list[tuple[str, str]] = []
+        self._routes = _build_routes()
+        self._lock = threading.RLock()
+        self._ids = itertools.count(1)
+        self._errors: collections.deque[tuple[int, Optional[float]]] = collections.deque()
+        self._collections: dict[str, dict[str, dict]] = {}
+        self._attachments: dict[str, list[dict]] = {}
+        self._files: dict[str, bytes] = {}
+        self._counters: dict[str, int] = {}
+        self._seed()
+
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+        self._previous_state = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as FikenObject.PATH_BASE."""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/api/v2"
+
+    # Lifecycle
+
+    def start(self) -> "FakeFikenServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        self._previous_state = (FikenObject.PATH_BASE, FikenObject._RATE_LIMIT_ENABLED)
+        FikenObject.PATH_BASE = self.url
+        FikenObject.set_rate_limit(False)
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        FikenObject.PATH_BASE, rate_limit = self._previous_state
+        FikenObject.set_rate_limit(rate_limit)
+        self.stop()
+
+    # Test helpers
+
+    def inject_errors(
+        self, count: int = 1, status: int = 429, retry_after: Optional[float] = 0
+    ):
+        """Answers the next count requests with the status code (by default 429 Too Many Requests)."""
+        with self._lock:
+            self._errors.extend([(status, retry_after)] * count)
+
+    def add(
+        self, model: type[FikenObject], objects: list[dict | Any], **placeholders
+    ) -> list[dict]:
+        """Stores objects (dicts or models) in the collection of the model, giving them IDs if missing.
+        :param placeholders: values for the path placeholders other than companySlug
+        :return: the stored records"""
+        collection = self._collection_path(model, **placeholders)
+        route = self._match_collection(collection)[0]
+        records = []
+        with self._lock:
+            for obj in objects:
+                if not isinstance(obj, dict):
+                    obj = obj.model_dump(mode="json", exclude_none=True)
+                records.append(self._insert(collection, route, dict(obj)))
+        return records
+
+    def records(self, model: type[FikenObject], **placeholders) -> list[dict]:
+        """Returns the stored records of the model's collection."""
+        collection = self._collection_path(model, **placeholders)
+        with self._lock:
+            return list(self._collections.get(collection, {}).values())
+
+    def reset(self):
+        """Removes all stored data and request history, keeping the company and user."""
+        with self._lock:
+            self.requests.clear()
+            self._errors.clear()
+            self._collections.clear()
+            self._attachments.clear()
+            self._files.clear()
+            self._counters.clear()
+            self._seed()
+
+    def _collection_path(self, model: type[FikenObject], **placeholders) -> str:
+        template = model._get_method_base_URL(
+            RequestMethod.GET_MULTIPLE
+        ) or model._get_method_base_URL(RequestMethod.POST)
+        template = template[len(model.PATH_BASE) :]
+        placeholders.setdefault("companySlug", self.company_slug)
+        return _normalize(template.format(**placeholders))
+
+    def _seed(self):
+        today = datetime.date.today().isoformat()
+        self._collections["/companies"] = {
+            self.company_slug: {
+                "name": "Fiken Demo AS",
+                "slug": self.company_slug,
+                "organizationNumber": "999999999",
+                "creationDate": today,
+                "hasApiAccess": True,
+                "testCompany": True,
+                "accountingStartDate": f"{datetime.date.today().year}-01-01",
+            }
+        }
+        company = f"/companies/{self.company_slug}"
+        self._collections[f"{company}/accounts"] = {
+            code: {"code": code, "name": name} for code, name in _ACCOUNTS.items()
+        }
+        self._collections[f"{company}/accountBalances"] = {
+            code: {"code": code, "name": name, "balance": 0}
+            for code, name in _ACCOUNTS.items()
+        }
+        self._collections["/user"] = {
+            "": {"name": "Fiken Demo", "email": "demo@fiken.no"}
+        }
+
+    # Routing
+
+    def _match_collection(self, path: str) -> Optional[tuple[_Route, dict]]:
+        for route in self._routes:
+            match = route.collection_regex.match(path)
+            if match:
+                return route, match.groupdict()
+        return None
+
+    def _match_single(self, path: str) -> Optional[tuple[_Route, str, str]]:
+        """Returns the route, the collection path and the object ID"""
+        for route in self._routes:
+            if route.single_regex is None or route.id_field is None:
+                continue
+            match = route.single_regex.match(path)
+            if match:
+                values = match.groupdict()
+                object_id = values.pop(route.id_field)
+                return route, route.collection.format(**values), object_id
+        return None
+
+    def _handle(
+        self, method: str, path: str, query: dict[str, str], body: Optional[Any]
+    ) -> tuple[int, Any, dict[str, str]]:
+        """Returns status code, JSON response and extra headers"""
+        path = _normalize(path)
+
+        # Collections
+        if method in ("GET", "POST") and (found := self._match_collection(path)):
+            route, _ = found
+            if route.single is None:
+                # Endpoints without stored objects: /user and reports
+                if method == "GET":
+                    return self._get_singleton(path)
+                if path.endswith("/products/salesReport"):
+                    return self._product_sales_report(path, body)
+                return 200, [], {}
+            if method == "GET":
+                return self._list(path, query)
+            return self._create(path, route, body)
+
+        parent, _, action = path.rpartition("/")
+
+        if action == "counter" and self._match_collection(parent):
+            return self._counter(method, parent, body)
+
+        # Single objects
+        if method in ("GET", "PUT", "PATCH", "DELETE") and (
+            found := self._match_single(path)
+        ):
+            route, collection, object_id = found
+            return self._single(method, path, collection, route, object_id, query, body)
+
+        # Actions on single objects (/attachments, /delete, /settled, /createX)
+        if found := self._match_single(parent):
+            route, collection, object_id = found
+            return self._action(
+                method, action, parent, collection, route, object_id, query, body
+            )
+
+        # Actions on collections (/send, /salesReport, /full, /partial)
+        if method == "POST" and (found := self._match_collection(parent)):
+            route, _ = found
+            if action in ("full", "partial"):
+                return self._create_credit_note(parent, route, action, body)
+            return 200, [], {}
+
+        return 404, {"error": "Not found", "message": f"No such path {path}"}, {}
+
+    # Handlers
+
+    def _get_singleton(self, path: str):
+        record = self._collections.get(path, {}).get("")
+        if record is None:
+            return 404, {"message": "Not found"}, {}
+        return 200, record, {}
+
+    def _list(self, path: str, query: dict[str, str]):
+        if path == "/companies":
+            records = list(self._collections[path].values())
+        else:
+            records = [
+                r
+                for r in self._collections.get(path, {}).values()
+                if self._matches_filters(r, query)
+            ]
+
+        if path.endswith("/accountBalances"):
+            records = [self._with_balance(path, r) for r in records]
+
+        page = int(query.get("page", 0))
+        page_size = min(int(query.get("pageSize", DEFAULT_PAGE_SIZE)), MAX_PAGE_SIZE)
+        page_count = max(1, -(-len(records) // page_size))
+        headers = {
+            "Fiken-Api-Page": str(page),
+            "Fiken-Api-Page-Size": str(page_size),
+            "Fiken-Api-Page-Count": str(page_count),
+            "Fiken-Api-Result-Count": str(len(records)),
+        }
+        return 200, records[page * page_size : (page + 1) * page_size], headers
+
+    @staticmethod
+    def _matches_filters(record: dict, query: dict[str, str]) -> bool:
+        for key, value in query.items():
+            if key in ("page", "pageSize", "sortBy"):
+                continue
+            operator = key[-2:]
+            if operator in ("Ge", "Le", "Gt", "Lt"):
+                field = key[:-2]
+                if field not in record and f"{field}Date" in record:
+                    field = f"{field}Date"
+                stored = record.get(field)
+                if stored is None:
+                    return False
+                try:
+                    stored, value = float(stored), float(value)
+                except (TypeError, ValueError):
+                    stored, value = str(stored), str(value)
+                if not {
+                    "Ge": stored >= value,
+                    "Le": stored <= value,
+                    "Gt": stored > value,
+                    "Lt": stored < value,
+                }[operator]:
+                    return False
+            elif key in record:
+                if str(record[key]).lower() != str(value).lower():
+                    return False
+        return True
+
+    def _create(self, collection: str, route: _Route, body: Any):
+        if not isinstance(body, dict):
+            return 400, {"message": "Expected a JSON object or form data"}, {}
+        if isinstance(body.get("file"), bytes):
+            # Uploads (inbox documents) keep the file as an attachment
+            body = dict(body)
+            attachment = self._add_file(body)
+            del body["file"]
+            record = self._insert(collection, route, body)
+            path = self._location(collection, route, record)[len(self.url) :]
+            self._attachments[path] = [attachment]
+            return 201, None, {"Location": f"{self.url}{path}"}
+        record = self._insert(collection, route, body)
+        return 201, None, {"Location": self._location(collection, route, record)}
+
+    def _insert(self, collection: str, route: _Route, record: dict) -> dict:
+        id_field = route.id_field
+        if id_field is not None and record.get(id_field) is None:
+            record[id_field] = record.get(_ID_ALIASES.get(id_field)) or next(self._ids)
+        if id_field in _ID_ALIASES:
+            record[_ID_ALIASES[id_field]] = record[id_field]
+
+        name = collection.rsplit("/", 1)[-1]
+        for field, default in _DEFAULTS.get(name, {}).items():
+            if record.get(field) is None:
+                record[field] = default(record[id_field]) if callable(default) else default
+        if name in _NUMBER_FIELDS:
+            self._number_document(collection, name, record)
+        if name in ("sales", "purchases") and record.get("paymentAccount"):
+            self._add_cash_payment(name, record)
+
+        today = datetime.date.today().isoformat()
+        if record.get("createdDate") is None:
+            record["createdDate"] = today
+        record["lastModifiedDate"] = today
+        self._embed_references(collection, record)
+
+        key = str(record.get(id_field)) if id_field is not None else str(next(self._ids))
+        self._collections.setdefault(collection, {})[key] = record
+
+        if parent := self._parent_of(collection):
+            parent_record, field = parent
+            parent_record[field] = (parent_record.get(field) or []) + [record]
+        return record
+
+    def _parent_of(self, collection: str) -> Optional[tuple[dict, str]]:
+        """For nested collections listed in their parent, returns the parent object and its field."""
+        parent_path, _, name = collection.rpartition("/")
+        parent_name = parent_path.split("/")[-2] if parent_path.count("/") > 1 else ""
+        field = _CHILD_FIELDS.get(f"{parent_name}/{name}")
+        if field is None or not (found := self._match_single(parent_path)):
+            return None
+        _, parent_collection, parent_id = found
+        parent = self._collections.get(parent_collection, {}).get(parent_id)
+        return (parent, field) if parent is not None else None
+
+    def _with_balance(self, collection: str, record: dict) -> dict:
+        """Account balances are summed from the stored journal entries, sales, purchases and invoices.
+        Debit is positive, credit negative."""
+        company = collection.rsplit("/", 1)[0]
+        code = record["code"]
+        postings: list[tuple[Any, int]] = []
+
+        for entry in self._collections.get(f"{company}/journalEntries", {}).values():
+            for line in entry.get("lines") or []:
+                amount = int(line.get("amount") or 0)
+                if line.get("account") is not None:
+                    postings.append((line["account"], amount))
+                postings.append((line.get("debitAccount"), amount))
+                postings.append((line.get("creditAccount"), -amount))
+
+        for name, sign in (("sales", -1), ("purchases", 1)):
+            for document in self._collections.get(f"{company}/{name}", {}).values():
+                for line in document.get("lines") or []:
+                    net = int(line.get("netPrice") or 0)
+                    gross = net + int(line.get("vat") or 0)
+                    postings.append((line.get("account"), sign * net))
+                    if document.get("paymentAccount"):
+                        postings.append((document["paymentAccount"], -sign * gross))
+
+        for invoice in self._collections.get(f"{company}/invoices", {}).values():
+            for line in invoice.get("lines") or []:
+                postings.append((line.get("incomeAccount") or "3000", -line.get("net", 0)))
+
+        balance = sum(
+            amount
+            for account, amount in postings
+            if account is not None and str(account).split(":")[0] == code
+        )
+        return dict(record, balance=balance)
+
+    def _add_cash_payment(self, name: str, record: dict):
+        """Cash sales and purchases are registered with a payment of the full amount."""
+        amount = record.get("totalPaid")
+        if amount is None:
+            amount = sum(
+                int(line.get("netPrice") or 0) + int(line.get("vat") or 0)
+                for line in record.get("lines") or []
+            )
+        field = _CHILD_FIELDS[f"{name}/payments"]
+        record[field] = (record.get(field) or []) + [
+            {
+                "paymentId": next(self._ids),
+                "date": record.get("paymentDate") or record.get("date"),
+                "account": record["paymentAccount"],
+                "amount": amount,
+            }
+        ]
+        record["paid"] = True
+
+    def _product_sales_report(self, path: str, body: Any):
+        """Sums invoice and credit note lines per product for invoices issued in the period."""
+        if not isinstance(body, dict):
+            return 400, {"message": "Expected a JSON object"}, {}
+        company = path.rsplit("/", 2)[0]
+        start, end = body.get("from"), body.get("to")
+        products = self._collections.get(f"{company}/products", {})
+
+        reports: dict[str, dict] = {}
+        for collection, kind in (("invoices", "sold"), ("creditNotes", "credited")):
+            for document in self._collections.get(f"{company}/{collection}", {}).values():
+                if not (start <= str(document.get("issueDate")) <= end):
+                    continue
+                for line in document.get("lines") or []:
+                    product = products.get(str(line.get("productId")))
+                    if product is None:
+                        continue
+                    report = reports.setdefault(
+                        str(line["productId"]), {"product": product}
+                    )
+                    for key in ("sold", "credited", "sum"):
+                        report.setdefault(
+                            key,
+                            dict.fromkeys(
+                                ("count", "sales", "netAmount", "vatAmount", "grossAmount"),
+                                0,
+                            ),
+                        )
+                    sign = 1 if kind == "sold" else -1
+                    for key in (kind, "sum"):
+                        totals = report[key]
+                        totals["count"] += line.get("quantity") or 1
+                        totals["sales"] += 1
+                        totals["netAmount"] += sign * line.get("net", 0)
+                        totals["vatAmount"] += sign * line.get("vat", 0)
+                        totals["grossAmount"] += sign * line.get("gross", 0)
+        return 200, list(reports.values()), {}
+
+    def _number_document(self, collection: str, name: str, record: dict):
+        """Numbers invoices, credit notes etc. from their counter, and fills in totals and address."""
+        if record.get(_NUMBER_FIELDS[name]) is None:
+            value = self._counters.get(collection, DEFAULT_COUNTER) + 1
+            self._counters[collection] = value
+            record[_NUMBER_FIELDS[name]] = value
+
+        company = "/".join(collection.split("/")[:3])
+        products = self._collections.get(f"{company}/products", {})
+        totals = {"net": 0, "vat": 0, "gross": 0}
+        for line in record.get("lines") or []:
+            if line.get("net") is None:
+                unit_price = line.get("unitPrice")
+                if unit_price is None and line.get("productId") is not None:
+                    product = products.get(str(line["productId"]), {})
+                    unit_price = product.get("unitPrice")
+                    line.setdefault("vatType", product.get("vatType"))
+                line["net"] = (unit_price or 0) * (line.get("quantity") or 1)
+            if line.get("vat") is None:
+                rate = _VAT_RATES.get(str(line.get("vatType")).upper(), 0)
+                line["vat"] = round(line["net"] * rate)
+            line["gross"] = line["net"] + line["vat"]
+            for key in totals:
+                totals[key] += line[key]
+                line[f"{key}InNok"] = line[key]
+
+        for key, value in totals.items():
+            if record.get(key) is None:
+                record[key] = value
+            record[f"{key}InNok"] = record[key]
+
+        if record.get("address") is None:
+            customer = record.get("customer") or {}
+            record["address"] = customer.get("address") or {"country": "Norge"}
+
+    def _embed_references(self, collection: str, record: dict):
+        company = "/".join(collection.split("/")[:3])
+        for field, (embedded, referenced) in _REFERENCES.items():
+            if field not in record or collection.endswith(f"/{referenced}"):
+                continue
+            target = self._collections.get(f"{company}/{referenced}", {}).get(
+                str(record[field])
+            )
+            if target is None:
+                continue
+            if field == "customerId" and _is_invoiceish_draft(collection):
+                record["customers"] = [target]
+            else:
+                record[embedded] = target
+
+    def _location(self, collection: str, route: _Route, record: dict) -> str:
+        if route.single is None or route.id_field is None:
+            return f"{self.url}{collection}"
+        return f"{self.url}{collection}/{record[route.id_field]}"
+
+    def _single(self, method, path, collection, route, object_id, query, body):
+        records = self._collections.get(collection, {})
+        record = records.get(object_id)
+        if record is None:
+            return 404, {"message": f"{path} not found"}, {}
+
+        if method == "GET":
+            if collection.endswith("/accountBalances"):
+                record = self._with_balance(collection, record)
+            return 200, record, {}
+        if method == "DELETE":
+            del records[object_id]
+            self._attachments.pop(path, None)
+            self._remove_child(collection, route, record)
+            return 204, None, {}
+
+        if not isinstance(body, dict):
+            return 400, {"message": "Expected a JSON object"}, {}
+        if method == "PUT":
+            record = dict(body, **{route.id_field: record[route.id_field]})
+            record["createdDate"] = records[object_id].get("createdDate")
+        else:
+            record = dict(record)
+            for key, value in body.items():
+                record[_PATCH_RENAMES.get(key, key)] = value
+        record["lastModifiedDate"] = datetime.date.today().isoformat()
+        self._embed_references(collection, record)
+        records[object_id] = record
+        return 200, None, {"Location": f"{self.url}{path}"}
+
+    def _remove_child(self, collection: str, route: _Route, record: dict):
+        if parent := self._parent_of(collection):
+            parent_record, field = parent
+            parent_record[field] = [
+                child
+                for child in parent_record.get(field) or []
+                if child.get(route.id_field) != record[route.id_field]
+            ]
+
+    def _action(
+        self, method, action, parent, collection, route, object_id, query, body
+    ):
+        record = self._collections.get(collection, {}).get(object_id)
+        if record is None:
+            return 404, {"message": f"{parent} not found"}, {}
+
+        if action == "generalJournalEntries" and method == "POST":
+            return self._create_general_journal_entries(parent, body)
+
+        if action == "attachments":
+            if method == "GET":
+                return 200, self._attachments.get(parent, []), {}
+            attachment = self._add_file(body)
+            self._attachments.setdefault(parent, []).append(attachment)
+            field = _ATTACHMENT_FIELDS.get(collection.rsplit("/", 1)[-1], "attachments")
+            record[field] = (record.get(field) or []) + [attachment]
+            return 201, None, {}
+
+        if action == "delete" and method == "PATCH":
+            record["deleted"] = True
+            record["lastModifiedDate"] = datetime.date.today().isoformat()
+            return 200, None, {}
+
+        if action == "settled" and method == "PATCH":
+            record["settled"] = True
+            record["settledDate"] = query.get(
+                "settledDate", datetime.date.today().isoformat()
+            )
+            return 200, None, {}
+
+        if action.startswith("create") and method == "POST":
+            if action == "createInvoiceDraft":
+                company = "/".join(collection.split("/")[:3])
+                target = f"{company}/invoices/drafts"
+            else:
+                target = collection.rsplit("/drafts", 1)[0]
+            target_route = self._match_collection(target)[0]
+            created = {
+                k: v for k, v in record.items() if k not in (route.id_field, "uuid")
+            }
+            created = self._insert(target, target_route, created)
+            if "/drafts" in collection:
+                del self._collections[collection][object_id]
+            return 201, None, {"Location": self._location(target, target_route, created)}
+
+        return 404, {"message": f"Unknown action {action}"}, {}
+
+    def _create_credit_note(self, collection: str, route: _Route, kind: str, body: Any):
+        """Credit notes copy customer and currency (and for full credit notes, lines) from the invoice."""
+        if not isinstance(body, dict):
+            return 400, {"message": "Expected a JSON object"}, {}
+        company = "/".join(collection.split("/")[:3])
+        record = dict(body)
+        invoice = self._collections.get(f"{company}/invoices", {}).get(
+            str(body.get("invoiceId"))
+        )
+        if invoice is not None:
+            for field in ("customer", "currency", "project"):
+                record.setdefault(field, invoice.get(field))
+            if kind == "full":
+                record["lines"] = [dict(line) for line in invoice.get("lines") or []]
+            record["associatedInvoiceId"] = invoice.get("invoiceId")
+        elif body.get("invoiceId") is not None:
+            return 404, {"message": f"Invoice {body['invoiceId']} not found"}, {}
+
+        contact = self._collections.get(f"{company}/contacts", {}).get(
+            str(body.get("contactId"))
+        )
+        if contact is not None:
+            record["customer"] = contact
+        return self._create(collection, route, record)
+
+    def _create_general_journal_entries(self, company: str, body: Any):
+        """Creates a transaction with its journal entries, answering with the transaction's location."""
+        if not isinstance(body, dict):
+            return 400, {"message": "Expected a JSON object"}, {}
+        transactions = f"{company}/transactions"
+        transaction_route = self._match_collection(transactions)[0]
+        entries_collection = f"{company}/journalEntries"
+        entries_route = self._match_collection(entries_collection)[0]
+
+        transaction = self._insert(
+            transactions,
+            transaction_route,
+            {"description": body.get("description"), "type": "generalJournalEntry"},
+        )
+        transaction["entries"] = [
+            self._insert(
+                entries_collection,
+                entries_route,
+                dict(entry, transactionId=transaction["transactionId"]),
+            )
+            for entry in body.get("journalEntries") or []
+        ]
+        return (
+            201,
+            None,
+            {"Location": self._location(transactions, transaction_route, transaction)},
+        )
+
+    def _counter(self, method: str, collection: str, body: Any):
+        if method == "GET":
+            return 200, {"value": self._counters.get(collection, DEFAULT_COUNTER)}, {}
+        self._counters[collection] = int((body or {}).get("value", 0))
+        return 201, None, {}
+
+    def _add_file(self, body: dict) -> dict:
+        identifier = uuid.uuid4().hex
+        self._files[identifier] = body.get("file", b"")
+        return {
+            "identifier": identifier,
+            "downloadUrl": f"{self.url}/files/{identifier}",
+            "downloadUrlWithFikenNormalUserCredentials": f"{self.url}/files/{identifier}",
+            "comment": body.get("comment"),
+            "type": "invoice",
+        }
+
+    # HTTP
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                logger.debug("FakeFikenServer: " + format % args)
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_PATCH(self):
+                self._dispatch("PATCH")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def _dispatch(self, method: str):
+                body = self._read_body()
+                if server.latency:
+                    time.sleep(server.latency)
+
+                url = urlsplit(self.path)
+                path = url.path
+                base = urlsplit(server.url).path
+                if path.startswith(base):
+                    path = path[len(base) :]
+                query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+
+                with server._lock:
+                    server.requests.append((method, path))
+                    error = server._errors.popleft() if server._errors else None
+
+                if error is not None:
+                    status, retry_after = error
+                    headers = {}
+                    if retry_after is not None:
+                        headers["Retry-After"] = str(retry_after)
+                    return self._respond(
+                        status, {"message": f"Injected error {status}"}, headers
+                    )
+
+                authorization = self.headers.get("Authorization", "")
+                if not authorization.startswith("Bearer ") or (
+                    server.token is not None
+                    and authorization != f"Bearer {server.token}"
+                ):
+                    return self._respond(401, {"message": "Unauthorized"}, {})
+
+                if path.startswith("/files/") and method == "GET":
+                    return self._respond_bytes(
+                        server._files.get(path.rsplit("/", 1)[-1])
+                    )
+
+                with server._lock:
+                    status, data, headers = server._handle(method, path, query, body)
+                self._respond(status, data, headers)
+
+            def _read_body(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                if length == 0:
+                    return None
+                raw = self.rfile.read(length)
+                content_type = self.headers.get("Content-Type", "")
+
+                if content_type.startswith("multipart/form-data"):
+                    message = email.parser.BytesParser(
+                        policy=email.policy.HTTP
+                    ).parsebytes(
+                        f"Content-Type: {content_type}\r\n\r\n".encode() + raw
+                    )
+                    fields = {}
+                    for part in message.iter_parts():
+                        name = part.get_param("name", header="content-disposition")
+                        payload = part.get_payload(decode=True)
+                        if part.get_filename() is None:
+                            payload = payload.decode()
+                        fields[name] = payload
+                    return fields
+                if content_type.startswith("application/x-www-form-urlencoded"):
+                    return {k: v[-1] for k, v in parse_qs(raw.decode()).items()}
+                try:
+                    return json.loads(raw)
+                except ValueError:
+                    return None
+
+            def _respond(self, status: int, data: Any, headers: dict[str, str]):
+                payload = b"" if data is None else json.dumps(data).encode()
+                self.send_response(status)
+                if payload:
+                    self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _respond_bytes(self, payload: Optional[bytes]):
+                if payload is None:
+                    return self._respond(404, {"message": "File not found"}, {})
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
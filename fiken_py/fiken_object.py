@@ -1,23 +1,29 @@
 from __future__ import annotations
 
 import abc
+import collections
 import datetime
 import logging
 import os.path
 import re
+import threading
 import time
 import typing
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from typing import Any, ClassVar, Optional
 
 import requests
 import platform
 from importlib.metadata import version
+from urllib.parse import urlencode, urlsplit
 
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, ConfigDict, ValidationError
 
+from fiken_py import identity_map, instrumentation, tracing
 from fiken_py.authorization import AccessToken, Authorization
+from fiken_py.coalescing import SingleFlight
 from fiken_py.errors import (
     RequestConnectionException,
     RequestContentNotFoundException,
@@ -27,9 +33,26 @@ from fiken_py.errors import (
 from fiken_py.shared_types import Attachment, Counter
 from fiken_py.util import handle_error
 
+if typing.TYPE_CHECKING:
+    from fiken_py.downloads import AttachmentCache
+
 logger = logging.getLogger("fiken_py")
 
 type OptionalAccessToken = Optional[AccessToken | str]
+T = typing.TypeVar("T")
+
+
+def _request_size(request_data: Optional[str | dict], file_data: Optional[dict]) -> int:
+    """Approximate size in bytes of a request body."""
+    if file_data is not None:
+        return sum(
+            len(part[1]) for part in file_data.values() if isinstance(part[1], (bytes, str))
+        )
+    if isinstance(request_data, str):
+        return len(request_data.encode())
+    if isinstance(request_data, dict):
+        return len(urlencode(request_data))
+    return 0
 
 
 class RequestMethod(Enum):
@@ -62,6 +85,8 @@ class FikenObject:
 
     PATH_BASE: ClassVar[str] = "https://api.fiken.no/api/v2"
 
+    model_config = ConfigDict(defer_build=True)
+
     """Authentication token for the session. Can be either personal token or OAuth2 token.
     Can be specified globally for all objects or for each object separately.
     """
@@ -69,10 +94,23 @@ class FikenObject:
 
     _COMPANY_SLUG: Optional[str] = None
 
+    """The JSON the object was loaded from, for finding changed fields. None for new objects."""
+    _LOADED_DATA: Optional[dict] = None
+    # _LOADED_DATA validated, on the first changed_fields() call
+    _LOADED_SNAPSHOT: Optional["FikenObject"] = None
+    _CHANGE_TRACKING: ClassVar[bool] = True
+
     _RATE_LIMIT_ENABLED: ClassVar[bool] = True
+    # Sends the HTTP requests, takes the same arguments as requests.request
+    _TRANSPORT: ClassVar[Optional[typing.Callable[..., requests.Response]]] = None
+    # Shares identical concurrent GETs, see set_request_coalescing
+    _SINGLE_FLIGHT: ClassVar[Optional[SingleFlight]] = None
     _MAX_REQUESTS_PER_SECOND: ClassVar[int] = 4
     _REQUESTS_COUNTER: ClassVar[int] = 0
     _LAST_REQUEST_TIME: ClassVar[int] = 0
+    _RATE_LIMIT_LOCK: ClassVar[threading.Lock] = threading.Lock()
+    # Retries for 429 Too Many Requests, waiting for Retry-After (or 1 s) between each
+    _TOO_MANY_REQUESTS_RETRIES: ClassVar[int] = 3
 
     @classmethod
     def set_auth_token(cls, token: OptionalAccessToken):
@@ -115,10 +153,58 @@ class FikenObject:
         cls._RATE_LIMIT_ENABLED = enabled
 
     @classmethod
+    def set_transport(
+        cls, transport: Optional[typing.Callable[..., requests.Response]]
+    ):
+        """Sets the function used to send all requests (e.g. a fiken_py.cassette.Cassette),
+        None restores requests.request."""
+        FikenObject._TRANSPORT = transport
+
+    @classmethod
+    def set_change_tracking(cls, enabled: bool):
+        """If enabled (the default), loaded objects keep the JSON they were loaded from,
+        so that saving an unchanged object is skipped. Disable to save memory on large reads."""
+        FikenObject._CHANGE_TRACKING = enabled
+
+    @classmethod
+    def set_request_coalescing(cls, enabled: bool):
+        """If enabled, identical concurrent get and getAll calls (same token, path and parameters)
+        share one request, and its result. The shared objects should then be treated as read-only."""
+        FikenObject._SINGLE_FLIGHT = SingleFlight() if enabled else None
+
+    @classmethod
+    def _coalescing_key(
+        cls, operation: str, token: OptionalAccessToken, kwargs: dict
+    ) -> tuple:
+        if token is None:
+            token = cls._AUTH_TOKEN
+        if isinstance(token, AccessToken):
+            token = token.access_token
+        return (
+            cls,
+            operation,
+            token,
+            cls._COMPANY_SLUG,
+            repr(sorted(kwargs.items())),
+        )
+
+    @classmethod
+    @tracing.traced
     def get(
         cls: type[typing.Self], token: OptionalAccessToken = None, **kwargs: Any
     ) -> typing.Self | None:
+        single_flight = FikenObject._SINGLE_FLIGHT
+        if single_flight is not None:
+            return single_flight.do(
+                cls._coalescing_key("get", token, kwargs),
+                lambda: cls._get(token=token, **kwargs),
+            )
+        return cls._get(token=token, **kwargs)
 
+    @classmethod
+    def _get(
+        cls: type[typing.Self], token: OptionalAccessToken = None, **kwargs: Any
+    ) -> typing.Self | None:
         try:
             response = cls._execute_method(RequestMethod.GET, token=token, **kwargs)
         except RequestContentNotFoundException as e:
@@ -128,12 +214,14 @@ class FikenObject:
 
         logger.debug(f"GETting single object for {cls.__name__}")
 
-        data = response.json()
         return cls._inject_token_and_slug_and_return(
-            cls(**data), token, kwargs.get("companySlug")
+            cls._parse_response(response, cls._from_response_data),
+            token,
+            kwargs.get("companySlug"),
         )
 
     @classmethod
+    @tracing.traced
     def getAll(
         cls,
         token: OptionalAccessToken = None,
@@ -141,8 +229,119 @@ class FikenObject:
         page: Optional[int] = None,
         **kwargs: Any,
     ) -> list[typing.Self]:
+        single_flight = FikenObject._SINGLE_FLIGHT
+        if single_flight is not None:
+            key = cls._coalescing_key(
+                "getAll", token, dict(kwargs, follow_pages=follow_pages, page=page)
+            )
+            return list(
+                single_flight.do(
+                    key,
+                    lambda: cls._getAll(
+                        token=token, follow_pages=follow_pages, page=page, **kwargs
+                    ),
+                )
+            )
+        return cls._getAll(token=token, follow_pages=follow_pages, page=page, **kwargs)
 
+    @classmethod
+    def _getAll(
+        cls,
+        token: OptionalAccessToken = None,
+        follow_pages: bool = True,
+        page: Optional[int] = None,
+        **kwargs: Any,
+    ) -> list[typing.Self]:
         logger.debug(f"GETting many objects for {cls.__name__}")
+
+        objects = []
+        for fetched_page in cls.iter_pages(
+            token=token, follow_pages=follow_pages, page=page, **kwargs
+        ):
+            objects.extend(fetched_page)
+
+        return objects
+
+    @classmethod
+    def iter_pages(
+        cls,
+        token: OptionalAccessToken = None,
+        follow_pages: bool = True,
+        page: Optional[int] = None,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> typing.Iterator[list[typing.Self]]:
+        """Same as getAll, but yields the objects one page at a time as they are fetched.
+        :param max_workers: number of pages to fetch concurrently. Pages are still yielded in order.
+        """
+        for response in cls._iter_page_responses(
+            token=token,
+            follow_pages=follow_pages,
+            page=page,
+            max_workers=max_workers,
+            **kwargs,
+        ):
+            yield cls._parse_response(
+                response,
+                lambda data: [
+                    cls._inject_token_and_slug_and_return(
+                        cls._from_response_data(item), token, kwargs.get("companySlug")
+                    )
+                    for item in data
+                ],
+            )
+
+    @classmethod
+    def getAllRaw(
+        cls,
+        token: OptionalAccessToken = None,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> list[dict]:
+        """Same as getAll, but returns the decoded JSON of the objects without building them,
+        for reading many documents of which only some fields are used."""
+        return [
+            item
+            for fetched_page in cls._iter_raw_pages(
+                token=token, max_workers=max_workers, **kwargs
+            )
+            for item in fetched_page
+        ]
+
+    @classmethod
+    def _iter_raw_pages(
+        cls,
+        token: OptionalAccessToken = None,
+        follow_pages: bool = True,
+        page: Optional[int] = None,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> typing.Iterator[list[dict]]:
+        """Yields the decoded JSON of each page of a GET_MULTIPLE request, without building objects."""
+        for response in cls._iter_page_responses(
+            token=token,
+            follow_pages=follow_pages,
+            page=page,
+            max_workers=max_workers,
+            **kwargs,
+        ):
+            yield cls._parse_response(response, lambda data: data)
+
+    @classmethod
+    def _iter_page_responses(
+        cls,
+        token: OptionalAccessToken = None,
+        follow_pages: bool = True,
+        page: Optional[int] = None,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> typing.Iterator[requests.Response]:
+        """Yields the response for each page of a GET_MULTIPLE request, in page order."""
+        if page is not None:
+            if follow_pages:
+                raise ValueError("Cannot specify page number when follow_pages is True")
+            kwargs["page"] = page
+
         try:
             response = cls._execute_method(
                 RequestMethod.GET_MULTIPLE, token=token, **kwargs
@@ -150,38 +349,36 @@ class FikenObject:
         except RequestErrorException as e:
             raise
 
-        if page is not None:
-            if follow_pages:
-                raise ValueError("Cannot specify page number when follow_pages is True")
-            kwargs["page"] = page
+        yield response
 
-        fetched_pages = [response.json()]
-        if follow_pages:
-            page_count = response.headers.get("Fiken-Api-Page-Count")
-            if page_count is not None:
-                page_count = int(page_count)
-            if page_count is not None and page_count > 1:
-                logger.debug(f"Multiple pages found. Fetching {page_count} pages")
-                for i in range(1, page_count):
-                    try:
-                        response = cls._execute_method(
-                            RequestMethod.GET_MULTIPLE, page=i, token=token, **kwargs
-                        )
-                    except RequestErrorException as e:
-                        raise
+        if not follow_pages:
+            return
 
-                    fetched_pages.append(response.json())
+        page_count = response.headers.get("Fiken-Api-Page-Count")
+        if page_count is not None:
+            page_count = int(page_count)
+        if page_count is not None and page_count > 1:
+            logger.debug(f"Multiple pages found. Fetching {page_count} pages")
 
-        objects = []
-        for fetched_page in fetched_pages:
-            for item in fetched_page:
-                obj = cls(**item)
-                obj = cls._inject_token_and_slug_and_return(
-                    obj, token, kwargs.get("companySlug")
+            def fetch_page(i: int) -> requests.Response:
+                return cls._execute_method(
+                    RequestMethod.GET_MULTIPLE, page=i, token=token, **kwargs
                 )
-                objects.append(obj)
 
-        return objects
+            if max_workers <= 1:
+                for i in range(1, page_count):
+                    yield fetch_page(i)
+                return
+
+            # Keep at most 2 * max_workers pages in flight, so slow consumers bound memory use
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pending = collections.deque()
+                next_page = 1
+                while next_page < page_count or pending:
+                    while next_page < page_count and len(pending) < 2 * max_workers:
+                        pending.append(executor.submit(fetch_page, next_page))
+                        next_page += 1
+                    yield pending.popleft().result()
 
     @classmethod
     def _get_from_url(
@@ -196,12 +393,13 @@ class FikenObject:
 
         logger.debug(f"GETting single object from URL {url}")
 
-        data = response.json()
-
         return cls._inject_token_and_slug_and_return(
-            cls(**data), token, kwargs.get("companySlug")
+            cls._parse_response(response, cls._from_response_data),
+            token,
+            kwargs.get("companySlug"),
         )
 
+    @tracing.traced
     def save(self, token: OptionalAccessToken = None, **kwargs: Any) -> typing.Self:
         """
         Saves the object to the server.
@@ -213,6 +411,10 @@ class FikenObject:
         :param kwargs: arguments to replace placeholders in the path
         :return: None or the new object
         """
+        if self.is_unchanged():
+            logger.debug(f"{self.__class__.__name__} is unchanged, skipping save")
+            return self
+
         if token is None:
             token = self._auth_token
 
@@ -258,7 +460,9 @@ class FikenObject:
         if location:
             logger.debug(f"Location of new object: {location}")
 
-            new_object = self.__class__._get_from_url(location, token, **kwargs)
+            # Not shared, as an identity map would return its instance from before the save
+            with identity_map.suspended():
+                new_object = self.__class__._get_from_url(location, token, **kwargs)
             self.__dict__.update(new_object.__dict__)
 
             return self
@@ -280,11 +484,14 @@ class FikenObject:
             if kwargs.get("token") is None:
                 kwargs["token"] = self._auth_token
 
-            fiken_object = self.get(**kwargs)
+            # Not shared, as an identity map would return its instance from before the change
+            with identity_map.suspended():
+                fiken_object = self.get(**kwargs)
         except RequestErrorException as e:
             raise
         self.__dict__.update(fiken_object.__dict__)
 
+    @tracing.traced
     def delete(self, token: OptionalAccessToken = None, **kwargs: Any) -> bool:
         attr_name, attr_val = self.id_attr
         if kwargs.get(attr_name) is None:
@@ -386,6 +593,8 @@ class FikenObject:
         file_data: Optional[dict[str, tuple]] = None,
         token: OptionalAccessToken = None,
         trial: int = 0,
+        stream: bool = False,
+        exclude_unset: bool = False,
         **kwargs: Any,
     ) -> requests.Response:
         """Executes a method on the object
@@ -394,6 +603,8 @@ class FikenObject:
         :dumped_object: - the object to send/dump and extract placeholders from. If None, will be ignored
         :file_data: dict - the file data to send. If None, will be ignored
         :trial: int - the number of times the method has been tried
+        :stream: bool - if True, the response body is not read up front (use response.iter_content)
+        :exclude_unset: bool - if True, only fields set on the dumped object are sent (for minimal PATCH bodies)
         :kwargs: dict - the arguments to pass to the method
         """
 
@@ -410,6 +621,8 @@ class FikenObject:
                         file_data,
                         token,
                         trial + 1,
+                        stream=stream,
+                        exclude_unset=exclude_unset,
                         **kwargs,
                     )
                 except RequestErrorException as e:
@@ -435,6 +648,20 @@ class FikenObject:
                 f"Object {cls.__name__} does not support {method.name}"
             )
 
+        tracer = tracing.get_tracer()
+        template = None
+        if tracer.enabled or instrumentation.has_listeners():
+            template = cls._path_template(url)
+
+        event = None
+        if instrumentation.has_listeners():
+            event = instrumentation.RequestEvent(
+                model=cls.__name__,
+                method=method.name,
+                pathTemplate=template,
+                trial=trial,
+            )
+
         if issubclass(dumped_object.__class__, BaseModel):
             url = cls._extract_placeholders_basemodel(url, dumped_object)
 
@@ -457,7 +684,9 @@ class FikenObject:
                 )
 
             if issubclass(dumped_object.__class__, BaseModel):
-                request_data = dumped_object.model_dump_json(by_alias=True)
+                request_data = dumped_object.model_dump_json(
+                    by_alias=True, exclude_unset=exclude_unset
+                )
             elif isinstance(dumped_object, dict):
                 request_data = dumped_object
             else:
@@ -478,19 +707,23 @@ class FikenObject:
         headers["X-Request-ID"] = str(uuid.uuid4())
 
         # TODO - tests for this
-        timestamp_ms = time.time_ns() // 1000000
         if cls._RATE_LIMIT_ENABLED:
-            if cls._REQUESTS_COUNTER >= cls._MAX_REQUESTS_PER_SECOND:
-                time_diff = timestamp_ms - cls._LAST_REQUEST_TIME
-                if time_diff < 1000:
-                    sleep_time = 1000 - time_diff
-                    logger.debug(
-                        f"Sending requests too fast. Sleeping for {sleep_time} ms"
-                    )
-                    time.sleep(sleep_time / 1000)
-                    cls._REQUESTS_COUNTER = 0
-            cls._REQUESTS_COUNTER += 1
-            cls._LAST_REQUEST_TIME = timestamp_ms
+            # Lock so that concurrent workers (e.g. bulk downloads) share one budget
+            with FikenObject._RATE_LIMIT_LOCK:
+                timestamp_ms = time.time_ns() // 1000000
+                if cls._REQUESTS_COUNTER >= cls._MAX_REQUESTS_PER_SECOND:
+                    time_diff = timestamp_ms - cls._LAST_REQUEST_TIME
+                    if time_diff < 1000:
+                        sleep_time = 1000 - time_diff
+                        logger.debug(
+                            f"Sending requests too fast. Sleeping for {sleep_time} ms"
+                        )
+                        time.sleep(sleep_time / 1000)
+                        if event is not None:
+                            event.rateLimitWait = sleep_time / 1000
+                        cls._REQUESTS_COUNTER = 0
+                cls._REQUESTS_COUNTER += 1
+                cls._LAST_REQUEST_TIME = timestamp_ms
 
         if file_data is not None:
             request_data = None  # Only send the file if it is a file request
@@ -504,18 +737,51 @@ class FikenObject:
         data: {request_data}"""
         )
 
-        try:
-            response = requests.request(
-                method_name,
-                url,
-                headers=headers,
-                params=kwargs,
-                data=request_data,
-                files=file_data,
+        if event is not None:
+            event.bytesSent = _request_size(request_data, file_data)
+
+        network_start = time.perf_counter()
+        span_attributes = None
+        if tracer.enabled:
+            span_attributes = {
+                "http.request.method": method_name,
+                "url.template": template,
+                "fiken.model": cls.__name__,
+                "fiken.trial": trial,
+            }
+        with tracer.start_span(f"HTTP {method_name}", span_attributes) as span:
+            transport = FikenObject._TRANSPORT or requests.request
+            try:
+                response = transport(
+                    method_name,
+                    url,
+                    headers=headers,
+                    params=kwargs,
+                    data=request_data,
+                    files=file_data,
+                    stream=stream,
+                )
+            except requests.exceptions.RequestException as e:
+                logging.error(f"Request connection failed: {e}")
+                if event is not None:
+                    event.networkTime = time.perf_counter() - network_start
+                    event.error = str(e)
+                    instrumentation.emit(event)
+                raise RequestConnectionException(e)
+            span.set_attribute("http.response.status_code", response.status_code)
+
+        response.fiken_event = event
+        if event is not None:
+            event.networkTime = time.perf_counter() - network_start
+            event.status = response.status_code
+            event.bytesReceived = (
+                int(response.headers.get("Content-Length") or 0)
+                if stream
+                else len(response.content)
             )
-        except requests.exceptions.RequestException as e:
-            logging.error(f"Request connection failed: {e}")
-            raise RequestConnectionException(e)
+            if not response.ok:
+                event.error = response.reason
+            instrumentation.emit(event)
 
         try:
             response.raise_for_status()
@@ -533,17 +799,132 @@ class FikenObject:
                             file_data,
                             token,
                             trial + 1,
+                            stream=stream,
+                            exclude_unset=exclude_unset,
                             **kwargs,
                         )
                     except RequestErrorException as err:
                         logger.error(f"Failed to refresh token: {err}")
                         raise
 
+            if (
+                e.response.status_code == 429
+                and trial < cls._TOO_MANY_REQUESTS_RETRIES
+            ):
+                retry_after = cls._retry_after_seconds(e.response)
+                logger.warning(
+                    f"Too many requests (trial {trial + 1}). Retrying in {retry_after} s"
+                )
+                time.sleep(retry_after)
+                return cls._execute_method(
+                    method,
+                    url,
+                    dumped_object,
+                    file_data,
+                    token,
+                    trial + 1,
+                    stream=stream,
+                    exclude_unset=exclude_unset,
+                    **kwargs,
+                )
+
             handle_error(e)
             raise
 
         return response
 
+    @classmethod
+    def _path_template(cls, url: str) -> str:
+        """The path of the URL without PATH_BASE, with placeholders instead of IDs."""
+        if url.startswith(cls.PATH_BASE):
+            url = url[len(cls.PATH_BASE) :]
+        else:
+            url = urlsplit(url).path
+        if "{" in url:
+            return url
+        return instrumentation.path_template(url, cls._path_templates())
+
+    @classmethod
+    def _path_templates(cls) -> list[str]:
+        return [
+            attr.default
+            for name, attr in getattr(cls, "__private_attributes__", {}).items()
+            if (name.endswith("_PATH") or name.startswith("_GET_PATH"))
+            and isinstance(attr.default, str)
+        ]
+
+    @classmethod
+    def _parse_response(
+        cls, response: requests.Response, build: typing.Callable[[Any], T]
+    ) -> T:
+        """Decodes the JSON of the response and builds the result from it,
+        timing both for the request listeners."""
+        event = getattr(response, "fiken_event", None)
+        if event is None:
+            return build(response.json())
+
+        start = time.perf_counter()
+        data = response.json()
+        decoded = time.perf_counter()
+        result = build(data)
+        event.decodeTime = decoded - start
+        event.validationTime = time.perf_counter() - decoded
+        instrumentation.emit(event, parsed=True)
+        return result
+
+    @classmethod
+    def _from_response_data(cls, data: dict) -> typing.Self:
+        """Builds an object from the JSON of a response, sharing embedded objects if an
+        IdentityMap is active."""
+        context = identity_map.validation_context()
+        if context is None:
+            obj = cls(**data)
+        else:
+            obj = cls.model_validate(data, context=context)
+            if identity_map.is_shared(context, obj):
+                # An instance from an earlier response: its fields must match the new baseline
+                obj.__dict__.update(cls(**data).__dict__)
+        if FikenObject._CHANGE_TRACKING:
+            obj._LOADED_DATA = data
+            # Set, so that updating another object's __dict__ from this one drops its snapshot
+            obj._LOADED_SNAPSHOT = None
+        return obj
+
+    def changed_fields(self) -> Optional[set[str]]:
+        """Names of the fields changed since the object was loaded, or None if that is not known
+        (new objects, or objects loaded without change tracking)."""
+        if self._LOADED_DATA is None:
+            return None
+        loaded = self._LOADED_SNAPSHOT
+        if loaded is None:
+            loaded = self._LOADED_SNAPSHOT = type(self).model_validate(self._LOADED_DATA)
+        return {
+            name
+            for name in type(self).model_fields
+            if getattr(self, name) != getattr(loaded, name)
+        }
+
+    def is_unchanged(self) -> bool:
+        """True if the object is known to be unchanged since it was loaded, so saving it is a no-op."""
+        return not self.is_new and self.changed_fields() == set()
+
+    @classmethod
+    def add_request_listener(cls, listener: instrumentation.RequestListener):
+        """Registers a listener for events about every request (see fiken_py.instrumentation)."""
+        instrumentation.add_listener(listener)
+
+    @classmethod
+    def remove_request_listener(cls, listener: instrumentation.RequestListener):
+        instrumentation.remove_listener(listener)
+
+    @staticmethod
+    def _retry_after_seconds(response: requests.Response) -> float:
+        """Seconds to wait before retrying, from the Retry-After header (defaults to 1 s)."""
+        try:
+            return max(0.0, float(response.headers.get("Retry-After", 1)))
+        except ValueError:
+            return 1.0
+
     @property
     def is_new(self) -> bool:
         """
@@ -595,16 +976,32 @@ class FikenObjectRequiringRequest(FikenObject):
         base_object: BaseModel, request_object_type: type[BaseModel]
     ) -> dict:
         """Returns the common field and values between the base and request objects"""
+        plan = _common_field_plan(base_object.__class__, request_object_type)
+        return {field: getattr(base_object, field) for field in plan}
+
+
+# (model, request model) -> the fields of the request model which the model also has
+_COMMON_FIELD_PLANS: dict[tuple[type[BaseModel], type[BaseModel]], tuple[str, ...]] = {}
 
-        common_fields = {}
-        for base_field in request_object_type.model_fields:
-            if base_field in base_object.__class__.model_fields:
-                common_fields[base_field] = getattr(base_object, base_field)
-            else:
-                logger.warning(
-                    f"Field {base_field} not present in {base_object.__class__.__name__}"
-                )
-        return common_fields
+
+def _common_field_plan(
+    base_type: type[BaseModel], request_object_type: type[BaseModel]
+) -> tuple[str, ...]:
+    """The fields to copy from base_type to request_object_type, computed once per pair.
+    Request fields missing from the model are logged the first time."""
+    plan = _COMMON_FIELD_PLANS.get((base_type, request_object_type))
+    if plan is not None:
+        return plan
+
+    base_fields = base_type.model_fields
+    plan = []
+    for base_field in request_object_type.model_fields:
+        if base_field in base_fields:
+            plan.append(base_field)
+        else:
+            logger.warning(f"Field {base_field} not present in {base_type.__name__}")
+    plan = _COMMON_FIELD_PLANS[(base_type, request_object_type)] = tuple(plan)
+    return plan
 
 
 class FikenObjectAttachable(FikenObject):
@@ -682,6 +1079,29 @@ class FikenObjectAttachable(FikenObject):
         """Gets all attachments for the resource."""
         return self.__class__.get_attachments_cls(self, token=token, **kwargs)
 
+    def download_attachments(
+        self,
+        directory: str,
+        cache: Optional["AttachmentCache"] = None,
+        max_workers: int = 4,
+        token: OptionalAccessToken = None,
+        **kwargs,
+    ) -> list[str]:
+        """Downloads all attachments for the resource concurrently into a directory.
+        :return: paths of the downloaded files"""
+        from fiken_py.downloads import download_attachments
+
+        if token is None:
+            token = self._auth_token
+
+        return download_attachments(
+            self.get_attachments(token=token, **kwargs),
+            directory,
+            token=token,
+            cache=cache,
+            max_workers=max_workers,
+        )
+
     @classmethod
     def add_attachment_bytes_cls(
         cls,
@@ -0,0 +1,118 @@
+import contextlib
+import contextvars
+import threading
+from typing import Any, Callable, Iterator, Optional
+
+from pydantic import ValidationInfo
+
+# Keys in the pydantic validation context: the identity map, and the id() of the instances
+# it returned from earlier responses
+CONTEXT_KEY = "fiken_py_identity_map"
+SHARED_KEY = "fiken_py_shared"
+
+_current: contextvars.ContextVar[Optional["IdentityMap"]] = contextvars.ContextVar(
+    "fiken_py_identity_map", default=None
+)
+
+
+class IdentityMap:
+    """Shares one instance per ID for objects embedded in responses (e.g. the customer Contact
+    and the Project of each Invoice) while it is active:
+
+        with IdentityMap():
+            invoices = Invoice.getAll()
+        # invoices[0].customer is invoices[1].customer, if they have the same contactId
+
+    Only objects read with get, getAll and iter_pages are shared. For embedded objects the first
+    response for an ID wins, so the shared objects should be treated as read-only. An object read
+    itself (e.g. with Contact.getAll) is updated with the response, if it was shared before. Objects read back after a save or
+    another change (e.g. create_contact_person) are not shared, so they get the changed values.
+    """
+
+    def __init__(self):
+        self._objects: dict[tuple[type, Any], Any] = {}
+        self._lock = threading.Lock()
+        self._reset_token = None
+        self.hits = 0
+        self.misses = 0
+
+    def __enter__(self) -> "IdentityMap":
+        self._reset_token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        _current.reset(self._reset_token)
+        self._reset_token = None
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def clear(self):
+        with self._lock:
+            self._objects.clear()
+
+    def intern(
+        self,
+        cls: type,
+        id_field: str,
+        data: Any,
+        handler: Callable,
+        shared: Optional[set[int]] = None,
+    ) -> Any:
+        """Returns the shared instance for the ID in data, validating data with handler if there is none.
+        :param shared: the id() of an instance from an earlier response is added to this set
+        """
+        if not isinstance(data, dict) or data.get(id_field) is None:
+            return handler(data)
+
+        key = (cls, data[id_field])
+        obj = self._objects.get(key)
+        if obj is not None:
+            self.hits += 1
+            if shared is not None:
+                shared.add(id(obj))
+            return obj
+
+        obj = handler(data)
+        with self._lock:
+            self.misses += 1
+            return self._objects.setdefault(key, obj)
+
+
+def current() -> Optional[IdentityMap]:
+    return _current.get()
+
+
+@contextlib.contextmanager
+def suspended() -> Iterator[None]:
+    """Validates responses without the active identity map, if any, until the block exits."""
+    reset_token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(reset_token)
+
+
+def validation_context() -> Optional[dict]:
+    """The pydantic validation context to use for responses, None if no identity map is active."""
+    identity_map = _current.get()
+    if identity_map is None:
+        return None
+    return {CONTEXT_KEY: identity_map, SHARED_KEY: set()}
+
+
+def is_shared(context: Optional[dict], obj: Any) -> bool:
+    """True if obj, validated with the context, is an instance from an earlier response."""
+    return context is not None and id(obj) in context[SHARED_KEY]
+
+
+def intern(
+    cls: type, id_field: str, data: Any, handler: Callable, info: ValidationInfo
+) -> Any:
+    """For wrap model validators: shares instances by id_field if validated with an identity map.
+    Objects validated through __init__ have no context, and are never shared."""
+    if info.context is None or CONTEXT_KEY not in info.context:
+        return handler(data)
+    return info.context[CONTEXT_KEY].intern(
+        cls, id_field, data, handler, shared=info.context.get(SHARED_KEY)
+    )
@@ -0,0 +1,111 @@
+import functools
+import logging
+import re
+import threading
+from typing import Iterable, Optional
+
+from pydantic import BaseModel
+
+logger = logging.getLogger("fiken_py")
+
+_PLACEHOLDER_REGEX = re.compile(r"{(\w+)}")
+_NUMERIC_SEGMENT_REGEX = re.compile(r"^(\d+|[0-9a-f]{8}-[0-9a-f-]{27}|[0-9a-f]{32})$")
+
+
+class RequestEvent(BaseModel):
+    """Measurements for one HTTP request. Times are in seconds.
+
+    Emitted to the listeners twice: once when the response is received (on_request),
+    and once more when the response has been decoded and validated into models (on_parsed).
+    Requests whose responses are not parsed (e.g. DELETE, downloads) are only emitted once.
+    """
+
+    model: str
+    method: str
+    pathTemplate: str
+    status: Optional[int] = None
+    trial: int = 0
+    bytesSent: int = 0
+    bytesReceived: int = 0
+    rateLimitWait: float = 0.0
+    networkTime: float = 0.0
+    decodeTime: float = 0.0
+    validationTime: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def totalTime(self) -> float:
+        return self.rateLimitWait + self.networkTime + self.decodeTime + self.validationTime
+
+
+class RequestListener:
+    """Base class for request listeners, register with FikenObject.add_request_listener."""
+
+    def on_request(self, event: RequestEvent) -> None:
+        """Called when a response (or an error) is received."""
+        pass
+
+    def on_parsed(self, event: RequestEvent) -> None:
+        """Called when the response has been decoded and validated, with decodeTime and validationTime set."""
+        pass
+
+
+_listeners: list[RequestListener] = []
+_listeners_lock = threading.Lock()
+
+
+def add_listener(listener: RequestListener) -> None:
+    with _listeners_lock:
+        _listeners.append(listener)
+
+
+def remove_listener(listener: RequestListener) -> None:
+    with _listeners_lock:
+        _listeners.remove(listener)
+
+
+def has_listeners() -> bool:
+    return len(_listeners) > 0
+
+
+def emit(event: Optional[RequestEvent], parsed: bool = False) -> None:
+    """Sends the event to all listeners. Listener errors are logged, not raised."""
+    if event is None:
+        return
+    for listener in list(_listeners):
+        try:
+            if parsed:
+                listener.on_parsed(event)
+            else:
+                listener.on_request(event)
+        except Exception as e:
+            logger.error(f"Request listener {listener!r} failed: {e}")
+
+
+def path_template(path: str, templates: Iterable[str] = ()) -> str:
+    """Turns an already formatted path (e.g. a followed Location URL) back into a template,
+    so it is grouped with the other requests to the same endpoint.
+    Uses the first matching template, or else replaces the company slug and IDs with placeholders."""
+    path = path.rstrip("/")
+    for template in templates:
+        if _template_regex(template).match(path):
+            return template
+
+    segments = path.split("/")
+    for i, segment in enumerate(segments):
+        if i > 0 and segments[i - 1] == "companies":
+            segments[i] = "{companySlug}"
+        elif _NUMERIC_SEGMENT_REGEX.match(segment):
+            segments[i] = "{id}"
+    return "/".join(segments)
+
+
+@functools.lru_cache(maxsize=None)
+def _template_regex(template: str) -> re.Pattern:
+    parts = _PLACEHOLDER_REGEX.split(template.rstrip("/"))
+    # Every second part is a placeholder name
+    return re.compile(
+        "^"
+        + "".join("[^/]+" if i % 2 else re.escape(part) for i, part in enumerate(parts))
+        + "$"
+    )
@@ -0,0 +1,289 @@
+import datetime
+import logging
+from typing import Any, Iterable, Optional, Sequence
+
+from pydantic import BaseModel, ConfigDict
+
+from fiken_py.fiken_object import OptionalAccessToken
+from fiken_py.models import BalanceAccountBalance, JournalEntry
+from fiken_py.util import as_dicts, import_optional
+
+logger = logging.getLogger("fiken_py")
+
+type Period = tuple[datetime.date, datetime.date]
+
+
+class LedgerTable(BaseModel):
+    """Amounts per account (rows) and date or period (columns), in øre.
+    values is a NumPy int64 array of shape (len(accounts), len(columns))."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    accounts: list[str]
+    columns: list[Any]
+    values: Any
+
+    def column(self, label: Any, skip_zero: bool = True) -> dict[str, int]:
+        """The amounts of one date or period, by account."""
+        values = self.values[:, self.columns.index(label)]
+        return {
+            account: int(value)
+            for account, value in zip(self.accounts, values.tolist())
+            if value or not skip_zero
+        }
+
+    def row(self, account: str) -> list[int]:
+        """The amounts of one account, in the order of the columns. Zero for unknown accounts."""
+        if account not in self.accounts:
+            return [0] * len(self.columns)
+        return self.values[self.accounts.index(account)].tolist()
+
+    def to_dict(self) -> dict[str, list[int]]:
+        return dict(zip(self.accounts, self.values.tolist()))
+
+
+class Ledger:
+    """General ledger computed locally from journal entries, so that balances for many dates,
+    periods or projects need no more requests than reading the journal entries once:
+
+        ledger = Ledger.from_api(dateLe="2024-12-31")
+        ledger.trial_balance(datetime.date(2024, 6, 30))
+        ledger.balances(month_ends).to_dict()
+        ledger.movements([(datetime.date(2024, 1, 1), datetime.date(2024, 3, 31))], project=12)
+
+    Requires NumPy (pip install fiken_py[analytics]).
+
+    Amounts are in øre, with debit positive and credit negative. A line's amount is posted to its
+    account, and to its debitAccount (positive) and creditAccount (negative) when those are set.
+    Balances are sums of all lines up to and including the date, or from since if given. Accounts
+    are kept as in the lines (e.g. "1500:10001"); main_accounts=True sums them by their main
+    account ("1500"), which is how BalanceAccountBalance reports them.
+    """
+
+    def __init__(self, entries: Iterable[JournalEntry | dict]):
+        np = import_optional("numpy", "analytics")
+
+        account_numbers: dict[str, int] = {}
+        dates: list[datetime.date] = []
+        accounts: list[int] = []
+        amounts: list[int] = []
+        entry_ids: list[int] = []
+        projects: dict[Any, list[int]] = {}
+
+        def post(date, account, amount, entry_id, line_projects):
+            for project in line_projects or ():
+                projects.setdefault(project, []).append(len(amounts))
+            dates.append(date)
+            accounts.append(account_numbers.setdefault(str(account), len(account_numbers)))
+            amounts.append(amount)
+            entry_ids.append(-1 if entry_id is None else entry_id)
+
+        for entry in as_dicts(entries):
+            date = entry["date"]
+            entry_id = entry.get("journalEntryId")
+            for line in entry.get("lines") or []:
+                amount = int(line.get("amount") or 0)
+                line_projects = line.get("projectId")
+                if line.get("account") is not None:
+                    post(date, line["account"], amount, entry_id, line_projects)
+                if line.get("debitAccount") is not None:
+                    post(date, line["debitAccount"], amount, entry_id, line_projects)
+                if line.get("creditAccount") is not None:
+                    post(date, line["creditAccount"], -amount, entry_id, line_projects)
+
+        # Accounts are numbered in sorted order, and postings sorted by date
+        self.accounts: list[str] = sorted(account_numbers)
+        renumber = np.empty(len(account_numbers), dtype=np.intp)
+        renumber[[account_numbers[a] for a in self.accounts]] = np.arange(len(self.accounts))
+
+        posting_dates = np.array(dates, dtype="datetime64[D]")
+        order = np.argsort(posting_dates, kind="stable")
+        self._dates = posting_dates[order]
+        self._accounts = renumber[np.array(accounts, dtype=np.intp)][order]
+        self._amounts = np.array(amounts, dtype=np.int64)[order]
+        self._entry_ids = np.array(entry_ids, dtype=np.int64)[order]
+
+        position = np.empty_like(order)
+        position[order] = np.arange(len(order))
+        self._projects = {
+            project: np.sort(position[np.array(postings, dtype=np.intp)])
+            for project, postings in projects.items()
+        }
+        logger.debug(
+            f"Ledger with {len(self._amounts)} postings on {len(self.accounts)} accounts"
+        )
+
+    @classmethod
+    def from_api(
+        cls,
+        token: OptionalAccessToken = None,
+        companySlug: Optional[str] = None,
+        max_workers: int = 1,
+        **kwargs: Any,
+    ) -> "Ledger":
+        """Reads all journal entries (filtered by kwargs, e.g. dateLe) and builds the ledger from them,
+        without building JournalEntry objects."""
+        return cls(
+            JournalEntry.getAllRaw(
+                token=token, companySlug=companySlug, max_workers=max_workers, **kwargs
+            )
+        )
+
+    def __len__(self) -> int:
+        """The number of postings."""
+        return len(self._amounts)
+
+    @property
+    def main_accounts(self) -> list[str]:
+        return sorted({account.split(":")[0] for account in self.accounts})
+
+    def balances(
+        self,
+        dates: Sequence[datetime.date],
+        since: Optional[datetime.date] = None,
+        project: Optional[int] = None,
+        main_accounts: bool = False,
+    ) -> LedgerTable:
+        """Balance of every account at the end of each of dates.
+        :param since: only lines on or after this date are summed, e.g. the start of the fiscal year
+        :param project: only lines of this project are summed
+        :param main_accounts: sum subaccounts (e.g. customers' "1500:10001") into their main account
+        """
+        np = import_optional("numpy", "analytics")
+        ends = np.array(dates, dtype="datetime64[D]")
+        distinct_ends, columns = np.unique(ends, return_inverse=True)
+
+        mask = self._mask(since, project)
+        accounts, account_count = self._account_rows(main_accounts)
+        # Each posting counts from the first end date on or after its date
+        bins = np.searchsorted(distinct_ends, self._dates[mask], side="left")
+        cells = np.bincount(
+            accounts[self._accounts[mask]] * (len(distinct_ends) + 1) + bins,
+            weights=self._amounts[mask],
+            minlength=account_count * (len(distinct_ends) + 1),
+        )
+        movements = np.rint(cells).astype(np.int64)
+        movements = movements.reshape(account_count, len(distinct_ends) + 1)
+        cumulative = np.cumsum(movements[:, :-1], axis=1)
+
+        return LedgerTable(
+            accounts=self.main_accounts if main_accounts else list(self.accounts),
+            columns=list(dates),
+            values=cumulative[:, columns.reshape(-1)],
+        )
+
+    def movements(
+        self,
+        periods: Sequence[Period],
+        project: Optional[int] = None,
+        main_accounts: bool = False,
+    ) -> LedgerTable:
+        """Sum of the lines of every account in each period (first and last date included)."""
+        one_day = datetime.timedelta(days=1)
+        ends = [end for _, end in periods]
+        before_starts = [start - one_day for start, _ in periods]
+
+        table = self.balances(
+            ends + before_starts, project=project, main_accounts=main_accounts
+        )
+        count = len(periods)
+        return LedgerTable(
+            accounts=table.accounts,
+            columns=list(periods),
+            values=table.values[:, :count] - table.values[:, count:],
+        )
+
+    def trial_balance(
+        self,
+        date: Optional[datetime.date] = None,
+        since: Optional[datetime.date] = None,
+        project: Optional[int] = None,
+        main_accounts: bool = False,
+    ) -> dict[str, int]:
+        """Balance of every account with a non-zero balance at date (by default after all lines).
+        Without a project filter, the balances of a complete ledger sum to zero."""
+        if date is None:
+            date = self.last_date or datetime.date.today()
+        return self.balances(
+            [date], since=since, project=project, main_accounts=main_accounts
+        ).column(date)
+
+    def running_balance(
+        self, account: str, project: Optional[int] = None
+    ) -> list[tuple[datetime.date, Optional[int], int, int]]:
+        """The lines of one account in date order, as (date, journalEntryId, amount, balance).
+        An account without ":" also includes its subaccounts."""
+        np = import_optional("numpy", "analytics")
+        if ":" in account:
+            selected = [i for i, code in enumerate(self.accounts) if code == account]
+        else:
+            selected = [
+                i
+                for i, code in enumerate(self.accounts)
+                if code.split(":")[0] == account
+            ]
+        mask = self._mask(None, project) & np.isin(self._accounts, selected)
+
+        amounts = self._amounts[mask]
+        return [
+            (date, None if entry_id < 0 else entry_id, amount, balance)
+            for date, entry_id, amount, balance in zip(
+                self._dates[mask].tolist(),
+                self._entry_ids[mask].tolist(),
+                amounts.tolist(),
+                np.cumsum(amounts).tolist(),
+            )
+        ]
+
+    def compare(
+        self,
+        balances: Iterable[BalanceAccountBalance],
+        date: datetime.date,
+        since: Optional[datetime.date] = None,
+    ) -> dict[str, tuple[int, int]]:
+        """Cross-checks the ledger against balances read from the API for the same date.
+        :return: (ledger balance, API balance) for every account where they differ"""
+        balances = list(balances)
+        accounts = self.trial_balance(date, since=since)
+        main = self.trial_balance(date, since=since, main_accounts=True)
+
+        differences = {}
+        for balance in balances:
+            if balance.code is None:
+                continue
+            local = (accounts if ":" in balance.code else main).get(balance.code, 0)
+            remote = balance.balance or 0
+            if local != remote:
+                differences[balance.code] = (local, remote)
+        return differences
+
+    @property
+    def first_date(self) -> Optional[datetime.date]:
+        return self._dates[0].item() if len(self._dates) else None
+
+    @property
+    def last_date(self) -> Optional[datetime.date]:
+        return self._dates[-1].item() if len(self._dates) else None
+
+    def _mask(self, since: Optional[datetime.date], project: Optional[int]):
+        np = import_optional("numpy", "analytics")
+        mask = np.ones(len(self._amounts), dtype=bool)
+        if since is not None:
+            mask &= self._dates >= np.datetime64(since, "D")
+        if project is not None:
+            in_project = np.zeros(len(self._amounts), dtype=bool)
+            in_project[self._projects.get(project, [])] = True
+            mask &= in_project
+        return mask
+
+    def _account_rows(self, main_accounts: bool):
+        """The row of each account in a table, and the number of rows."""
+        np = import_optional("numpy", "analytics")
+        if not main_accounts:
+            return np.arange(len(self.accounts)), len(self.accounts)
+        main = self.main_accounts
+        rows = {account: i for i, account in enumerate(main)}
+        return (
+            np.array([rows[a.split(":")[0]] for a in self.accounts], dtype=np.intp),
+            len(main),
+        )
@@ -0,0 +1,217 @@
+import bisect
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from fiken_py.instrumentation import RequestEvent, RequestListener
+
+# Upper bounds in seconds, the last bucket (+Inf) is implicit
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+type EndpointKey = tuple[str, str, str]
+
+
+class Histogram:
+    """Histogram of observations, with Prometheus-style bucket upper bounds."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        """Estimates the q-quantile as the upper bound of the bucket it falls in."""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        result = []
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            result.append((_format_value(bound), seen))
+        result.append(("+Inf", self.count))
+        return result
+
+
+class EndpointMetrics:
+    """Everything recorded for one (model, method, path template)."""
+
+    def __init__(self, buckets: tuple[float, ...]):
+        self.network = Histogram(buckets)
+        self.decode = Histogram(buckets)
+        self.validation = Histogram(buckets)
+        self.rate_limit_wait = 0.0
+        self.throttled = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.statuses: dict[str, int] = defaultdict(int)
+
+    @property
+    def requests(self) -> int:
+        return self.network.count
+
+
+class RequestMetrics(RequestListener):
+    """In-memory per-endpoint request metrics.
+
+    Register with FikenObject.add_request_listener(metrics), then read the numbers with
+    summary()/slowest(), or expose to_prometheus() on a /metrics endpoint."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.endpoints: dict[EndpointKey, EndpointMetrics] = {}
+        self._lock = threading.Lock()
+
+    def _endpoint(self, event: RequestEvent) -> EndpointMetrics:
+        key = (event.model, event.method, event.pathTemplate)
+        endpoint = self.endpoints.get(key)
+        if endpoint is None:
+            endpoint = self.endpoints[key] = EndpointMetrics(self.buckets)
+        return endpoint
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            endpoint = self._endpoint(event)
+            endpoint.network.observe(event.networkTime)
+            endpoint.bytes_sent += event.bytesSent
+            endpoint.bytes_received += event.bytesReceived
+            endpoint.statuses[str(event.status) if event.status else "error"] += 1
+            if event.rateLimitWait > 0:
+                endpoint.throttled += 1
+                endpoint.rate_limit_wait += event.rateLimitWait
+
+    def on_parsed(self, event: RequestEvent) -> None:
+        with self._lock:
+            endpoint = self._endpoint(event)
+            endpoint.decode.observe(event.decodeTime)
+            endpoint.validation.observe(event.validationTime)
+
+    def reset(self):
+        with self._lock:
+            self.endpoints.clear()
+
+    def summary(self) -> list[dict]:
+        """One row per endpoint, with request counts, mean/p95 network time and totals."""
+        with self._lock:
+            return [
+                {
+                    "model": model,
+                    "method": method,
+                    "pathTemplate": path,
+                    "requests": endpoint.requests,
+                    "statuses": dict(endpoint.statuses),
+                    "networkMean": endpoint.network.mean,
+                    "networkP95": endpoint.network.quantile(0.95),
+                    "networkTotal": endpoint.network.sum,
+                    "decodeTotal": endpoint.decode.sum,
+                    "validationTotal": endpoint.validation.sum,
+                    "rateLimitWait": endpoint.rate_limit_wait,
+                    "bytesSent": endpoint.bytes_sent,
+                    "bytesReceived": endpoint.bytes_received,
+                }
+                for (model, method, path), endpoint in self.endpoints.items()
+            ]
+
+    def slowest(self, n: int = 10) -> list[dict]:
+        """The n endpoints with the most total time spent (network, decoding and validation)."""
+        return sorted(
+            self.summary(),
+            key=lambda row: row["networkTotal"]
+            + row["decodeTotal"]
+            + row["validationTotal"]
+            + row["rateLimitWait"],
+            reverse=True,
+        )[:n]
+
+    def to_prometheus(self, prefix: str = "fiken") -> str:
+        """The metrics in the Prometheus text exposition format."""
+        histograms = {
+            "request_network_seconds": ("Time spent waiting for the API", "network"),
+            "response_decode_seconds": ("Time spent decoding JSON", "decode"),
+            "response_validation_seconds": (
+                "Time spent validating responses into models",
+                "validation",
+            ),
+        }
+        counters = {
+            "requests_total": "Responses received, by status",
+            "request_bytes_total": "Request body bytes sent",
+            "response_bytes_total": "Response body bytes received",
+            "rate_limit_wait_seconds_total": "Time spent sleeping in the client rate limit",
+            "rate_limit_waits_total": "Requests delayed by the client rate limit",
+        }
+
+        lines = []
+        with self._lock:
+            items = sorted(self.endpoints.items())
+
+            for name, (help_text, attr) in histograms.items():
+                metric = f"{prefix}_{name}"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} histogram"]
+                for key, endpoint in items:
+                    histogram: Histogram = getattr(endpoint, attr)
+                    if histogram.count == 0:
+                        continue
+                    labels = _labels(key)
+                    for bound, count in histogram.cumulative():
+                        lines.append(
+                            f"{metric}_bucket{_labels(key, le=bound)} {count}"
+                        )
+                    lines.append(f"{metric}_sum{labels} {_format_value(histogram.sum)}")
+                    lines.append(f"{metric}_count{labels} {histogram.count}")
+
+            for name, help_text in counters.items():
+                metric = f"{prefix}_{name}"
+                lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+                for key, endpoint in items:
+                    if name == "requests_total":
+                        for status, count in sorted(endpoint.statuses.items()):
+                            lines.append(f"{metric}{_labels(key, status=status)} {count}")
+                        continue
+                    value = {
+                        "request_bytes_total": endpoint.bytes_sent,
+                        "response_bytes_total": endpoint.bytes_received,
+                        "rate_limit_wait_seconds_total": endpoint.rate_limit_wait,
+                        "rate_limit_waits_total": endpoint.throttled,
+                    }[name]
+                    lines.append(f"{metric}{_labels(key)} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(key: EndpointKey, le: Optional[str] = None, status: Optional[str] = None) -> str:
+    model, method, path = key
+    labels = [("model", model), ("method", method), ("path", path)]
+    if status is not None:
+        labels.append(("status", status))
+    if le is not None:
+        labels.append(("le", le))
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
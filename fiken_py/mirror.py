@@ -0,0 +1,343 @@
+import datetime
+import logging
+import sqlite3
+from typing import Any, Iterable, Optional
+
+from fiken_py.fiken_object import FikenObject, OptionalAccessToken
+from fiken_py.models import (
+    Contact,
+    Product,
+    Project,
+    Invoice,
+    CreditNote,
+    Sale,
+    Purchase,
+    JournalEntry,
+)
+from fiken_py.sync import SyncStore, IncrementalSync, SyncDelta, ModelType
+
+logger = logging.getLogger("fiken_py")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    company TEXT NOT NULL,
+    model TEXT NOT NULL,
+    id NOT NULL,
+    date TEXT,
+    due_date TEXT,
+    last_modified TEXT,
+    contact_id INTEGER,
+    kid TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (company, model, id)
+);
+CREATE INDEX IF NOT EXISTS idx_objects_date ON objects (company, model, date);
+CREATE INDEX IF NOT EXISTS idx_objects_due_date ON objects (company, model, due_date);
+CREATE INDEX IF NOT EXISTS idx_objects_last_modified ON objects (company, model, last_modified);
+CREATE INDEX IF NOT EXISTS idx_objects_contact ON objects (company, model, contact_id);
+CREATE INDEX IF NOT EXISTS idx_objects_kid ON objects (company, kid);
+
+CREATE TABLE IF NOT EXISTS journal_lines (
+    company TEXT NOT NULL,
+    journal_entry_id INTEGER NOT NULL,
+    line_number INTEGER NOT NULL,
+    account TEXT,
+    amount INTEGER,
+    date TEXT,
+    PRIMARY KEY (company, journal_entry_id, line_number)
+);
+CREATE INDEX IF NOT EXISTS idx_journal_lines_account ON journal_lines (company, account, date);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    company TEXT NOT NULL,
+    model TEXT NOT NULL,
+    high_water_mark TEXT,
+    PRIMARY KEY (company, model)
+);
+"""
+
+# Fields used for the indexed "date" column, in order of preference
+_DATE_FIELDS = ("issueDate", "date", "startDate", "createdDate")
+# Fields holding the contact an object belongs to
+_CONTACT_FIELDS = ("customer", "supplier", "contact")
+
+
+class LedgerMirror(SyncStore):
+    """Local SQLite mirror of a company's data, pulled through the regular models.
+
+    Objects are stored as JSON, with indexed columns for ID, date, due date, contact ID and KID.
+    Journal entry lines are also stored in their own table, indexed on account code.
+    Query helpers return the same pydantic models as the API methods.
+
+    The mirror is a SyncStore, so it is refreshed by IncrementalSync (see refresh()).
+    """
+
+    MODELS: tuple[ModelType, ...] = (
+        Contact,
+        Product,
+        Project,
+        Invoice,
+        CreditNote,
+        Sale,
+        Purchase,
+        JournalEntry,
+    )
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        companySlug: Optional[str] = None,
+        token: OptionalAccessToken = None,
+    ):
+        self.path = path
+        self.companySlug = (
+            companySlug if companySlug is not None else FikenObject._COMPANY_SLUG
+        )
+        self.token = token
+
+        self._conn = sqlite3.connect(path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    # Refreshing
+
+    def refresh(
+        self, model: ModelType, full: bool = False, **kwargs
+    ) -> SyncDelta:
+        """Fetches changes for the model from the API.
+        Models without lastModifiedDate (e.g. projects) are always fetched in full.
+        :param full: fetch all objects instead of only those changed since the last refresh
+        """
+        return IncrementalSync(self).sync(
+            model,
+            companySlug=self.companySlug,
+            token=self.token,
+            full=full or not IncrementalSync.is_syncable(model),
+            **kwargs,
+        )
+
+    def refresh_all(
+        self, models: Optional[Iterable[ModelType]] = None, full: bool = False
+    ) -> list[SyncDelta]:
+        """Refreshes all given models (by default all mirrored models)."""
+        if models is None:
+            models = self.MODELS
+        return [self.refresh(model, full=full) for model in models]
+
+    def load(self, model: ModelType, objects: list[FikenObject]) -> None:
+        """Stores already fetched objects (e.g. from getAll) without calling the API."""
+        self.put_objects(model, self.companySlug, objects)
+
+    # SyncStore
+
+    def get_object(self, model, company_slug, object_id):
+        row = self._conn.execute(
+            "SELECT data FROM objects WHERE company = ? AND model = ? AND id = ?",
+            (company_slug, model.__name__, object_id),
+        ).fetchone()
+        return self._to_object(model, row[0], company_slug) if row else None
+
+    def put_objects(self, model, company_slug, objects):
+        rows = [self._to_row(model, company_slug, obj) for obj in objects]
+
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+
+            if issubclass(model, JournalEntry):
+                self._put_journal_lines(company_slug, objects)
+
+    def get_high_water_mark(self, model, company_slug):
+        row = self._conn.execute(
+            "SELECT high_water_mark FROM sync_state WHERE company = ? AND model = ?",
+            (company_slug, model.__name__),
+        ).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return datetime.date.fromisoformat(row[0])
+
+    def set_high_water_mark(self, model, company_slug, mark):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                (company_slug, model.__name__, mark.isoformat()),
+            )
+
+    # Queries
+
+    def get(self, model: ModelType, object_id: Any) -> Optional[FikenObject]:
+        return self.get_object(model, self.companySlug, object_id)
+
+    def query(
+        self,
+        model: ModelType,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+        due_before: Optional[datetime.date] = None,
+        contact_id: Optional[int] = None,
+        kid: Optional[str] = None,
+        modified_since: Optional[datetime.date] = None,
+        limit: Optional[int] = None,
+    ) -> list[FikenObject]:
+        """Returns stored objects matching all given filters, ordered by date.
+        Dates are inclusive."""
+        conditions = ["company = ?", "model = ?"]
+        params: list[Any] = [self.companySlug, model.__name__]
+
+        for column, operator, value in (
+            ("date", ">=", date_from),
+            ("date", "<=", date_to),
+            ("due_date", "<", due_before),
+            ("contact_id", "=", contact_id),
+            ("kid", "=", kid),
+            ("last_modified", ">=", modified_since),
+        ):
+            if value is not None:
+                conditions.append(f"{column} {operator} ?")
+                params.append(
+                    value.isoformat() if isinstance(value, datetime.date) else value
+                )
+
+        sql = f"SELECT data FROM objects WHERE {' AND '.join(conditions)} ORDER BY date, id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        return [
+            self._to_object(model, row[0], self.companySlug)
+            for row in self._conn.execute(sql, params)
+        ]
+
+    def find_by_kid(self, kid: str) -> list[FikenObject]:
+        """Returns all stored objects (invoices, sales, purchases, ...) with the given KID."""
+        models = {model.__name__: model for model in self.MODELS}
+        return [
+            self._to_object(models[row[0]], row[1], self.companySlug)
+            for row in self._conn.execute(
+                "SELECT model, data FROM objects WHERE company = ? AND kid = ?",
+                (self.companySlug, kid),
+            )
+            if row[0] in models
+        ]
+
+    def journal_entries_for_account(
+        self,
+        account: str,
+        date_from: Optional[datetime.date] = None,
+        date_to: Optional[datetime.date] = None,
+    ) -> list[JournalEntry]:
+        """Returns journal entries with at least one line on the account code.
+        Matches sub-accounts as well, so "1500" also matches "1500:10001"."""
+        sql = """SELECT data FROM objects WHERE company = ? AND model = ? AND id IN (
+            SELECT journal_entry_id FROM journal_lines
+            WHERE company = ? AND (account = ? OR account LIKE ?)"""
+        params: list[Any] = [
+            self.companySlug,
+            JournalEntry.__name__,
+            self.companySlug,
+            account,
+            f"{account}:%",
+        ]
+        if date_from is not None:
+            sql += " AND date >= ?"
+            params.append(date_from.isoformat())
+        if date_to is not None:
+            sql += " AND date <= ?"
+            params.append(date_to.isoformat())
+        sql += ") ORDER BY date, id"
+
+        return [
+            self._to_object(JournalEntry, row[0], self.companySlug)
+            for row in self._conn.execute(sql, params)
+        ]
+
+    def count(self, model: ModelType) -> int:
+        return self._conn.execute(
+            "SELECT COUNT(*) FROM objects WHERE company = ? AND model = ?",
+            (self.companySlug, model.__name__),
+        ).fetchone()[0]
+
+    # Helpers
+
+    def _to_object(self, model: ModelType, data: str, company_slug: str):
+        return model._inject_token_and_slug_and_return(
+            model.model_validate_json(data), self.token, company_slug
+        )
+
+    @staticmethod
+    def _to_row(model: ModelType, company_slug: str, obj: FikenObject) -> tuple:
+        date = next(
+            (
+                getattr(obj, field)
+                for field in _DATE_FIELDS
+                if getattr(obj, field, None) is not None
+            ),
+            None,
+        )
+        due_date = getattr(obj, "dueDate", None)
+        last_modified = getattr(obj, "lastModifiedDate", None)
+
+        contact_id = getattr(obj, "contactId", None)
+        for field in _CONTACT_FIELDS:
+            contact = getattr(obj, field, None)
+            if contact is not None and hasattr(contact, "contactId"):
+                contact_id = contact.contactId
+                break
+
+        return (
+            company_slug,
+            model.__name__,
+            obj.id_attr[1],
+            date.isoformat() if date is not None else None,
+            due_date.isoformat() if due_date is not None else None,
+            last_modified.isoformat() if last_modified is not None else None,
+            contact_id,
+            getattr(obj, "kid", None),
+            obj.model_dump_json(),
+        )
+
+    def _put_journal_lines(self, company_slug: str, entries: list[JournalEntry]):
+        self._conn.executemany(
+            "DELETE FROM journal_lines WHERE company = ? AND journal_entry_id = ?",
+            [(company_slug, entry.journalEntryId) for entry in entries],
+        )
+        self._conn.executemany(
+            "INSERT INTO journal_lines VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    company_slug,
+                    entry.journalEntryId,
+                    i,
+                    account,
+                    amount,
+                    entry.date.isoformat(),
+                )
+                for entry in entries
+                for i, (account, amount) in enumerate(_postings(entry))
+            ],
+        )
+
+
+def _postings(entry: JournalEntry) -> list[tuple[Optional[str], int]]:
+    """Splits the lines of a journal entry into (account, amount) postings.
+    Lines with debitAccount/creditAccount give one posting for each side."""
+    postings = []
+    for line in entry.lines:
+        if line.account is not None:
+            postings.append((line.account, line.amount))
+            continue
+        if line.debitAccount is not None:
+            postings.append((line.debitAccount, line.amount))
+        if line.creditAccount is not None:
+            postings.append((line.creditAccount, -line.amount))
+    return postings
@@ -1,30 +1,87 @@
-from .user_info import UserInfo
-from .balance_account import BalanceAccount, BalanceAccountBalance
-from .bank_account import BankAccount, BankAccountType
-from .contact_person import ContactPerson
-from .contact import Contact
-from .product import Product
-from .product_sales_report import ProductSalesReport
-from .transaction import Transaction
-from .journal_entry import JournalEntry
-from .inbox_document import InboxDocument
-from .project import Project
-from .sale import Sale, SaleDraft
-from .invoice import (
-    Invoice,
-    InvoiceSendRequest,
-    InvoiceDraft,
-)
-from .credit_note import (
-    CreditNote,
-    CreditNoteDraft,
-)
-from .offer import Offer, OfferDraft
-from .purchase import Purchase, PurchaseDraft
-from .order_confirmation import (
-    OrderConfirmation,
-    OrderConfirmationDraft,
-)
-from .payment import PaymentPurchase, PaymentSale, Payment
-from .company import Company
-from .fiken_py import FikenPy
+"""The Fiken models. Each model module is imported the first time one of its classes is used,
+so importing one model does not build the schemas of all the others."""
+
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from .user_info import UserInfo
+    from .balance_account import BalanceAccount, BalanceAccountBalance
+    from .bank_account import BankAccount, BankAccountType
+    from .contact_person import ContactPerson
+    from .contact import Contact
+    from .product import Product
+    from .product_sales_report import ProductSalesReport
+    from .transaction import Transaction
+    from .journal_entry import JournalEntry
+    from .inbox_document import InboxDocument
+    from .project import Project
+    from .sale import Sale, SaleDraft
+    from .invoice import (
+        Invoice,
+        InvoiceSendRequest,
+        InvoiceDraft,
+    )
+    from .credit_note import (
+        CreditNote,
+        CreditNoteDraft,
+    )
+    from .offer import Offer, OfferDraft
+    from .purchase import Purchase, PurchaseDraft
+    from .order_confirmation import (
+        OrderConfirmation,
+        OrderConfirmationDraft,
+    )
+    from .payment import PaymentPurchase, PaymentSale, Payment
+    from .company import Company
+    from .fiken_py import FikenPy
+
+# Class name -> the module defining it
+_MODULES = {
+    "UserInfo": "user_info",
+    "BalanceAccount": "balance_account",
+    "BalanceAccountBalance": "balance_account",
+    "BankAccount": "bank_account",
+    "BankAccountType": "bank_account",
+    "ContactPerson": "contact_person",
+    "Contact": "contact",
+    "Product": "product",
+    "ProductSalesReport": "product_sales_report",
+    "Transaction": "transaction",
+    "JournalEntry": "journal_entry",
+    "InboxDocument": "inbox_document",
+    "Project": "project",
+    "Sale": "sale",
+    "SaleDraft": "sale",
+    "Invoice": "invoice",
+    "InvoiceSendRequest": "invoice",
+    "InvoiceDraft": "invoice",
+    "CreditNote": "credit_note",
+    "CreditNoteDraft": "credit_note",
+    "Offer": "offer",
+    "OfferDraft": "offer",
+    "Purchase": "purchase",
+    "PurchaseDraft": "purchase",
+    "OrderConfirmation": "order_confirmation",
+    "OrderConfirmationDraft": "order_confirmation",
+    "PaymentPurchase": "payment",
+    "PaymentSale": "payment",
+    "Payment": "payment",
+    "Company": "company",
+    "FikenPy": "fiken_py",
+}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name: str) -> typing.Any:
+    module_name = _MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_MODULES))
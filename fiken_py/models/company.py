@@ -1,9 +1,11 @@
 import datetime
-from typing import Optional, List
+from typing import Iterable, Optional, List, TYPE_CHECKING
 
 from pydantic import BaseModel
 
+from fiken_py import tracing
 from fiken_py.fiken_object import FikenObject
+from fiken_py.sync import IncrementalSync, SyncDelta
 from fiken_py.models import (
     BalanceAccount,
     BankAccount,
@@ -31,6 +33,15 @@ from fiken_py.models import (
 from fiken_py.shared_types import Address, AccountingAccount, AccountingAccountAssets
 from fiken_py.shared_enums import CompanyVatType
 
+if TYPE_CHECKING:
+    from fiken_py.dedup import DuplicateIndex
+    from fiken_py.ledger import Ledger
+    from fiken_py.mirror import LedgerMirror
+    from fiken_py.open_items import OpenItems
+    from fiken_py.resolver import Resolver
+    from fiken_py.sales_analytics import ProductSales
+    from fiken_py.search import SearchIndex
+
 
 class Company(BaseModel, FikenObject):
     _GET_PATH_SINGLE = "/companies/{companySlug}"
@@ -220,6 +231,22 @@ class Company(BaseModel, FikenObject):
             from_date, to_date, token=self._auth_token, companySlug=self._company_slug, **kwargs
         )
 
+    def get_duplicate_index(self, model: type[FikenObject] = Contact) -> "DuplicateIndex":
+        """Reads all contacts (or products) into a DuplicateIndex, for upserting imported ones
+        without creating duplicates."""
+        from fiken_py.dedup import DuplicateIndex
+
+        return DuplicateIndex.from_api(model, token=self._auth_token, companySlug=self.slug)
+
+    def get_product_sales(self, max_workers: int = 1) -> "ProductSales":
+        """Reads invoices, credit notes, sales and products once into ProductSales, for product
+        sales reports and series over many periods without a request per period. Requires NumPy."""
+        from fiken_py.sales_analytics import ProductSales
+
+        return ProductSales.from_api(
+            token=self._auth_token, companySlug=self.slug, max_workers=max_workers
+        )
+
     def get_products(
         self, follow_pages: bool = True, page: Optional[int] = None, **kwargs
     ) -> List[Product]:
@@ -381,6 +408,7 @@ class Company(BaseModel, FikenObject):
             **kwargs
         )
 
+    @tracing.traced
     def create_credit_note_from_invoice_full(
         self,
         invoiceId: int,
@@ -663,3 +691,73 @@ class Company(BaseModel, FikenObject):
 
     def create_project(self, project: Project, **kwargs) -> Project:
         return project.save(companySlug=self.slug, token=self._auth_token, **kwargs)
+
+    # Sync
+
+    def sync(
+        self, engine: IncrementalSync, *models: type[FikenObject], **kwargs
+    ) -> List[SyncDelta]:
+        """Incrementally syncs the given models into the engine's store."""
+        return engine.sync_all(
+            models, companySlug=self.slug, token=self._auth_token, **kwargs
+        )
+
+    def get_mirror(self, path: str = ":memory:") -> "LedgerMirror":
+        """Opens a local SQLite mirror of this company's data. Use refresh_all() to fill it."""
+        from fiken_py.mirror import LedgerMirror
+
+        return LedgerMirror(path, companySlug=self.slug, token=self._auth_token)
+
+    def get_search_index(self) -> "SearchIndex":
+        """Reads contacts, products and invoices into a local SearchIndex, for searching them
+        without a request per query. Keep it current with SearchIndex.refresh()."""
+        from fiken_py.search import SearchIndex
+
+        return SearchIndex.from_api(token=self._auth_token, companySlug=self.slug)
+
+    # References
+
+    def resolve(
+        self,
+        objects: Iterable,
+        path: str,
+        model: Optional[type[FikenObject]] = None,
+        resolver: Optional["Resolver"] = None,
+    ) -> dict:
+        """Fetches the objects referenced by ID at path, e.g. resolve(invoices, "lines.productId"),
+        in as few requests as possible. Pass a Resolver to reuse its cache between calls.
+        :return: the referenced objects by ID"""
+        from fiken_py.resolver import Resolver
+
+        if resolver is None:
+            resolver = Resolver(companySlug=self.slug, token=self._auth_token)
+        return resolver.resolve(objects, path, model=model)
+
+    # Ledger
+
+    def get_ledger(self, max_workers: int = 1, **kwargs) -> "Ledger":
+        """Reads the journal entries (filtered by kwargs, e.g. dateLe) into a local Ledger, which computes
+        balances for any dates, periods and projects without further requests. Requires NumPy."""
+        from fiken_py.ledger import Ledger
+
+        return Ledger.from_api(
+            token=self._auth_token,
+            companySlug=self.slug,
+            max_workers=max_workers,
+            **kwargs
+        )
+
+    def get_open_items(
+        self, receivables: bool = True, payables: bool = True, max_workers: int = 1
+    ) -> "OpenItems":
+        """Reads sales, invoices, credit notes and/or purchases into OpenItems, for aging and
+        DSO of what is outstanding. Requires NumPy."""
+        from fiken_py.open_items import OpenItems
+
+        return OpenItems.from_api(
+            token=self._auth_token,
+            companySlug=self.slug,
+            receivables=receivables,
+            payables=payables,
+            max_workers=max_workers,
+        )
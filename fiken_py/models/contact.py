@@ -2,8 +2,9 @@ import typing
 from datetime import date
 from typing import Optional, List
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationInfo, model_validator
 
+from fiken_py import identity_map
 from fiken_py.errors import (
     RequestWrongMediaTypeException,
     RequestContentNotFoundException,
@@ -45,6 +46,11 @@ class Contact(BaseModel, FikenObjectAttachable):
     groups: list[str] = []
     documents: List[Attachment] = []
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def _share_by_id(cls, data, handler, info: ValidationInfo):
+        return identity_map.intern(cls, "contactId", data, handler, info)
+
     @property
     def id_attr(self):
         return "contactId", self.contactId
@@ -6,6 +6,7 @@ from typing import Optional, ClassVar
 
 from pydantic import BaseModel, Field
 
+from fiken_py import tracing
 from fiken_py.authorization import AccessToken
 from fiken_py.errors import RequestContentNotFoundException, RequestErrorException
 from fiken_py.fiken_object import (
@@ -92,6 +93,7 @@ class CreditNote(FikenObjectCountable, BaseModel):
         return "creditNoteId", self.creditNoteId
 
     @classmethod
+    @tracing.traced
     def create_from_invoice_full(
         cls,
         invoiceId: int,
@@ -7,6 +7,7 @@ from typing import Optional, ClassVar, Any
 
 from pydantic import BaseModel, Field
 
+from fiken_py import tracing
 from fiken_py.authorization import AccessToken
 from fiken_py.errors import RequestErrorException
 from fiken_py.fiken_object import (
@@ -44,6 +45,7 @@ class DraftObject(FikenObjectAttachable, FikenObjectRequiringRequest, ABC):
 
         return super().save(token=token, draftId=self.draftId, **kwargs)
 
+    @tracing.traced
     def submit_object(
         self, companySlug: Optional[str] = None, token: OptionalAccessToken = None
     ):
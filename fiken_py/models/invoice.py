@@ -1,4 +1,5 @@
 import datetime
+import logging
 import typing
 from typing import Optional, ClassVar, Any
 
@@ -31,6 +32,8 @@ from fiken_py.shared_types import (
 from fiken_py.shared_enums import SendMethod, SendEmailOption, VatTypeProduct
 from fiken_py.models import Contact, Project, Sale
 
+logger = logging.getLogger("fiken_py")
+
 
 class InvoiceSendRequest(BaseModel):
     method: list[SendMethod]
@@ -108,15 +111,34 @@ class Invoice(
                 f"Object {self.__class__.__name__} does not support PATCH"
             )
 
-        payload = InvoiceUpdateRequest(
-            newDueDate=self.dueDate, sentManually=self.sentManually
-        )
+        # Only the due date and sentManually can be updated
+        updates = {"newDueDate": self.dueDate, "sentManually": self.sentManually}
+        changed = self.changed_fields()
+        if changed is not None:
+            updates = {
+                name: value
+                for name, value, field in (
+                    ("newDueDate", self.dueDate, "dueDate"),
+                    ("sentManually", self.sentManually, "sentManually"),
+                )
+                if field in changed
+            }
+            if not updates:
+                if changed:
+                    logger.warning(
+                        f"Only dueDate and sentManually can be updated on {self.__class__.__name__}, "
+                        f"not saving changes to {sorted(changed)}"
+                    )
+                return self
+
+        payload = InvoiceUpdateRequest(**updates)
 
         try:
             response = self._execute_method(
                 RequestMethod.PATCH,
                 dumped_object=payload,
                 invoiceId=self.invoiceId,
+                exclude_unset=changed is not None,
                 **kwargs,
             )
         except RequestErrorException:
@@ -161,13 +183,11 @@ class Invoice(
         if bankAccountCode is None:
             raise ValueError("bankAccountCode must be provided for saving Invoice")
 
-        lines_request = []
-        for line in self.lines:
-            lines_request.append(
-                InvoiceLineRequest(
-                    **line.model_dump(exclude={"grossInNok", "netInNok", "vatInNok"})
-                )
-            )
+        # Passed as dicts, so that the lines are validated once, as part of the InvoiceRequest
+        lines_request = [
+            FikenObjectRequiringRequest._pack_common_fields(line, InvoiceLineRequest)
+            for line in self.lines
+        ]
 
         common_lines = FikenObjectRequiringRequest._pack_common_fields(
             self, InvoiceRequest
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import logging
 import typing
 from datetime import date
 from typing import Optional, ClassVar, Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationInfo, model_validator
 
+from fiken_py import identity_map
 from fiken_py.errors import RequestWrongMediaTypeException, RequestErrorException
 from fiken_py.fiken_object import (
     FikenObject,
@@ -15,6 +17,8 @@ from fiken_py.fiken_object import (
 )
 from fiken_py.models import Contact
 
+logger = logging.getLogger("fiken_py")
+
 
 class ProjectUpdateRequest(BaseModel):
     name: Optional[str] = None
@@ -41,6 +45,11 @@ class Project(FikenObjectRequiringRequest, BaseModel):
     contact: Optional[Contact] = None
     completed: Optional[bool] = None
 
+    @model_validator(mode="wrap")
+    @classmethod
+    def _share_by_id(cls, data, handler, info: ValidationInfo):
+        return identity_map.intern(cls, "projectId", data, handler, info)
+
     @property
     def id_attr(self):
         return "projectId", self.projectId
@@ -49,12 +58,34 @@ class Project(FikenObjectRequiringRequest, BaseModel):
         if self.is_new:
             return super().save(token=token, **kwargs)
 
+        if self.is_unchanged():
+            return self
+
         if self._get_method_base_URL(RequestMethod.PATCH) is None:
             raise RequestWrongMediaTypeException(
                 f"Object {self.__class__.__name__} does not support PATCH"
             )
 
-        payload = self._to_request_object()
+        changed = self.changed_fields()
+        if changed is not None and "contact" not in changed:
+            # Only send the changed fields
+            updates = {
+                name: getattr(self, name)
+                for name in changed
+                if name in ProjectUpdateRequest.model_fields and name != "projectId"
+            }
+            if not updates:
+                if changed:
+                    logger.warning(
+                        f"Fields {sorted(changed)} can not be updated on {self.__class__.__name__}, "
+                        f"not saving them"
+                    )
+                return self
+            payload = ProjectUpdateRequest(projectId=self.projectId, **updates)
+            exclude_unset = True
+        else:
+            payload = self._to_request_object()
+            exclude_unset = False
 
         try:
             response = self._execute_method(
@@ -62,6 +93,7 @@ class Project(FikenObjectRequiringRequest, BaseModel):
                 dumped_object=payload,
                 projectId=self.projectId,
                 token=token,
+                exclude_unset=exclude_unset,
                 **kwargs,
             )
         except RequestErrorException:
@@ -0,0 +1,435 @@
+import datetime
+import logging
+from typing import Any, Iterable, Literal, Optional, Sequence
+
+from pydantic import BaseModel, ConfigDict
+
+from fiken_py.fiken_object import OptionalAccessToken
+from fiken_py.models import CreditNote, Invoice, Purchase, Sale
+from fiken_py.util import as_dicts, import_optional
+
+logger = logging.getLogger("fiken_py")
+
+type ItemKind = Literal["receivable", "payable"]
+type DocumentKey = tuple[str, int]
+
+_KINDS: tuple[ItemKind, ...] = ("receivable", "payable")
+
+# Days overdue at which the aging buckets start: not due, 1-30, 31-60, 61-90 and over 90 days
+DEFAULT_BUCKETS = (0, 30, 60, 90)
+
+
+class OpenItem(BaseModel):
+    """One outstanding receivable or payable. Amounts are in øre (NOK); credit notes are negative."""
+
+    kind: ItemKind
+    source: str
+    documentId: int
+    number: Optional[str] = None
+    kid: Optional[str] = None
+    # The sale which payments are registered on, for sales and invoices
+    saleId: Optional[int] = None
+    contactId: Optional[int] = None
+    contactName: Optional[str] = None
+    issueDate: datetime.date
+    dueDate: datetime.date
+    amount: int
+    outstanding: int
+
+
+class AgingReport(BaseModel):
+    """Outstanding amounts per contact (rows) and aging bucket (columns), in øre.
+    values is a NumPy int64 array of shape (len(contacts), len(buckets))."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    asOf: datetime.date
+    buckets: list[str]
+    contacts: list[Optional[int]]
+    names: list[Optional[str]]
+    values: Any
+
+    @property
+    def totals(self) -> dict[str, int]:
+        """The outstanding amount of each bucket, for all contacts."""
+        return dict(zip(self.buckets, self.values.sum(axis=0).tolist()))
+
+    def row(self, contactId: Optional[int]) -> dict[str, int]:
+        """The buckets of one contact, all zero if it has nothing outstanding."""
+        if contactId not in self.contacts:
+            return dict.fromkeys(self.buckets, 0)
+        return dict(zip(self.buckets, self.values[self.contacts.index(contactId)].tolist()))
+
+    def to_dict(self) -> dict[Optional[int], dict[str, int]]:
+        return {
+            contact: dict(zip(self.buckets, values))
+            for contact, values in zip(self.contacts, self.values.tolist())
+        }
+
+
+class OpenItems:
+    """In-memory view of outstanding receivables (sales, invoices and credit notes) and payables
+    (purchases), kept as NumPy columns so that aging and totals are computed in one pass even for
+    hundreds of thousands of documents:
+
+        items = OpenItems.from_api()
+        items.aging(datetime.date.today()).to_dict()
+        items.dso(datetime.date(2024, 1, 1), datetime.date(2024, 12, 31))
+        items.settle({("invoice", 123): None}).aging(datetime.date.today())  # What if 123 were paid?
+
+    Requires NumPy (pip install fiken_py[analytics]).
+
+    The outstanding amount of a sale is its outstandingBalance, and of a purchase its amount less
+    its payments; settled documents are left out. An invoice is represented by its sale, with the
+    invoice's number and due date, so the sale is not counted twice. Unsettled credit notes are
+    negative receivables. Documents without a due date are due on their issue date.
+    """
+
+    def __init__(self, items: Iterable[OpenItem | dict]):
+        np = import_optional("numpy", "analytics")
+
+        contact_numbers: dict[Optional[int], int] = {}
+        self.names: dict[Optional[int], Optional[str]] = {}
+        self.keys: list[DocumentKey] = []
+        self.numbers: list[Optional[str]] = []
+        self.kids: list[Optional[str]] = []
+        self.sale_ids: list[Optional[int]] = []
+        kinds, contacts, issued, due, amounts, outstanding = [], [], [], [], [], []
+
+        for item in items:
+            if isinstance(item, OpenItem):
+                item = item.model_dump()
+            contact = item.get("contactId")
+            if contact not in contact_numbers:
+                contact_numbers[contact] = len(contact_numbers)
+                self.names[contact] = item.get("contactName")
+            self.keys.append((item["source"], item["documentId"]))
+            self.numbers.append(item.get("number"))
+            self.kids.append(item.get("kid"))
+            self.sale_ids.append(item.get("saleId"))
+            kinds.append(_KINDS.index(item["kind"]))
+            contacts.append(contact_numbers[contact])
+            issued.append(item["issueDate"])
+            due.append(item.get("dueDate") or item["issueDate"])
+            amounts.append(item["amount"])
+            outstanding.append(item["outstanding"])
+
+        self.contacts: list[Optional[int]] = list(contact_numbers)
+        self._rows: dict[DocumentKey, int] = {key: i for i, key in enumerate(self.keys)}
+        self._kinds = np.array(kinds, dtype=np.int8)
+        self._contacts = np.array(contacts, dtype=np.intp)
+        self._issued = np.array(issued, dtype="datetime64[D]")
+        self._due = np.array(due, dtype="datetime64[D]")
+        self._amounts = np.array(amounts, dtype=np.int64)
+        self._outstanding = np.array(outstanding, dtype=np.int64)
+
+    @classmethod
+    def from_documents(
+        cls,
+        sales: Iterable[Sale | dict] = (),
+        invoices: Iterable[Invoice | dict] = (),
+        purchases: Iterable[Purchase | dict] = (),
+        credit_notes: Iterable[CreditNote | dict] = (),
+    ) -> "OpenItems":
+        """Builds the open items from documents, as objects or as decoded JSON."""
+        items: list[dict] = []
+        invoiced_sales: set[int] = set()
+
+        for invoice in as_dicts(invoices):
+            sale = invoice.get("sale") or {}
+            if sale.get("saleId") is not None:
+                invoiced_sales.add(sale["saleId"])
+            item = _invoice_item(invoice)
+            if item is not None:
+                items.append(item)
+
+        for credit_note in as_dicts(credit_notes):
+            sale = credit_note.get("sale") or {}
+            if sale.get("saleId") is not None:
+                invoiced_sales.add(sale["saleId"])
+            item = _credit_note_item(credit_note)
+            if item is not None:
+                items.append(item)
+
+        for sale in as_dicts(sales):
+            if sale.get("saleId") in invoiced_sales:
+                continue
+            item = _sale_item(sale)
+            if item is not None:
+                items.append(item)
+
+        for purchase in as_dicts(purchases):
+            item = _purchase_item(purchase)
+            if item is not None:
+                items.append(item)
+
+        return cls(items)
+
+    @classmethod
+    def from_api(
+        cls,
+        token: OptionalAccessToken = None,
+        companySlug: Optional[str] = None,
+        receivables: bool = True,
+        payables: bool = True,
+        max_workers: int = 1,
+    ) -> "OpenItems":
+        """Reads the documents (with getAllRaw, without building objects) and builds the open items."""
+        options = {"token": token, "companySlug": companySlug, "max_workers": max_workers}
+        return cls.from_documents(
+            sales=Sale.getAllRaw(**options) if receivables else (),
+            invoices=Invoice.getAllRaw(**options) if receivables else (),
+            credit_notes=CreditNote.getAllRaw(**options) if receivables else (),
+            purchases=Purchase.getAllRaw(**options) if payables else (),
+        )
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def item(self, source: str, documentId: int) -> OpenItem:
+        """The open item of a document, e.g. item("invoice", 123). Raises KeyError if it is not open."""
+        return self._item(self._rows[(source, documentId)])
+
+    def items(
+        self,
+        kind: ItemKind = "receivable",
+        contactId: Optional[int] = None,
+        overdue_as_of: Optional[datetime.date] = None,
+    ) -> list[OpenItem]:
+        """The open items of one kind, optionally of one contact and/or overdue at a date, by due date."""
+        np = import_optional("numpy", "analytics")
+        mask = self._open(kind)
+        if contactId is not None:
+            if contactId not in self.names:
+                return []
+            mask &= self._contacts == self.contacts.index(contactId)
+        if overdue_as_of is not None:
+            mask &= self._due < np.datetime64(overdue_as_of, "D")
+        rows = np.flatnonzero(mask)
+        rows = rows[np.argsort(self._due[rows], kind="stable")]
+        return [self._item(row) for row in rows.tolist()]
+
+    def outstanding(self, kind: ItemKind = "receivable") -> dict[Optional[int], int]:
+        """The outstanding amount of each contact with anything outstanding."""
+        np = import_optional("numpy", "analytics")
+        mask = self._open(kind)
+        totals = np.bincount(
+            self._contacts[mask],
+            weights=self._outstanding[mask],
+            minlength=len(self.contacts),
+        )
+        return {
+            contact: int(total)
+            for contact, total in zip(self.contacts, np.rint(totals).tolist())
+            if total
+        }
+
+    def aging(
+        self,
+        as_of: datetime.date,
+        kind: ItemKind = "receivable",
+        buckets: Sequence[int] = DEFAULT_BUCKETS,
+    ) -> AgingReport:
+        """Outstanding amounts per contact, bucketed by days overdue at as_of. Only documents issued
+        on or before as_of are included.
+        :param buckets: days overdue at which the buckets start, the first bucket being "not due"
+        """
+        np = import_optional("numpy", "analytics")
+        as_of_day = np.datetime64(as_of, "D")
+        mask = self._open(kind) & (self._issued <= as_of_day)
+
+        overdue_days = (as_of_day - self._due[mask]).astype(np.int64)
+        columns = np.searchsorted(np.asarray(buckets), overdue_days, side="left")
+        width = len(buckets) + 1
+        cells = np.bincount(
+            self._contacts[mask] * width + columns,
+            weights=self._outstanding[mask],
+            minlength=len(self.contacts) * width,
+        )
+        values = np.rint(cells).astype(np.int64).reshape(len(self.contacts), width)
+
+        rows = np.flatnonzero(values.any(axis=1))
+        contacts = [self.contacts[row] for row in rows.tolist()]
+        return AgingReport(
+            asOf=as_of,
+            buckets=_bucket_labels(buckets),
+            contacts=contacts,
+            names=[self.names[contact] for contact in contacts],
+            values=values[rows],
+        )
+
+    def dso(
+        self,
+        start: datetime.date,
+        end: datetime.date,
+        kind: ItemKind = "receivable",
+    ) -> Optional[float]:
+        """Days sales outstanding for the period: the amount outstanding on documents issued up to end,
+        divided by the amount issued in the period, times the days in the period.
+        None if nothing was issued in the period."""
+        np = import_optional("numpy", "analytics")
+        first, last = np.datetime64(start, "D"), np.datetime64(end, "D")
+        of_kind = self._kinds == _KINDS.index(kind)
+        issued_in_period = of_kind & (self._issued >= first) & (self._issued <= last)
+        sales = int(self._amounts[issued_in_period].sum())
+        if sales == 0:
+            return None
+        outstanding = int(self._outstanding[of_kind & (self._issued <= last)].sum())
+        return outstanding / sales * ((end - start).days + 1)
+
+    def settle(self, settlements: dict[DocumentKey, Optional[int]]) -> "OpenItems":
+        """What-if: a copy where the documents are (partly) paid. The original is unchanged.
+        :param settlements: amount paid by (source, documentId), None for the full outstanding amount
+        """
+        settled = self._copy()
+        for key, amount in settlements.items():
+            row = self._rows[key]
+            if amount is None:
+                settled._outstanding[row] = 0
+            else:
+                settled._outstanding[row] -= amount
+        return settled
+
+    def _open(self, kind: ItemKind):
+        return (self._kinds == _KINDS.index(kind)) & (self._outstanding != 0)
+
+    def _item(self, row: int) -> OpenItem:
+        source, document_id = self.keys[row]
+        contact = self.contacts[self._contacts[row]]
+        return OpenItem(
+            kind=_KINDS[self._kinds[row]],
+            source=source,
+            documentId=document_id,
+            number=self.numbers[row],
+            kid=self.kids[row],
+            saleId=self.sale_ids[row],
+            contactId=contact,
+            contactName=self.names[contact],
+            issueDate=self._issued[row].item(),
+            dueDate=self._due[row].item(),
+            amount=int(self._amounts[row]),
+            outstanding=int(self._outstanding[row]),
+        )
+
+    def _copy(self) -> "OpenItems":
+        copy = object.__new__(OpenItems)
+        copy.__dict__.update(self.__dict__)
+        copy._outstanding = self._outstanding.copy()
+        return copy
+
+
+def _bucket_labels(buckets: Sequence[int]) -> list[str]:
+    labels = ["not due"]
+    for start, end in zip(buckets, buckets[1:]):
+        labels.append(f"{start + 1}-{end}")
+    labels.append(f"over {buckets[-1]}")
+    return labels
+
+
+def _contact(document: dict, field: str) -> tuple[Optional[int], Optional[str]]:
+    contact = document.get(field) or {}
+    return contact.get("contactId"), contact.get("name")
+
+
+def _sale_item(sale: dict) -> Optional[dict]:
+    if sale.get("settled") or sale.get("deleted"):
+        return None
+    amount = (sale.get("netAmount") or 0) + (sale.get("vatAmount") or 0)
+    outstanding = sale.get("outstandingBalance")
+    if outstanding is None:
+        outstanding = amount - (sale.get("totalPaid") or 0)
+    if not outstanding or sale.get("date") is None:
+        return None
+    contact_id, contact_name = _contact(sale, "customer")
+    return {
+        "kind": "receivable",
+        "source": "sale",
+        "documentId": sale["saleId"],
+        "number": sale.get("saleNumber"),
+        "kid": sale.get("kid"),
+        "saleId": sale["saleId"],
+        "contactId": contact_id,
+        "contactName": contact_name,
+        "issueDate": sale["date"],
+        "dueDate": sale.get("dueDate"),
+        "amount": amount,
+        "outstanding": outstanding,
+    }
+
+
+def _invoice_item(invoice: dict) -> Optional[dict]:
+    sale = invoice.get("sale") or {}
+    if sale.get("settled") or invoice.get("cash"):
+        return None
+    amount = invoice.get("grossInNok")
+    if amount is None:
+        amount = invoice.get("gross") or 0
+    outstanding = sale.get("outstandingBalance")
+    if outstanding is None:
+        outstanding = amount
+    if not outstanding or invoice.get("issueDate") is None:
+        return None
+    contact_id, contact_name = _contact(invoice, "customer")
+    number = invoice.get("invoiceNumber")
+    return {
+        "kind": "receivable",
+        "source": "invoice",
+        "documentId": invoice["invoiceId"],
+        "number": None if number is None else str(number),
+        "kid": invoice.get("kid"),
+        "saleId": sale.get("saleId"),
+        "contactId": contact_id,
+        "contactName": contact_name,
+        "issueDate": invoice["issueDate"],
+        "dueDate": invoice.get("dueDate"),
+        "amount": amount,
+        "outstanding": outstanding,
+    }
+
+
+def _credit_note_item(credit_note: dict) -> Optional[dict]:
+    amount = -(credit_note.get("grossInNok") or credit_note.get("gross") or 0)
+    issued = credit_note.get("issueDate") or (credit_note.get("sale") or {}).get("date")
+    if credit_note.get("settled") or not amount or issued is None:
+        return None
+    contact_id, contact_name = _contact(credit_note, "customer")
+    number = credit_note.get("creditNoteNumber")
+    return {
+        "kind": "receivable",
+        "source": "credit_note",
+        "documentId": credit_note["creditNoteId"],
+        "number": None if number is None else str(number),
+        "kid": credit_note.get("kid"),
+        "contactId": contact_id,
+        "contactName": contact_name,
+        "issueDate": issued,
+        "dueDate": issued,
+        "amount": amount,
+        "outstanding": amount,
+    }
+
+
+def _purchase_item(purchase: dict) -> Optional[dict]:
+    if purchase.get("paid") or purchase.get("deleted"):
+        return None
+    amount = sum(
+        (line.get("netPrice") or 0) + (line.get("vat") or 0)
+        for line in purchase.get("lines") or []
+    )
+    paid = sum(payment.get("amount") or 0 for payment in purchase.get("payments") or [])
+    if amount == paid:
+        return None
+    contact_id, contact_name = _contact(purchase, "supplier")
+    return {
+        "kind": "payable",
+        "source": "purchase",
+        "documentId": purchase["purchaseId"],
+        "number": purchase.get("identifier"),
+        "kid": purchase.get("kid"),
+        "contactId": contact_id,
+        "contactName": contact_name,
+        "issueDate": purchase["date"],
+        "dueDate": purchase.get("dueDate"),
+        "amount": amount,
+        "outstanding": amount - paid,
+    }
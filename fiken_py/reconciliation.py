@@ -0,0 +1,348 @@
+import datetime
+import difflib
+import logging
+import re
+from typing import Callable, Iterable, Literal, Optional
+
+from pydantic import BaseModel
+
+from fiken_py.bulk import BulkProgress, BulkResult, run_bulk
+from fiken_py.fiken_object import OptionalAccessToken
+from fiken_py.models import Payment, PaymentPurchase, PaymentSale
+from fiken_py.open_items import OpenItem, OpenItems
+from fiken_py.util import fold, import_optional
+
+logger = logging.getLogger("fiken_py")
+
+type MatchMethod = Literal["kid", "amount", "reference"]
+
+# Days between a statement line and the due date for matching on amount
+DEFAULT_DATE_WINDOW = 14
+# Lowest similarity between a reference and a contact name for a fuzzy match
+DEFAULT_FUZZY_THRESHOLD = 0.8
+
+# Words of text folded with util.fold, as in dedup and search
+_TOKEN_REGEX = re.compile(r"[0-9a-z]+")
+
+
+class StatementLine(BaseModel):
+    """A bank statement line. Amounts are in øre: positive for money received, negative for money paid."""
+
+    date: datetime.date
+    amount: int
+    kid: Optional[str] = None
+    reference: Optional[str] = None
+    # Bank account code the payment is registered on, e.g. "1920:10001", if not the default
+    account: Optional[str] = None
+    lineId: Optional[str] = None
+
+
+class Match(BaseModel):
+    """A statement line matched to an open item. amount is what is registered as paid on the item."""
+
+    line: StatementLine
+    item: OpenItem
+    method: MatchMethod
+    score: float
+    amount: int
+
+    def payment(self, account: Optional[str] = None) -> Payment:
+        """The payment to register for the match: a PaymentSale for sales and invoices,
+        a PaymentPurchase for purchases."""
+        payment_type = PaymentPurchase if self.item.kind == "payable" else PaymentSale
+        return payment_type(
+            date=self.line.date,
+            account=self.line.account or account,
+            amount=self.amount,
+            description=self.line.reference,
+        )
+
+    @property
+    def payment_target(self) -> dict[str, int]:
+        """The placeholder of the document the payment is posted to, e.g. {"saleId": 1}."""
+        if self.item.kind == "payable":
+            return {"purchaseId": self.item.documentId}
+        return {"saleId": self.item.saleId}
+
+
+class ReconciliationResult(BaseModel):
+    matches: list[Match] = []
+    unmatched: list[StatementLine] = []
+    # Lines which matched several items equally well, with the candidates
+    ambiguous: list[tuple[StatementLine, list[OpenItem]]] = []
+
+
+class Reconciler:
+    """Matches bank statement lines to open sales, invoices and purchases, using indexes so that
+    each line costs a few lookups instead of a scan of all open items:
+
+        reconciler = Reconciler(company.get_open_items())
+        result = reconciler.match(lines)
+        reconciler.post(result, account="1920:10001")  # Registers the payments concurrently
+
+    A line is matched, in this order:
+    - by KID, to the open item with that KID
+    - by amount, to the only open item of the same kind with exactly the line's amount outstanding
+      and a due date within date_window days of the line
+    - by reference, to the only open item whose number (e.g. invoice number) appears in the reference,
+      or to the contact whose name is most similar to the reference (with its item of the same
+      amount, or its oldest item otherwise)
+    Matched amounts are deducted as lines are matched, so an item is never paid more than is outstanding.
+    Invoices without a sale can not be paid, so their lines are left unmatched.
+    """
+
+    def __init__(
+        self,
+        items: OpenItems,
+        date_window: int = DEFAULT_DATE_WINDOW,
+        fuzzy_threshold: float = DEFAULT_FUZZY_THRESHOLD,
+    ):
+        self.items = items
+        self.date_window = date_window
+        self.fuzzy_threshold = fuzzy_threshold
+
+        np = import_optional("numpy", "analytics")
+        self._outstanding: list[int] = items._outstanding.tolist()
+        self._due: list[int] = items._due.astype(np.int64).tolist()
+        self._kinds: list[int] = items._kinds.tolist()
+        contacts = items._contacts.tolist()
+        # Payments for receivables are registered on their sale, so items without one can not be matched
+        for row, sale_id in enumerate(items.sale_ids):
+            if sale_id is None and self._kinds[row] == 0:
+                self._outstanding[row] = 0
+
+        self._by_kid = _Index()
+        self._by_number = _Index()
+        self._by_contact = _Index()
+        self._names: dict[tuple[int, int], str] = {}
+        self._trigrams: dict[tuple[int, str], set[int]] = {}
+
+        for row, outstanding in enumerate(self._outstanding):
+            if outstanding <= 0:
+                continue
+            kind = self._kinds[row]
+            kid = items.kids[row]
+            if kid:
+                self._by_kid.add(_normalize(kid), row)
+            number = items.numbers[row]
+            if number:
+                self._by_number.add((kind, _normalize(number)), row)
+            contact = contacts[row]
+            self._by_contact.add(contact, row)
+            name = items.names[items.contacts[contact]]
+            if name and (kind, contact) not in self._names:
+                self._names[(kind, contact)] = _normalize(name)
+                for trigram in _trigrams(name):
+                    self._trigrams.setdefault((kind, trigram), set()).add(contact)
+
+        # Open rows sorted by kind, amount and due date, for finding an amount within a date range
+        open_rows = np.flatnonzero(np.array(self._outstanding, dtype=np.int64) > 0)
+        keys = _amount_keys(
+            np,
+            items._kinds[open_rows],
+            items._outstanding[open_rows],
+            items._due[open_rows].astype(np.int64),
+        )
+        order = np.argsort(keys, kind="stable")
+        self._amount_keys = keys[order]
+        self._amount_rows = open_rows[order]
+        logger.debug(f"Reconciler indexed {len(open_rows)} open items")
+
+    def match(self, lines: Iterable[StatementLine]) -> ReconciliationResult:
+        result = ReconciliationResult()
+        for line in lines:
+            if line.amount == 0:
+                result.unmatched.append(line)
+                continue
+            kind = 0 if line.amount > 0 else 1
+            amount = abs(line.amount)
+
+            found = (
+                self._match_kid(line)
+                or self._match_amount(line, kind, amount)
+                or self._match_reference(line, kind, amount)
+            )
+            if found is None:
+                result.unmatched.append(line)
+                continue
+            method, score, rows = found
+            if len(rows) > 1:
+                result.ambiguous.append((line, [self.items._item(row) for row in rows]))
+                continue
+
+            row = rows[0]
+            paid = min(amount, self._outstanding[row])
+            result.matches.append(
+                Match(
+                    line=line,
+                    item=self.items._item(row),
+                    method=method,
+                    score=score,
+                    amount=paid,
+                )
+            )
+            self._outstanding[row] -= paid
+        return result
+
+    def post(
+        self,
+        result: ReconciliationResult,
+        account: Optional[str] = None,
+        token: OptionalAccessToken = None,
+        companySlug: Optional[str] = None,
+        max_workers: int = 4,
+        on_progress: Optional[Callable[[BulkProgress], None]] = None,
+    ) -> BulkResult:
+        """Registers the payments of the matches concurrently, with run_bulk.
+        :param account: bank account code for lines without their own account
+        :return: BulkResult with the saved payments, and the matches which failed"""
+
+        def register(match: Match) -> Payment:
+            return match.payment(account).save(
+                token=token, companySlug=companySlug, **match.payment_target
+            )
+
+        return run_bulk(
+            register, result.matches, max_workers=max_workers, on_progress=on_progress
+        )
+
+    def _open(self, rows: Iterable[int]) -> list[int]:
+        return [row for row in rows if self._outstanding[row] > 0]
+
+    def _match_kid(self, line: StatementLine):
+        if not line.kid:
+            return None
+        rows = self._open(self._by_kid.rows(_normalize(line.kid)))
+        if len(rows) > 1:
+            # Prefer the item with exactly the line's amount outstanding
+            exact = [row for row in rows if self._outstanding[row] == abs(line.amount)]
+            rows = exact or rows
+        return ("kid", 1.0, rows) if rows else None
+
+    def _match_amount(self, line: StatementLine, kind: int, amount: int):
+        day = (line.date - _EPOCH).days
+        prefix = (kind << _KIND_SHIFT) | (amount << _AMOUNT_SHIFT)
+        first = prefix | (day - self.date_window + _DAY_OFFSET)
+        last = prefix | (day + self.date_window + _DAY_OFFSET)
+        start = self._amount_keys.searchsorted(first, side="left")
+        end = self._amount_keys.searchsorted(last, side="right")
+        rows = [
+            row
+            for row in self._amount_rows[start:end].tolist()
+            if self._outstanding[row] == amount
+        ]
+        if len(rows) > 1 and line.reference:
+            narrowed = self._match_reference(line, kind, amount, among=set(rows))
+            if narrowed is not None:
+                rows = narrowed[2]
+        return ("amount", 0.9, rows) if rows else None
+
+    def _match_reference(
+        self,
+        line: StatementLine,
+        kind: int,
+        amount: int,
+        among: Optional[set[int]] = None,
+    ):
+        if not line.reference:
+            return None
+
+        tokens = _TOKEN_REGEX.findall(fold(line.reference))
+        rows = set()
+        for token in tokens:
+            rows.update(self._open(self._by_number.rows((kind, token))))
+        if among is not None:
+            rows &= among
+        if rows:
+            return "reference", 1.0, sorted(rows)
+
+        # Contacts sharing trigrams with the reference, ranked by name similarity
+        candidates = set()
+        for trigram in _trigrams(line.reference):
+            candidates.update(self._trigrams.get((kind, trigram), ()))
+        reference = _normalize(line.reference)
+        scored = sorted(
+            (
+                (_similarity(self._names[(kind, contact)], reference), contact)
+                for contact in candidates
+            ),
+            reverse=True,
+        )
+        if not scored or scored[0][0] < self.fuzzy_threshold:
+            return None
+        if len(scored) > 1 and scored[1][0] == scored[0][0]:
+            return None
+
+        score, contact = scored[0]
+        rows = [
+            row
+            for row in self._open(self._by_contact.rows(contact))
+            if self._kinds[row] == kind and (among is None or row in among)
+        ]
+        if not rows:
+            return None
+        exact = [row for row in rows if self._outstanding[row] == amount]
+        if exact:
+            return "reference", score, exact
+        return "reference", score, [min(rows, key=lambda row: (self._due[row], row))]
+
+
+_EPOCH = datetime.date(1970, 1, 1)
+
+# Bit positions of the kind and amount in the keys of the amount index, below them the due date
+_KIND_SHIFT = 61
+_AMOUNT_SHIFT = 20
+_DAY_OFFSET = 1 << 19
+
+
+class _Index(dict):
+    """Maps keys to rows. A key with a single row (the usual case) holds the row itself,
+    so that building the index does not create a list per key."""
+
+    def add(self, key, row: int):
+        current = self.get(key)
+        if current is None:
+            self[key] = row
+        elif isinstance(current, list):
+            current.append(row)
+        else:
+            self[key] = [current, row]
+
+    def rows(self, key) -> list[int]:
+        current = self.get(key)
+        if current is None:
+            return []
+        return current if isinstance(current, list) else [current]
+
+
+def _amount_keys(np, kinds, amounts, days):
+    """One sortable int64 per (kind, amount, day). Amounts must be below 2**41 øre."""
+    return (
+        (kinds.astype(np.int64) << _KIND_SHIFT)
+        | (amounts.astype(np.int64) << _AMOUNT_SHIFT)
+        | (days.astype(np.int64) + _DAY_OFFSET)
+    )
+
+
+def _normalize(text: str) -> str:
+    folded = fold(text)
+    if folded.isalnum():
+        return folded
+    return "".join(_TOKEN_REGEX.findall(folded))
+
+
+def _trigrams(text: str) -> set[str]:
+    normalized = _normalize(text)
+    return {normalized[i : i + 3] for i in range(len(normalized) - 2)}
+
+
+def _similarity(name: str, reference: str) -> float:
+    """How well the name appears in the reference: the best ratio of the name against the parts
+    of the reference of the same length, 1.0 if it is contained in it."""
+    if name in reference:
+        return 1.0
+    width = len(name)
+    return max(
+        difflib.SequenceMatcher(None, name, reference[i : i + width]).ratio()
+        for i in range(max(1, len(reference) - width + 1))
+    )
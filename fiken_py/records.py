@@ -0,0 +1,143 @@
+import dataclasses
+import datetime
+import types
+import typing
+from typing import Any, ClassVar, Iterator, Optional, Union
+
+from pydantic import BaseModel
+
+from fiken_py.fiken_object import FikenObject, OptionalAccessToken
+
+# Kinds of fields in a record plan
+_VALUE = 0
+_DATE = 1
+_RECORD = 2
+_RECORDS = 3
+_VALUES = 4
+
+type FieldPlan = tuple[str, str, int, Optional[type["Record"]]]
+
+
+class Record:
+    """Base class of the read-only records generated by record_type.
+
+    Records are frozen, slotted dataclasses with the same field names as their model. Values are kept
+    as in the JSON (enums as strings, amounts as ints), except that dates are datetime.date,
+    nested objects are records and lists are tuples. Fields missing from the JSON are None.
+    """
+
+    __slots__ = ()
+
+    MODEL: ClassVar[type[BaseModel]]
+    _PLAN: ClassVar[tuple[FieldPlan, ...]]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> typing.Self:
+        """Builds a record from decoded JSON (as returned by the API), without validation."""
+        values = []
+        for _, key, kind, nested in cls._PLAN:
+            value = data.get(key)
+            if value is not None and kind:
+                if kind == _DATE:
+                    value = datetime.date.fromisoformat(value)
+                elif kind == _RECORD:
+                    value = nested.from_dict(value)
+                elif kind == _RECORDS:
+                    value = tuple(nested.from_dict(item) for item in value)
+                else:
+                    value = tuple(value)
+            values.append(value)
+        return cls(*values)
+
+    def to_dict(self) -> dict:
+        """The record as JSON-like data, leaving out None values."""
+        data = {}
+        for name, key, kind, _ in self._PLAN:
+            value = getattr(self, name)
+            if value is None:
+                continue
+            if kind == _DATE:
+                value = value.isoformat()
+            elif kind == _RECORD:
+                value = value.to_dict()
+            elif kind == _RECORDS:
+                value = [item.to_dict() for item in value]
+            elif kind == _VALUES:
+                value = list(value)
+            data[key] = value
+        return data
+
+    def to_model(self) -> BaseModel:
+        """Validates the record into a full model object."""
+        return self.MODEL.model_validate(self.to_dict())
+
+
+_RECORD_TYPES: dict[type[BaseModel], type[Record]] = {}
+
+
+def record_type(model: type[BaseModel]) -> type[Record]:
+    """The record class for the model, e.g. record_type(Invoice) -> InvoiceRecord.
+    Nested models (e.g. the lines of an Invoice) get record classes of their own."""
+    cls = _RECORD_TYPES.get(model)
+    if cls is not None:
+        return cls
+
+    names = list(model.model_fields)
+    cls = dataclasses.make_dataclass(
+        f"{model.__name__}Record",
+        [(name, Any, dataclasses.field(default=None)) for name in names],
+        bases=(Record,),
+        frozen=True,
+        slots=True,
+        module=__name__,
+    )
+    cls.MODEL = model
+    # Registered before the plan is built, so that self-referencing models find their own record type
+    _RECORD_TYPES[model] = cls
+    cls._PLAN = tuple(
+        (name, field.alias or name, *_field_kind(field.annotation))
+        for name, field in model.model_fields.items()
+    )
+    return cls
+
+
+def _field_kind(annotation: Any) -> tuple[int, Optional[type[Record]]]:
+    origin = typing.get_origin(annotation)
+    if origin in (Union, types.UnionType):
+        for arg in typing.get_args(annotation):
+            if arg is not type(None):
+                kind = _field_kind(arg)
+                if kind[0] != _VALUE:
+                    return kind
+        return _VALUE, None
+    if origin in (list, tuple, set):
+        args = typing.get_args(annotation)
+        if args and isinstance(args[0], type) and issubclass(args[0], BaseModel):
+            return _RECORDS, record_type(args[0])
+        return _VALUES, None
+    if isinstance(annotation, type):
+        if issubclass(annotation, BaseModel):
+            return _RECORD, record_type(annotation)
+        if issubclass(annotation, datetime.date) and not issubclass(
+            annotation, datetime.datetime
+        ):
+            return _DATE, None
+    return _VALUE, None
+
+
+def from_model(obj: BaseModel) -> Record:
+    """The record for a model object."""
+    return record_type(type(obj)).from_dict(obj.model_dump(mode="json", by_alias=True))
+
+
+def iter_records(
+    model: type[FikenObject],
+    token: OptionalAccessToken = None,
+    max_workers: int = 1,
+    **kwargs: Any,
+) -> Iterator[Record]:
+    """Yields all objects of the model as records, fetched page by page as iter_pages does."""
+    cls = record_type(model)
+    for page in model._iter_raw_pages(token=token, max_workers=max_workers, **kwargs):
+        for item in page:
+            yield cls.from_dict(item)
@@ -0,0 +1,135 @@
+import logging
+import re
+from typing import Any, Iterable, Optional
+
+from fiken_py.fiken_object import FikenObject, OptionalAccessToken
+from fiken_py.models import BalanceAccount, Contact, Product, Project
+
+logger = logging.getLogger("fiken_py")
+
+# The model referenced by each ID field name
+REFERENCES: dict[str, type[FikenObject]] = {
+    "productId": Product,
+    "contactId": Contact,
+    "customerId": Contact,
+    "supplierId": Contact,
+    "projectId": Project,
+    "account": BalanceAccount,
+    "incomeAccount": BalanceAccount,
+    "debitAccount": BalanceAccount,
+    "creditAccount": BalanceAccount,
+}
+
+# Up to this many missing objects are fetched one by one, more than that reads the whole collection
+SINGLE_GET_LIMIT = 3
+
+
+class Resolver:
+    """Resolves ID references (e.g. the productId of invoice lines) to objects, with as few requests
+    as possible. Objects are cached, so one resolver can be reused for many resolve calls.
+
+        resolver = Resolver(companySlug="fiken-demo")
+        products = resolver.resolve(invoices, "lines.productId")
+        products[invoices[0].lines[0].productId].name
+
+    Up to single_get_limit missing objects are fetched with get; otherwise the whole collection is read
+    once, and later lookups in that collection are served from the cache.
+    """
+
+    def __init__(
+        self,
+        companySlug: Optional[str] = None,
+        token: OptionalAccessToken = None,
+        single_get_limit: int = SINGLE_GET_LIMIT,
+    ):
+        self.companySlug = companySlug
+        self.token = token
+        self.single_get_limit = single_get_limit
+        self.cache: dict[type[FikenObject], dict[Any, Optional[FikenObject]]] = {}
+        self._complete: set[type[FikenObject]] = set()
+
+    def add(self, objects: Iterable[FikenObject]):
+        """Adds already loaded objects to the cache."""
+        for obj in objects:
+            _, id_value = obj.id_attr
+            if id_value is not None:
+                self.cache.setdefault(type(obj), {})[id_value] = obj
+
+    def resolve(
+        self,
+        objects: Iterable[Any],
+        path: str,
+        model: Optional[type[FikenObject]] = None,
+    ) -> dict[Any, FikenObject]:
+        """Fetches the objects referenced at path in each of objects.
+        :param path: dotted attribute path to the ID, through lists, e.g. "lines.productId"
+        :param model: the referenced model, by default looked up from the last part of path in REFERENCES
+        :return: the referenced objects by ID. IDs that do not exist are left out.
+        """
+        if model is None:
+            field = path.rsplit(".", 1)[-1]
+            model = REFERENCES.get(field)
+            if model is None:
+                raise ValueError(
+                    f"Unknown reference {field!r}, pass the model it refers to"
+                )
+
+        ids = set()
+        for obj in objects:
+            for value in _values_at(obj, path.split(".")):
+                ids.add(value)
+
+        self._fetch(model, ids)
+        cached = self.cache.get(model, {})
+        return {
+            id_value: cached[id_value]
+            for id_value in ids
+            if cached.get(id_value) is not None
+        }
+
+    def _fetch(self, model: type[FikenObject], ids: set):
+        cached = self.cache.setdefault(model, {})
+        missing = [id_value for id_value in ids if id_value not in cached]
+        if not missing or model in self._complete:
+            return
+
+        if len(missing) <= self.single_get_limit:
+            id_name = _id_placeholder(model)
+            for id_value in missing:
+                cached[id_value] = model.get(
+                    token=self.token,
+                    companySlug=self.companySlug,
+                    **{id_name: id_value},
+                )
+            return
+
+        logger.debug(
+            f"Reading all {model.__name__} objects to resolve {len(missing)} references"
+        )
+        for page in model.iter_pages(
+            token=self.token, companySlug=self.companySlug, pageSize=100
+        ):
+            self.add(page)
+        self._complete.add(model)
+        for id_value in missing:
+            cached.setdefault(id_value, None)
+
+
+def _values_at(obj: Any, parts: list[str]) -> Iterable[Any]:
+    """All non-None values at the attribute path, flattening lists along the way."""
+    if obj is None:
+        return
+    if isinstance(obj, (list, tuple)):
+        for item in obj:
+            yield from _values_at(item, parts)
+        return
+    if not parts:
+        yield obj
+        return
+    yield from _values_at(getattr(obj, parts[0], None), parts[1:])
+
+
+def _id_placeholder(model: type[FikenObject]) -> str:
+    """The name of the ID placeholder in the model's single-object path, e.g. productId."""
+    path = getattr(model, "_GET_PATH_SINGLE").default
+    return re.findall(r"{(\w+)}", path)[-1]
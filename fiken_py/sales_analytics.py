@@ -0,0 +1,268 @@
+import datetime
+import logging
+from typing import Any, Iterable, Literal, Optional, Sequence
+
+from pydantic import BaseModel, ConfigDict
+
+from fiken_py.fiken_object import OptionalAccessToken
+from fiken_py.models import CreditNote, Invoice, Product, ProductSalesReport, Sale
+from fiken_py.shared_types import ProductSalesLine
+from fiken_py.util import as_dicts, import_optional
+
+logger = logging.getLogger("fiken_py")
+
+type Period = tuple[datetime.date, datetime.date]
+
+# The ProductSalesLine fields, in the order of the last axis of ProductSalesSeries.sold/credited
+METRICS = ("count", "sales", "netAmount", "vatAmount", "grossAmount")
+
+
+class ProductSalesSeries(BaseModel):
+    """Product sales per product (rows) and period (columns), in the ProductSalesLine fields.
+    sold and credited are NumPy int64 arrays of shape (len(products), len(periods), len(METRICS))."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    products: list[Optional[int]]
+    periods: list[Period]
+    sold: Any
+    credited: Any
+    # Product of each productId, for the reports
+    catalog: dict[Optional[int], Any] = {}
+
+    def report(self, period: Period) -> list[ProductSalesReport]:
+        """The products sold or credited in one period, in the shape of
+        ProductSalesReport.get_report_for_timeframe. sum is sold less credited, except sales
+        (the number of documents), which is the documents of both."""
+        column = self.periods.index(period)
+        sold = self.sold[:, column].tolist()
+        credited = self.credited[:, column].tolist()
+        return [
+            ProductSalesReport(
+                product=self.catalog.get(product),
+                sold=_line(sold_values),
+                credited=_line(credited_values),
+                sum=_line(_sum(sold_values, credited_values)),
+            )
+            for product, sold_values, credited_values in zip(self.products, sold, credited)
+            if any(sold_values) or any(credited_values)
+        ]
+
+    def series(
+        self,
+        productId: Optional[int],
+        field: str = "netAmount",
+        kind: Literal["sold", "credited", "sum"] = "sum",
+    ) -> list[int]:
+        """One field of one product in the order of the periods, e.g. its net sales per day.
+        Zero for products without sales."""
+        if productId not in self.products:
+            return [0] * len(self.periods)
+        row = self.products.index(productId)
+        metric = METRICS.index(field)
+        sold = self.sold[row, :, metric]
+        credited = self.credited[row, :, metric]
+        if kind == "sold":
+            values = sold
+        elif kind == "credited":
+            values = credited
+        elif field == "sales":
+            values = sold + credited
+        else:
+            values = sold - credited
+        return values.tolist()
+
+
+class ProductSales:
+    """Product sales computed locally from invoice, credit note and sale lines read once, so that
+    daily or weekly series need no more requests than reading the documents:
+
+        sales = ProductSales.from_api()
+        days = [(day, day) for day in days_of_march]
+        sales.series(days).series(productId=12)          # Net sales per day
+        sales.series([(start, end)]).report((start, end))  # As get_report_for_timeframe
+
+    Requires NumPy (pip install fiken_py[analytics]).
+
+    Invoice lines are sold and credit note lines credited on the document's issue date, with the
+    NOK amounts (netInNok etc.) when present. A sale is represented by its invoice or credit note if
+    it has one; other sales (e.g. cash sales) are sold on their date, with a count of one per line.
+    Sale lines carry no product, so those are reported under productId None. count is the quantity,
+    and sales the number of documents with the product.
+    """
+
+    def __init__(
+        self,
+        invoices: Iterable[Invoice | dict] = (),
+        credit_notes: Iterable[CreditNote | dict] = (),
+        sales: Iterable[Sale | dict] = (),
+        products: Iterable[Product | dict] = (),
+    ):
+        np = import_optional("numpy", "analytics")
+
+        self.catalog: dict[Optional[int], Any] = {}
+        for product in products:
+            if not isinstance(product, Product):
+                product = Product.model_validate(product)
+            self.catalog[product.productId] = product
+
+        product_numbers: dict[Optional[int], int] = {}
+        documents: list[int] = []
+        dates: list[Any] = []
+        credited: list[bool] = []
+        line_products: list[int] = []
+        values: list[tuple[int, int, int, int]] = []
+        invoiced_sales: set[int] = set()
+
+        def add(document, date, is_credit, product_id, count, net, vat, gross):
+            documents.append(document)
+            dates.append(date)
+            credited.append(is_credit)
+            line_products.append(product_numbers.setdefault(product_id, len(product_numbers)))
+            values.append((count, net, vat, gross))
+
+        document = 0
+        for is_credit, batch in ((False, invoices), (True, credit_notes)):
+            for invoice in as_dicts(batch):
+                sale_id = (invoice.get("sale") or {}).get("saleId")
+                if sale_id is not None:
+                    invoiced_sales.add(sale_id)
+                date = invoice.get("issueDate")
+                if date is None:
+                    continue
+                for line in invoice.get("lines") or []:
+                    product_id = line.get("productId")
+                    if product_id is not None and product_id not in self.catalog:
+                        self.catalog[product_id] = Product.model_construct(
+                            productId=product_id, name=line.get("productName")
+                        )
+                    add(
+                        document,
+                        date,
+                        is_credit,
+                        product_id,
+                        line.get("quantity") or 0,
+                        _in_nok(line, "net"),
+                        _in_nok(line, "vat"),
+                        _in_nok(line, "gross"),
+                    )
+                document += 1
+
+        for sale in as_dicts(sales):
+            if sale.get("saleId") in invoiced_sales or sale.get("deleted"):
+                continue
+            if sale.get("date") is None:
+                continue
+            for line in sale.get("lines") or []:
+                net = line.get("netPrice") or 0
+                vat = line.get("vat") or 0
+                add(document, sale["date"], False, None, 1, net, vat, net + vat)
+            document += 1
+
+        self.products: list[Optional[int]] = list(product_numbers)
+        # The lines of one product on one document are summed into one sale of it
+        keys = np.array(documents, dtype=np.int64) * max(len(self.products), 1) + np.array(
+            line_products, dtype=np.int64
+        )
+        keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        line_values = np.array(values, dtype=np.int64).reshape(-1, 4)
+        summed = np.ones((len(keys), len(METRICS)), dtype=np.int64)
+        for metric, column in zip((0, 2, 3, 4), line_values.T):
+            sums = np.bincount(inverse, weights=column, minlength=len(keys))
+            summed[:, metric] = np.rint(sums).astype(np.int64)
+
+        sale_dates = np.array(dates, dtype="datetime64[D]")[first]
+        order = np.argsort(sale_dates, kind="stable")
+        self._dates = sale_dates[order]
+        self._products = np.array(line_products, dtype=np.intp)[first][order]
+        self._credited = np.array(credited, dtype=bool)[first][order]
+        self._values = summed[order]
+        logger.debug(
+            f"ProductSales with {len(self._values)} document lines of {len(self.products)} products"
+        )
+
+    @classmethod
+    def from_api(
+        cls,
+        token: OptionalAccessToken = None,
+        companySlug: Optional[str] = None,
+        max_workers: int = 1,
+    ) -> "ProductSales":
+        """Reads invoices, credit notes, sales and products (with getAllRaw, without building
+        document objects) and builds the product sales from them."""
+        options = {"token": token, "companySlug": companySlug, "max_workers": max_workers}
+        return cls(
+            invoices=Invoice.getAllRaw(**options),
+            credit_notes=CreditNote.getAllRaw(**options),
+            sales=Sale.getAllRaw(**options),
+            products=Product.getAllRaw(**options),
+        )
+
+    def __len__(self) -> int:
+        """The number of (document, product) sales."""
+        return len(self._values)
+
+    def series(self, periods: Sequence[Period]) -> ProductSalesSeries:
+        """The sales of every product in each period (first and last date included), in one pass
+        over the lines however many periods there are. Periods may overlap."""
+        np = import_optional("numpy", "analytics")
+        one_day = np.timedelta64(1, "D")
+        ends = np.array([end for _, end in periods], dtype="datetime64[D]")
+        before_starts = np.array([start for start, _ in periods], dtype="datetime64[D]") - one_day
+        bounds, columns = np.unique(np.concatenate([ends, before_starts]), return_inverse=True)
+        columns = columns.reshape(-1)
+
+        # Each line counts towards the first bound on or after its date, and so to all later ones
+        bins = np.searchsorted(bounds, self._dates, side="left")
+        width = len(bounds) + 1
+        count = len(periods)
+        tables = []
+        for credited in (False, True):
+            mask = self._credited == credited
+            cells = self._products[mask] * width + bins[mask]
+            table = np.empty((len(self.products), count, len(METRICS)), dtype=np.int64)
+            for metric in range(len(METRICS)):
+                sums = np.bincount(
+                    cells,
+                    weights=self._values[mask, metric],
+                    minlength=len(self.products) * width,
+                )
+                cumulative = np.cumsum(
+                    np.rint(sums).astype(np.int64).reshape(len(self.products), width)[:, :-1],
+                    axis=1,
+                )
+                table[:, :, metric] = (
+                    cumulative[:, columns[:count]] - cumulative[:, columns[count:]]
+                )
+            tables.append(table)
+
+        return ProductSalesSeries(
+            products=list(self.products),
+            periods=list(periods),
+            sold=tables[0],
+            credited=tables[1],
+            catalog=self.catalog,
+        )
+
+    def report(self, from_: datetime.date, to: datetime.date) -> list[ProductSalesReport]:
+        """Local equivalent of ProductSalesReport.get_report_for_timeframe."""
+        return self.series([(from_, to)]).report((from_, to))
+
+
+def _in_nok(line: dict, field: str) -> int:
+    value = line.get(f"{field}InNok")
+    if value is None:
+        value = line.get(field)
+    return value or 0
+
+
+def _line(values: Sequence[int]) -> ProductSalesLine:
+    return ProductSalesLine(**dict(zip(METRICS, values)))
+
+
+def _sum(sold: Sequence[int], credited: Sequence[int]) -> list[int]:
+    return [
+        s + c if field == "sales" else s - c
+        for field, s, c in zip(METRICS, sold, credited)
+    ]
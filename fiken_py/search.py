@@ -0,0 +1,262 @@
+import heapq
+import logging
+import re
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+from fiken_py.fiken_object import FikenObject, OptionalAccessToken
+from fiken_py.models import Contact, ContactPerson, Invoice, Product
+from fiken_py.sync import IncrementalSync, SyncDelta
+from fiken_py.util import fold
+
+logger = logging.getLogger("fiken_py")
+
+type DocumentKey = tuple[str, Any]
+
+_WORD_REGEX = re.compile(r"[0-9a-z]+")
+_PHONE_QUERY_REGEX = re.compile(r"^[0-9 +()-]+$")
+_COUNTRY_CODE_REGEX = re.compile(r"^\s*(\+|00)\s*47")
+# Words are indexed under their prefixes up to this length; longer query terms are checked per hit
+MAX_PREFIX = 12
+
+
+def _address_texts(address) -> list[Optional[str]]:
+    if address is None:
+        return []
+    return [
+        address.streetAddress,
+        address.streetAddressLine2,
+        address.postCode,
+        address.city,
+        address.country,
+    ]
+
+
+# The texts and phone numbers which make an object findable, by model
+_FIELDS: dict[type[FikenObject], Callable[[Any], tuple[list, list]]] = {
+    Contact: lambda c: (
+        [
+            c.name,
+            c.email,
+            c.organizationNumber,
+            c.customerNumber,
+            c.supplierNumber,
+            *_address_texts(c.address),
+        ],
+        [c.phoneNumber],
+    ),
+    ContactPerson: lambda p: ([p.name, p.email, *_address_texts(p.address)], [p.phoneNumber]),
+    Product: lambda p: ([p.name, p.productNumber], []),
+    Invoice: lambda i: (
+        [
+            i.invoiceNumber,
+            i.kid,
+            i.invoiceText,
+            i.yourReference,
+            i.ourReference,
+            i.orderReference,
+            i.customer.name if i.customer is not None else None,
+        ],
+        [],
+    ),
+}
+
+
+class SearchIndex:
+    """In-memory full-text index of contacts, contact persons, products and invoices, for searching
+    as the user types without an API request per keystroke:
+
+        index = SearchIndex.from_api()
+        index.search("hans regn")                   # Contacts, persons, products and invoices
+        index.search("912 34", models=[Contact])    # Phone numbers, without spaces or +47
+        index.refresh(sync)                          # Applies what an IncrementalSync fetched
+
+    Every word of the query must start a word of the object (name, email, address, reference, ...),
+    case and accents ignored. Objects matching words exactly rank first. Each word is indexed under
+    its prefixes, so a query costs a few dict lookups and set intersections however many objects are
+    indexed. A contact's contact persons are indexed as ContactPerson objects of their own.
+    """
+
+    # The models read from the API; contact persons come with their contacts
+    MODELS: tuple[type[FikenObject], ...] = (Contact, Product, Invoice)
+
+    def __init__(self, objects: Iterable[FikenObject] = ()):
+        self._lock = threading.Lock()
+        # Objects are numbered in the order they were first indexed, which is also their rank
+        # among equally good matches; the postings are sets of these numbers
+        self._numbers: dict[DocumentKey, int] = {}
+        self._objects: dict[int, FikenObject] = {}
+        self._words: dict[int, frozenset[str]] = {}
+        self._prefixes: dict[str, set[int]] = {}
+        self._exact: dict[str, set[int]] = {}
+        self._by_model: dict[str, set[int]] = {}
+        # Contact persons indexed with each contact, removed with it
+        self._persons: dict[Any, list[DocumentKey]] = {}
+        self.add(objects)
+
+    @classmethod
+    def from_api(
+        cls,
+        token: OptionalAccessToken = None,
+        companySlug: Optional[str] = None,
+        models: Optional[Iterable[type[FikenObject]]] = None,
+    ) -> "SearchIndex":
+        """Indexes all objects of the models (by default MODELS), read with getAll."""
+        index = cls()
+        for model in models if models is not None else cls.MODELS:
+            index.add(model.getAll(token=token, companySlug=companySlug))
+        return index
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def add(self, objects: Iterable[FikenObject]):
+        """Adds objects, or replaces the indexed objects with the same ID."""
+        with self._lock:
+            for obj in objects:
+                self._add(obj)
+
+    def remove(self, model: type[FikenObject], object_id: Any):
+        """Removes an object (e.g. a deleted contact) from the index, if it is there."""
+        with self._lock:
+            self._remove((model.__name__, object_id))
+
+    def apply(self, delta: SyncDelta):
+        """Updates the index with the objects created or changed in an incremental sync."""
+        self.add(delta.changed)
+
+    def refresh(
+        self,
+        sync: IncrementalSync,
+        companySlug: Optional[str] = None,
+        token: OptionalAccessToken = None,
+    ) -> list[SyncDelta]:
+        """Syncs contacts, products and invoices with the IncrementalSync and applies the changes."""
+        deltas = sync.sync_all(self.MODELS, companySlug=companySlug, token=token)
+        for delta in deltas:
+            self.apply(delta)
+        return deltas
+
+    def search(
+        self,
+        query: str,
+        models: Optional[Iterable[type[FikenObject]]] = None,
+        limit: int = 20,
+    ) -> list[FikenObject]:
+        """The objects matching every word of the query, best matches first: those matching all words
+        exactly, then those matching some exactly, then the rest, each in the order they were indexed.
+        :param models: only return objects of these models
+        """
+        terms = _query_terms(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            postings = []
+            for term in terms:
+                documents = self._prefixes.get(term[:MAX_PREFIX])
+                if not documents:
+                    return []
+                postings.append(documents)
+            if models is not None:
+                postings.append(
+                    set().union(*(self._by_model.get(model.__name__, ()) for model in models))
+                )
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+
+            long_terms = [term for term in terms if len(term) > MAX_PREFIX]
+            if long_terms:
+                candidates = {
+                    number
+                    for number in candidates
+                    if all(
+                        any(word.startswith(term) for word in self._words[number])
+                        for term in long_terms
+                    )
+                }
+
+            exact = [self._exact.get(term, set()) for term in terms]
+            all_exact = candidates.intersection(*exact)
+            some_exact = candidates.intersection(set().union(*exact)) - all_exact
+            rest = candidates - all_exact - some_exact
+
+            numbers: list[int] = []
+            for tier in (all_exact, some_exact, rest):
+                if len(numbers) >= limit:
+                    break
+                numbers.extend(heapq.nsmallest(limit - len(numbers), tier))
+            return [self._objects[number] for number in numbers]
+
+    def _add(self, obj: FikenObject):
+        model = type(obj)
+        if model not in _FIELDS:
+            raise ValueError(f"{model.__name__} can not be indexed for search")
+        key = (model.__name__, obj.id_attr[1])
+        self._remove(key)
+        number = self._numbers.setdefault(key, len(self._numbers))
+
+        texts, phones = _FIELDS[model](obj)
+        words = set()
+        for text in texts:
+            if text is not None:
+                words.update(_WORD_REGEX.findall(fold(str(text))))
+        for phone in phones:
+            words.update(_phone_words(phone))
+
+        self._objects[number] = obj
+        self._words[number] = frozenset(words)
+        self._by_model.setdefault(key[0], set()).add(number)
+        for word in words:
+            self._exact.setdefault(word, set()).add(number)
+        for prefix in _prefixes(words):
+            self._prefixes.setdefault(prefix, set()).add(number)
+
+        if model is Contact and obj.contactPerson:
+            for person in obj.contactPerson:
+                self._add(person)
+            self._persons[key[1]] = [
+                ("ContactPerson", person.contactPersonId) for person in obj.contactPerson
+            ]
+
+    def _remove(self, key: DocumentKey):
+        number = self._numbers.get(key)
+        if number not in self._objects:
+            return
+        del self._objects[number]
+        self._by_model[key[0]].discard(number)
+        words = self._words.pop(number)
+        for postings, tokens in ((self._exact, words), (self._prefixes, _prefixes(words))):
+            for token in tokens:
+                documents = postings[token]
+                documents.discard(number)
+                if not documents:
+                    del postings[token]
+        if key[0] == "Contact":
+            for person in self._persons.pop(key[1], ()):
+                self._remove(person)
+
+
+def _prefixes(words: Iterable[str]) -> set[str]:
+    return {word[:end] for word in words for end in range(1, min(len(word), MAX_PREFIX) + 1)}
+
+
+def _phone_words(phone: Optional[str]) -> set[str]:
+    """A phone number's digits, with and without the Norwegian country code."""
+    if not phone:
+        return set()
+    digits = "".join(c for c in phone if c.isdigit())
+    words = {digits} if digits else set()
+    if digits.startswith("0047"):
+        words.add(digits[4:])
+    elif digits.startswith("47") and len(digits) == 10:
+        words.add(digits[2:])
+    return words
+
+
+def _query_terms(query: str) -> list[str]:
+    if _PHONE_QUERY_REGEX.match(query.strip()) and any(c.isdigit() for c in query):
+        # "912 34 567" and "+47 912" are searched as one number, without the country code
+        digits = "".join(c for c in _COUNTRY_CODE_REGEX.sub("", query) if c.isdigit())
+        return [digits or "".join(c for c in query if c.isdigit())]
+    return _WORD_REGEX.findall(fold(query))
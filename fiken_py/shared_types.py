@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import os
 from datetime import date
-from typing import Optional, Annotated, ClassVar
+from typing import Optional, Annotated, ClassVar, Iterator, IO, TYPE_CHECKING
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -13,6 +14,9 @@ from fiken_py.shared_enums import (
 )
 from fiken_py.vat_validation import VATValidator
 
+if TYPE_CHECKING:
+    from fiken_py.downloads import AttachmentCache
+
 AccountingAccount = Annotated[
     str, Field(pattern=r"^[1-8]\d{3}(:\d{5})?$")
 ]  # All kontoklasser
@@ -49,6 +53,25 @@ class Attachment(BaseModel):
     comment: Optional[str] = None
     type: Optional[AttachmentType] = None
 
+    def iter_content(self, token=None, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+        """Streams the attachment content in chunks, using the authenticated transport."""
+        from fiken_py.downloads import iter_attachment_content
+
+        return iter_attachment_content(self, token=token, chunk_size=chunk_size)
+
+    def download_to(
+        self,
+        path_or_file: str | os.PathLike | IO[bytes],
+        token=None,
+        cache: Optional["AttachmentCache"] = None,
+    ) -> int:
+        """Streams the attachment to a path or binary file object.
+        If a cache is given, content already downloaded is served from disk instead.
+        :return: number of bytes written"""
+        from fiken_py.downloads import download_attachment
+
+        return download_attachment(self, path_or_file, token=token, cache=cache)
+
 
 class ProductSalesLine(BaseModel):
     count: Optional[int] = None
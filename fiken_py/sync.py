@@ -0,0 +1,264 @@
+import abc
+import datetime
+import json
+import logging
+import os
+from typing import Any, Iterable, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from fiken_py.fiken_object import FikenObject, OptionalAccessToken, RequestMethod
+
+logger = logging.getLogger("fiken_py")
+
+type ModelType = type[FikenObject]
+
+
+class SyncDelta(BaseModel):
+    """Result of syncing one model for one company."""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    model: str
+    companySlug: str
+    since: Optional[datetime.date] = None
+    highWaterMark: Optional[datetime.date] = None
+    created: list[Any] = []
+    updated: list[Any] = []
+    unchanged: int = 0
+
+    @property
+    def changed(self) -> list[Any]:
+        return self.created + self.updated
+
+    @property
+    def fetched(self) -> int:
+        return len(self.created) + len(self.updated) + self.unchanged
+
+
+class SyncStore(abc.ABC):
+    """Local store which incremental syncs merge fetched objects into.
+    Objects are kept per (company, model), keyed by their ID (see FikenObject.id_attr).
+    """
+
+    @abc.abstractmethod
+    def get_object(
+        self, model: ModelType, company_slug: str, object_id: Any
+    ) -> Optional[FikenObject]:
+        """Returns the stored object with the given ID, or None if not stored."""
+
+    @abc.abstractmethod
+    def put_objects(
+        self, model: ModelType, company_slug: str, objects: list[FikenObject]
+    ) -> None:
+        """Inserts or replaces the given objects."""
+
+    @abc.abstractmethod
+    def get_high_water_mark(
+        self, model: ModelType, company_slug: str
+    ) -> Optional[datetime.date]:
+        """Returns the latest lastModifiedDate seen for the model, or None if never synced."""
+
+    @abc.abstractmethod
+    def set_high_water_mark(
+        self, model: ModelType, company_slug: str, mark: datetime.date
+    ) -> None:
+        pass
+
+    def flush(self) -> None:
+        """Persists pending changes. Called after every synced model."""
+        pass
+
+
+class MemoryStore(SyncStore):
+    """SyncStore keeping everything in memory."""
+
+    def __init__(self):
+        self._objects: dict[tuple[str, str], dict[Any, FikenObject]] = {}
+        self._marks: dict[tuple[str, str], datetime.date] = {}
+
+    def objects(self, model: ModelType, company_slug: str) -> list[FikenObject]:
+        """Returns all stored objects for the model."""
+        return list(self._objects.get((company_slug, model.__name__), {}).values())
+
+    def get_object(self, model, company_slug, object_id):
+        return self._objects.get((company_slug, model.__name__), {}).get(object_id)
+
+    def put_objects(self, model, company_slug, objects):
+        stored = self._objects.setdefault((company_slug, model.__name__), {})
+        for obj in objects:
+            stored[obj.id_attr[1]] = obj
+
+    def get_high_water_mark(self, model, company_slug):
+        return self._marks.get((company_slug, model.__name__))
+
+    def set_high_water_mark(self, model, company_slug, mark):
+        self._marks[(company_slug, model.__name__)] = mark
+
+
+class FileStore(MemoryStore):
+    """MemoryStore persisted as one JSON file per (company, model) in a directory.
+    Models are loaded lazily the first time they are accessed.
+    """
+
+    def __init__(self, directory: str):
+        super().__init__()
+        self.directory = directory
+        self._loaded: set[tuple[str, str]] = set()
+        self._dirty: dict[tuple[str, str], ModelType] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, model: ModelType, company_slug: str) -> str:
+        return os.path.join(self.directory, f"{company_slug}.{model.__name__}.json")
+
+    def _ensure_loaded(self, model: ModelType, company_slug: str):
+        key = (company_slug, model.__name__)
+        if key in self._loaded:
+            return
+        self._loaded.add(key)
+
+        path = self._path(model, company_slug)
+        if not os.path.exists(path):
+            return
+
+        with open(path, "r") as f:
+            data = json.load(f)
+
+        if data.get("highWaterMark") is not None:
+            self._marks[key] = datetime.date.fromisoformat(data["highWaterMark"])
+        super().put_objects(
+            model, company_slug, [model(**item) for item in data["objects"]]
+        )
+
+    def objects(self, model, company_slug):
+        self._ensure_loaded(model, company_slug)
+        return super().objects(model, company_slug)
+
+    def get_object(self, model, company_slug, object_id):
+        self._ensure_loaded(model, company_slug)
+        return super().get_object(model, company_slug, object_id)
+
+    def put_objects(self, model, company_slug, objects):
+        self._ensure_loaded(model, company_slug)
+        super().put_objects(model, company_slug, objects)
+        self._dirty[(company_slug, model.__name__)] = model
+
+    def get_high_water_mark(self, model, company_slug):
+        self._ensure_loaded(model, company_slug)
+        return super().get_high_water_mark(model, company_slug)
+
+    def set_high_water_mark(self, model, company_slug, mark):
+        self._ensure_loaded(model, company_slug)
+        super().set_high_water_mark(model, company_slug, mark)
+        self._dirty[(company_slug, model.__name__)] = model
+
+    def flush(self):
+        for (company_slug, _), model in self._dirty.items():
+            mark = self._marks.get((company_slug, model.__name__))
+            data = {
+                "highWaterMark": mark.isoformat() if mark is not None else None,
+                "objects": [
+                    obj.model_dump(mode="json")
+                    for obj in super().objects(model, company_slug)
+                ],
+            }
+            path = self._path(model, company_slug)
+            with open(path + ".tmp", "w") as f:
+                json.dump(data, f)
+            os.replace(path + ".tmp", path)
+        self._dirty.clear()
+
+
+class IncrementalSync:
+    """Fetches only objects changed since the last sync, and merges them into a SyncStore.
+
+    A high-water mark (the latest lastModifiedDate seen) is tracked per (company, model).
+    The next sync asks the API for objects with lastModifiedDate on or after that date.
+    As the API only has day resolution, objects changed on the mark date are fetched again;
+    those are compared with the stored copy and reported as unchanged.
+    """
+
+    LAST_MODIFIED_FILTER: str = "lastModifiedGe"
+
+    def __init__(self, store: Optional[SyncStore] = None):
+        self.store = store if store is not None else MemoryStore()
+
+    @staticmethod
+    def is_syncable(model: ModelType) -> bool:
+        return (
+            "lastModifiedDate" in getattr(model, "model_fields", {})
+            and model._get_method_base_URL(RequestMethod.GET_MULTIPLE) is not None
+        )
+
+    def sync(
+        self,
+        model: ModelType,
+        companySlug: Optional[str] = None,
+        token: OptionalAccessToken = None,
+        full: bool = False,
+        **kwargs,
+    ) -> SyncDelta:
+        """Syncs one model.
+        :param full: ignore the high-water mark and fetch everything. Models without lastModifiedDate
+            (see is_syncable) can only be synced this way.
+        :param kwargs: passed on to getAll (extra filters or placeholders)
+        """
+        if model._get_method_base_URL(RequestMethod.GET_MULTIPLE) is None:
+            raise ValueError(f"{model.__name__} can not be synced (no list endpoint)")
+        if not full and not self.is_syncable(model):
+            raise ValueError(
+                f"{model.__name__} can not be synced incrementally (no lastModifiedDate), use full=True"
+            )
+
+        if companySlug is None:
+            companySlug = FikenObject._COMPANY_SLUG
+        if companySlug is None:
+            raise ValueError("companySlug must be provided")
+
+        since = None if full else self.store.get_high_water_mark(model, companySlug)
+        if since is not None:
+            kwargs[self.LAST_MODIFIED_FILTER] = since.isoformat()
+
+        logger.debug(f"Syncing {model.__name__} for {companySlug} since {since}")
+        fetched = model.getAll(token=token, companySlug=companySlug, **kwargs)
+
+        delta = SyncDelta(model=model.__name__, companySlug=companySlug, since=since)
+        mark = since
+        for obj in fetched:
+            existing = self.store.get_object(model, companySlug, obj.id_attr[1])
+            if existing is None:
+                delta.created.append(obj)
+            elif existing != obj:
+                delta.updated.append(obj)
+            else:
+                delta.unchanged += 1
+
+            modified = getattr(obj, "lastModifiedDate", None)
+            if modified is not None and (mark is None or modified > mark):
+                mark = modified
+
+        if delta.changed:
+            self.store.put_objects(model, companySlug, delta.changed)
+        if mark is not None:
+            self.store.set_high_water_mark(model, companySlug, mark)
+        self.store.flush()
+
+        delta.highWaterMark = mark
+        logger.info(
+            f"Synced {model.__name__} for {companySlug}: {len(delta.created)} created, "
+            f"{len(delta.updated)} updated, {delta.unchanged} unchanged"
+        )
+        return delta
+
+    def sync_all(
+        self,
+        models: Iterable[ModelType],
+        companySlug: Optional[str] = None,
+        token: OptionalAccessToken = None,
+        **kwargs,
+    ) -> list[SyncDelta]:
+        """Syncs several models, in order."""
+        return [
+            self.sync(model, companySlug=companySlug, token=token, **kwargs)
+            for model in models
+        ]
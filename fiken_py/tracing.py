@@ -0,0 +1,189 @@
+import contextlib
+import contextvars
+import functools
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from fiken_py.util import import_optional
+
+type Attributes = dict[str, Any]
+
+
+class Span:
+    """A span that records nothing. The methods follow opentelemetry.trace.Span."""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+
+class Tracer:
+    """The default tracer, which does not trace.
+
+    Subclasses implement start_span, a context manager yielding a Span which is the
+    parent of the spans started inside it."""
+
+    enabled: bool = False
+
+    @contextlib.contextmanager
+    def start_span(
+        self, name: str, attributes: Optional[Attributes] = None
+    ) -> Iterator[Span]:
+        yield _NO_OP_SPAN
+
+
+_NO_OP_SPAN = Span()
+
+
+class RecordedSpan(Span):
+    def __init__(
+        self,
+        name: str,
+        attributes: Optional[Attributes],
+        parent: Optional["RecordedSpan"],
+    ):
+        self.name = name
+        self.attributes: Attributes = dict(attributes or {})
+        self.parent = parent
+        self.children: list[RecordedSpan] = []
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.error: Optional[BaseException] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.error = exception
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def walk(self) -> Iterator[tuple[int, "RecordedSpan"]]:
+        """Yields (depth, span) for this span and all its descendants, depth first."""
+        yield 0, self
+        for child in self.children:
+            for depth, span in child.walk():
+                yield depth + 1, span
+
+    def __repr__(self):
+        return f"RecordedSpan({self.name!r}, {len(self.children)} children)"
+
+
+class RecordingTracer(Tracer):
+    """Keeps all spans in memory, for tests and for finding redundant requests.
+    Spans started in other threads (e.g. by bulk workers) become roots of their own."""
+
+    enabled = True
+
+    def __init__(self):
+        self.roots: list[RecordedSpan] = []
+        self._current: contextvars.ContextVar[Optional[RecordedSpan]] = (
+            contextvars.ContextVar("fiken_py_current_span", default=None)
+        )
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def start_span(
+        self, name: str, attributes: Optional[Attributes] = None
+    ) -> Iterator[RecordedSpan]:
+        parent = self._current.get()
+        span = RecordedSpan(name, attributes, parent)
+        with self._lock:
+            if parent is None:
+                self.roots.append(span)
+            else:
+                parent.children.append(span)
+
+        reset_token = self._current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            span.end = time.perf_counter()
+            self._current.reset(reset_token)
+
+    def spans(self) -> list[RecordedSpan]:
+        return [span for root in self.roots for _, span in root.walk()]
+
+    def clear(self):
+        with self._lock:
+            self.roots.clear()
+
+    def waterfall(self) -> str:
+        """The recorded spans as indented lines with start offset and duration in ms."""
+        lines = []
+        for root in self.roots:
+            for depth, span in root.walk():
+                offset = (span.start - root.start) * 1000
+                line = f"{offset:8.1f} ms {span.duration * 1000:8.1f} ms  {'  ' * depth}{span.name}"
+                template = span.attributes.get("url.template")
+                if template is not None:
+                    line += f" {template}"
+                status = span.attributes.get("http.response.status_code")
+                if status is not None:
+                    line += f" -> {status}"
+                if span.error is not None:
+                    line += f" !! {span.error.__class__.__name__}"
+                lines.append(line)
+        return "\n".join(lines)
+
+
+class OpenTelemetryTracer(Tracer):
+    """Sends spans to OpenTelemetry. Requires opentelemetry-api (pip install fiken_py[tracing]).
+    :param tracer: an opentelemetry.trace.Tracer, defaults to trace.get_tracer("fiken_py")"""
+
+    enabled = True
+
+    def __init__(self, tracer=None):
+        if tracer is None:
+            trace = import_optional("opentelemetry.trace", "tracing")
+            tracer = trace.get_tracer("fiken_py")
+        self._tracer = tracer
+
+    @contextlib.contextmanager
+    def start_span(
+        self, name: str, attributes: Optional[Attributes] = None
+    ) -> Iterator[Span]:
+        # start_as_current_span records exceptions and sets the error status itself
+        with self._tracer.start_as_current_span(name, attributes=attributes) as span:
+            yield span
+
+
+_tracer: Tracer = Tracer()
+
+
+def set_tracer(tracer: Optional[Tracer]) -> None:
+    """Sets the tracer used for all spans, None turns tracing off."""
+    global _tracer
+    _tracer = tracer if tracer is not None else Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def traced(func: Callable) -> Callable:
+    """Runs the method in a span named after the class and method, e.g. "Contact.save".
+    Use below @classmethod."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        tracer = _tracer
+        if not tracer.enabled:
+            return func(*args, **kwargs)
+
+        owner = args[0] if args else None
+        model = owner.__name__ if isinstance(owner, type) else type(owner).__name__
+        with tracer.start_span(
+            f"{model}.{func.__name__}", {"fiken.model": model}
+        ):
+            return func(*args, **kwargs)
+
+    return wrapper
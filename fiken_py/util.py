@@ -1,6 +1,11 @@
+import importlib
 import logging
+import unicodedata
+from types import ModuleType
+from typing import Any, Iterable, Iterator
 from urllib import response
 
+from pydantic import BaseModel
 from requests import HTTPError
 
 from fiken_py.errors import (
@@ -10,6 +15,7 @@ from fiken_py.errors import (
     RequestContentNotFoundException,
     RequestUnsupportedMethodException,
     RequestWrongMediaTypeException,
+    RequestTooManyRequestsException,
     RequestErrorException,
 )
 
@@ -50,5 +56,33 @@ def handle_error(e: HTTPError):
         raise RequestUnsupportedMethodException(e, err, err_description)
     elif e.response.status_code == 415:
         raise RequestWrongMediaTypeException(e, err, err_description)
+    elif e.response.status_code == 429:
+        raise RequestTooManyRequestsException(e, err, err_description)
     else:
         raise RequestErrorException(e, err, err_description)
+
+
+def import_optional(module: str, extra: str) -> ModuleType:
+    """Imports an optional dependency, with a helpful error if it is not installed."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{module} is required for this feature. Install it with 'pip install fiken_py[{extra}]'"
+        ) from e
+
+
+def as_dicts(documents: Iterable[Any]) -> Iterator[dict]:
+    """Yields documents given as models or as decoded JSON as decoded JSON."""
+    for document in documents:
+        if isinstance(document, BaseModel):
+            document = document.model_dump(mode="json")
+        yield document
+
+
+def fold(text: str) -> str:
+    """The text in lower case and ASCII, for comparing without case and accents ("Bjørn" -> "bjorn")."""
+    if text.isascii():
+        return text.casefold()
+    text = text.casefold().replace("æ", "ae").replace("ø", "o").replace("å", "aa")
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
@@ -1,15 +1,52 @@
+import itertools
 import logging
 import re
 
+from pydantic import BaseModel, ConfigDict
+
 from fiken_py.shared_enums import VatTypeProductSale
+from fiken_py.util import import_optional
 
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, ClassVar, Iterator, Optional, Sequence
 
 if TYPE_CHECKING:
     from fiken_py.shared_types import AccountingAccountIncome
 
 logger = logging.getLogger("fiken_py")
 
+# Length of the account patterns which are looked up in the account index
+_INDEXED_LENGTH = 4
+
+
+class VATBulkValidation(BaseModel):
+    """Result of VATValidator.validate_sale_lines: one entry per line.
+    valid is a boolean NumPy array, and reasons holds an index into REASONS for every line (0 if valid).
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    REASONS: ClassVar[tuple[str, ...]] = (
+        "",
+        "Unknown VAT type",
+        "Account code is not a valid account",
+        "Account is not valid for the VAT type",
+        "Percentage does not match the VAT type",
+    )
+
+    valid: Any
+    reasons: Any
+
+    @property
+    def invalid_lines(self):
+        """Indices of the invalid lines."""
+        return (~self.valid).nonzero()[0]
+
+    def messages(self) -> dict[int, str]:
+        """Reason for every invalid line, by line index."""
+        return {
+            int(line): self.REASONS[self.reasons[line]] for line in self.invalid_lines
+        }
+
 
 class VATValidator:
     vat_types_product_sale: dict[VatTypeProductSale, tuple[float, list[str]]] = {
@@ -51,6 +88,54 @@ class VATValidator:
         ),
     }
 
+    # Per VAT type, one byte per 4-digit account prefix: 1 if valid. Built once, by _build_account_index
+    _account_index: ClassVar[dict[VatTypeProductSale, bytes]] = {}
+    # Per VAT type with patterns of other lengths: its patterns, checked with _account_match
+    _account_patterns: ClassVar[dict[VatTypeProductSale, list[str]]] = {}
+
+    # NumPy version of the index for bulk validation, see _account_table
+    _numpy_account_table: ClassVar[Any] = None
+
+    @classmethod
+    def _build_account_index(cls):
+        """Expands the account patterns of every VAT type into lookup tables over the 4-digit account prefixes."""
+        cls._account_index = {}
+        cls._account_patterns = {}
+        for vat_type, (_, match_codes) in cls.vat_types_product_sale.items():
+            if any(
+                len(match_code.replace("-", "")) != _INDEXED_LENGTH
+                for match_code in match_codes
+            ):
+                cls._account_patterns[vat_type] = match_codes
+                continue
+
+            index = bytearray(10**_INDEXED_LENGTH)
+            for match_code in sorted(match_codes, key=lambda code: code.startswith("-")):
+                value = 0 if match_code.startswith("-") else 1
+                for account in _expand(match_code.replace("-", "")):
+                    index[account] = value
+            cls._account_index[vat_type] = bytes(index)
+
+    @classmethod
+    def _account_valid(cls, vat_type: VatTypeProductSale, account_code: str) -> bool:
+        index = cls._account_index.get(vat_type)
+        if index is None:
+            correct_match = False
+            forbidden_match = False
+            for match_code in cls._account_patterns[vat_type]:
+                if cls._account_match(account_code, match_code):
+                    if match_code.startswith("-"):
+                        forbidden_match = True
+                    else:
+                        correct_match = True
+            return correct_match and not forbidden_match
+
+        # The patterns match from the start, so only the first 4 digits matter
+        prefix = account_code[:_INDEXED_LENGTH]
+        if len(prefix) != _INDEXED_LENGTH or not prefix.isdecimal():
+            return False
+        return index[int(prefix)] == 1
+
     @classmethod
     def _account_match(cls, account_code: str, match_code: str) -> bool:
         """Checks whenever account_code (for example 31) matches the given match_code (for example 31xx)."""
@@ -101,17 +186,141 @@ class VATValidator:
 
         # acc code not none
         # For correct match - one of strings must match, and none of the forbidden strings must match
+        return cls._account_valid(vat_type, account_code)
+
+    @classmethod
+    def validate_sale_lines(
+        cls,
+        vat_types: Sequence[str | VatTypeProductSale],
+        account_codes: Optional[Sequence[Optional[str]]] = None,
+        percentages: Optional[Sequence[Optional[float]]] = None,
+    ) -> VATBulkValidation:
+        """Validates many lines at once, like validate_vat_type_sale does one line.
+        Requires NumPy (pip install fiken_py[analytics]).
+
+        Takes columns of equal length: VAT types, and account codes and/or percentages.
+        Missing values (None, and "" for accounts) are not checked. Lines with both are checked against both.
+        VAT types without rules are approved, like in validate_vat_type_sale.
+        """
+        np = import_optional("numpy", "analytics")
+
+        # Columns usually repeat a few distinct values, so the rules are evaluated once per value
+        type_index, distinct_types = _factorize(np, vat_types)
+        line_count = len(type_index)
+        valid = np.ones(line_count, dtype=bool)
+        reasons = np.zeros(line_count, dtype=np.uint8)
+
+        def fail(mask, reason: int):
+            mask = mask & valid
+            reasons[mask] = reason
+            valid[mask] = False
+
+        known = {vat_type.value: vat_type for vat_type in VatTypeProductSale}
+        types = [known.get(str(getattr(v, "value", v)).upper()) for v in distinct_types]
+        fail(np.array([t is None for t in types], dtype=bool)[type_index], 1)
+        rules = [cls.vat_types_product_sale.get(t) for t in types]
+
+        if percentages is not None:
+            # None becomes NaN
+            values = np.array(percentages, dtype=float)
+            rates = np.array([np.nan if r is None else r[0] for r in rules])[type_index]
+            checked = ~np.isnan(values) & ~np.isnan(rates)
+            fail(checked & (values != rates), 4)
+
+        if account_codes is not None:
+            account_index, distinct_accounts = _factorize(np, account_codes)
+            # The first 4 digits of each account, -1 if it is not an account, -2 if it is missing
+            numbers = np.empty(len(distinct_accounts), dtype=np.intp)
+            long_accounts = np.zeros(len(distinct_accounts), dtype=bool)
+            for i, account in enumerate(distinct_accounts):
+                code = "" if account is None else str(account)
+                prefix = code[:_INDEXED_LENGTH]
+                if code == "":
+                    numbers[i] = -2
+                elif len(prefix) == _INDEXED_LENGTH and prefix.isdecimal():
+                    numbers[i] = int(prefix)
+                    long_accounts[i] = len(code) > _INDEXED_LENGTH
+                else:
+                    numbers[i] = -1
+
+            line_numbers = numbers[account_index]
+            fail(line_numbers == -1, 2)
+
+            table = cls._account_table()
+            rows = np.array(
+                [
+                    len(table) - 1 if r is None else _TYPE_ROWS[t]
+                    for t, r in zip(types, rules)
+                ],
+                dtype=np.intp,
+            )
+            checked = line_numbers >= 0
+            fail(checked & ~table[rows[type_index], np.maximum(line_numbers, 0)], 3)
+
+            # The table is exact for 4-digit accounts. Types with irregular patterns are
+            # checked again for longer accounts, once per distinct pair of type and account
+            irregular = np.array([t in cls._account_patterns for t in types], dtype=bool)
+            lines = np.flatnonzero(
+                irregular[type_index] & long_accounts[account_index] & valid
+            )
+            if len(lines):
+                pairs = list(zip(type_index[lines].tolist(), account_index[lines].tolist()))
+                results = {
+                    pair: cls._account_valid(types[pair[0]], str(distinct_accounts[pair[1]]))
+                    for pair in set(pairs)
+                }
+                invalid = np.zeros(line_count, dtype=bool)
+                invalid[lines] = [not results[pair] for pair in pairs]
+                fail(invalid, 3)
+
+        return VATBulkValidation(valid=valid, reasons=reasons)
+
+    @classmethod
+    def _account_table(cls):
+        """Boolean NumPy table with one row per VatTypeProductSale and one column per 4-digit account,
+        plus a last row of all True for VAT types without rules. Built on first use."""
+        if cls._numpy_account_table is None:
+            np = import_optional("numpy", "analytics")
+            table = np.ones((len(_TYPE_ROWS) + 1, 10**_INDEXED_LENGTH), dtype=bool)
+            for vat_type, row in _TYPE_ROWS.items():
+                if vat_type not in cls.vat_types_product_sale:
+                    continue
+                index = cls._account_index.get(vat_type)
+                if index is not None:
+                    table[row] = np.frombuffer(index, dtype=np.uint8).astype(bool)
+                else:
+                    table[row] = [
+                        cls._account_valid(vat_type, f"{account:04d}")
+                        for account in range(10**_INDEXED_LENGTH)
+                    ]
+            cls._numpy_account_table = table
+        return cls._numpy_account_table
+
+
+_TYPE_ROWS = {vat_type: row for row, vat_type in enumerate(VatTypeProductSale)}
+
+
+class _Numbering(dict):
+    """Numbers keys in the order they are first looked up."""
+
+    def __missing__(self, key):
+        number = self[key] = len(self)
+        return number
+
+
+def _factorize(np, values: Sequence) -> tuple[Any, list]:
+    """The number of each value as an array, and the distinct values in order of first appearance."""
+    numbering = _Numbering()
+    index = np.fromiter(map(numbering.__getitem__, values), dtype=np.intp, count=len(values))
+    return index, list(numbering)
+
+
+def _expand(match_code: str) -> Iterator[int]:
+    """All accounts (as ints) matching a pattern like '31x9'."""
+    digits = [range(10) if char == "x" else (int(char),) for char in match_code]
+    return (
+        int("".join(map(str, account))) for account in itertools.product(*digits)
+    )
+
 
-        correct_match = False
-        forbidden_match = False
-        for match_code in cls.vat_types_product_sale[vat_type][1]:
-            if match_code.startswith("-"):
-                forbidden_match = forbidden_match or cls._account_match(
-                    account_code, match_code
-                )
-            else:
-                correct_match = correct_match or cls._account_match(
-                    account_code, match_code
-                )
-
-        return correct_match and not forbidden_match
+VATValidator._build_account_index()
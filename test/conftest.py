@@ -1,8 +1,29 @@
 import pytest
 
+from fiken_py.fake_server import FakeFikenServer
 from fiken_py.fiken_object import FikenObject
 
 
 @pytest.fixture(autouse=True, scope="session")
 def disable_rate_limit():
     FikenObject.set_rate_limit(False)
+
+
+@pytest.fixture
+def server_options() -> dict:
+    """Arguments for the FakeFikenServer of the server fixture, override to e.g. add latency."""
+    return {}
+
+
+@pytest.fixture
+def server(server_options: dict):
+    """A FakeFikenServer, with the token and company slug set for all objects."""
+    FikenObject.clear_auth_token()
+    FikenObject.set_auth_token("SAMPLE_TOKEN")
+    try:
+        with FakeFikenServer(**server_options) as server:
+            FikenObject.set_company_slug(server.company_slug)
+            yield server
+    finally:
+        FikenObject.clear_auth_token()
+        FikenObject.clear_company_slug()
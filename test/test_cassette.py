@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from fiken_py.cassette import Cassette
+from fiken_py.errors import RequestNotRecordedException
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.fiken_object import FikenObject
+from fiken_py.models import Contact, Invoice
+
+
+@pytest.fixture(autouse=True)
+def auth():
+    FikenObject.clear_auth_token()
+    FikenObject.set_auth_token("SECRET_TOKEN")
+    yield
+    FikenObject.clear_auth_token()
+    FikenObject.clear_company_slug()
+
+
+def test_record_and_replay(tmp_path):
+    path = tmp_path / "cassette.ndjson"
+    original_base = FikenObject.PATH_BASE
+    with FakeFikenServer() as server:
+        FikenObject.set_company_slug(server.company_slug)
+        server.add(Contact, [{"name": f"Contact {i}"} for i in range(30)])
+        invoice = Invoice(**server.add(Invoice, [{"issueDate": "2024-01-01"}])[0])
+        invoice.add_attachment_bytes("test.pdf", b"%PDF-\xff\xfe", comment="Test")
+
+        with Cassette(path, mode="record"):
+            recorded = Contact.getAll()
+            saved = Contact(name="New").save()
+            attachment = Invoice.get(invoiceId=invoice.invoiceId).get_attachments()[0]
+            content = b"".join(attachment.iter_content())
+        base = FikenObject.PATH_BASE
+
+    text = path.read_text()
+    assert "SECRET_TOKEN" not in text
+    assert len(text.splitlines()) == 7
+    assert json.loads(text.splitlines()[0])["request"]["headers"]["Authorization"] == (
+        "Bearer [REDACTED]"
+    )
+
+    # The server is gone, so everything must be served from the cassette
+    FikenObject.PATH_BASE = base
+    try:
+        with Cassette(path) as cassette:
+            assert Contact.getAll() == recorded
+            assert Contact(name="New").save() == saved
+            attachment = Invoice.get(invoiceId=invoice.invoiceId).get_attachments()[0]
+            assert b"".join(attachment.iter_content()) == content == b"%PDF-\xff\xfe"
+
+            # Repeated requests get the last recorded response again
+            assert Contact.getAll() == recorded
+
+            with pytest.raises(RequestNotRecordedException):
+                Contact.getAll(name="Unknown")
+        assert FikenObject._TRANSPORT is None
+        assert len(cassette.interactions) == 7
+    finally:
+        FikenObject.PATH_BASE = original_base
+
+
+def test_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        Cassette(tmp_path / "cassette.ndjson", mode="write")
@@ -0,0 +1,85 @@
+from fiken_py.bulk import bulk_save
+from fiken_py.fiken_object import FikenObject
+from fiken_py.models import Contact, Invoice, Project
+
+
+def test_unchanged_save_is_skipped(server):
+    contact = Contact(name="Test")
+    assert contact.changed_fields() is None
+    contact.save()
+    assert contact.changed_fields() == set()
+    server.requests.clear()
+
+    contact.save()
+    assert server.requests == []
+
+    contact.name = "Renamed"
+    contact.address = None
+    assert contact.changed_fields() == {"name"}
+    contact.save()
+    assert [method for method, _ in server.requests] == ["PUT", "GET"]
+    assert contact.is_unchanged()
+
+    contact.name = "Renamed again"
+    assert contact.changed_fields() == {"name"}
+    contact.save()
+    # The snapshot of the previous load is not reused
+    assert contact.changed_fields() == set()
+
+
+def test_minimal_patch_bodies(server):
+    stored = server.add(
+        Invoice,
+        [{"issueDate": "2024-01-01", "dueDate": "2024-01-15", "sentManually": True}],
+    )
+    invoice = Invoice.get(invoiceId=stored[0]["invoiceId"])
+
+    invoice.dueDate = "2024-02-01"
+    invoice.save()
+
+    # sentManually was not sent, so it is not overwritten
+    record = server.records(Invoice)[0]
+    assert (record["dueDate"], record["sentManually"]) == ("2024-02-01", True)
+
+    project = Project(name="Project", number="1", startDate="2024-01-01").save()
+    project.description = "Described"
+    project.save()
+    assert project.description == "Described"
+    assert project.name == "Project"
+
+
+def test_non_updatable_changes_are_not_sent(server, caplog):
+    project = Project(name="Project", number="1", startDate="2024-01-01").save()
+    project.number = "2"
+    server.requests.clear()
+
+    with caplog.at_level("WARNING", logger="fiken_py"):
+        assert project.save() is project
+
+    assert server.requests == []
+    assert "number" in caplog.text
+
+
+def test_bulk_save_counts_unchanged(server):
+    server.add(Contact, [{"name": f"Contact {i}"} for i in range(6)])
+    contacts = Contact.getAll()
+    contacts[0].name = "Changed"
+    server.requests.clear()
+
+    result = bulk_save(contacts, max_workers=2)
+
+    assert result.unchanged == 5
+    assert result.succeeded == 6
+    assert [method for method, _ in server.requests] == ["PUT", "GET"]
+
+
+def test_change_tracking_can_be_disabled(server):
+    server.add(Contact, [{"name": "Test"}])
+    FikenObject.set_change_tracking(False)
+    try:
+        (contact,) = Contact.getAll()
+    finally:
+        FikenObject.set_change_tracking(True)
+
+    assert contact.changed_fields() is None
+    assert not contact.is_unchanged()
@@ -0,0 +1,112 @@
+import gzip
+import json
+
+import pytest
+import requests_mock
+
+from fiken_py.bulk import run_bulk
+from fiken_py.cli import main
+from fiken_py.fiken_object import FikenObject, RequestMethod
+from fiken_py.models import Contact
+
+SLUG = "test-company"
+TOKEN = "SAMPLE_TOKEN"
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_token():
+    FikenObject.clear_auth_token()
+    yield
+    FikenObject.clear_auth_token()
+
+
+def _contacts_url():
+    return Contact._get_method_base_URL(RequestMethod.GET_MULTIPLE).format(
+        companySlug=SLUG
+    )
+
+
+def _contact_page(request, context):
+    page = int(request.qs.get("page", ["0"])[0])
+    context.headers["Fiken-Api-Page-Count"] = "3"
+    return [{"contactId": page * 10 + i, "name": f"Contact {page}-{i}"} for i in range(2)]
+
+
+def test_export_follows_pages_in_order(tmp_path):
+    output = tmp_path / "contacts.ndjson.gz"
+    with requests_mock.Mocker() as m:
+        m.get(_contacts_url(), json=_contact_page)
+        code = main(
+            ["--token", TOKEN, "--company", SLUG, "-q"]
+            + ["export", "contacts", "-o", str(output), "-w", "3", "-p", "name=Contact"]
+        )
+
+    assert code == 0
+    assert m.call_count == 3
+    assert m.last_request.qs["name"] == ["contact"]
+    with gzip.open(output, "rt") as f:
+        rows = [json.loads(line) for line in f]
+    assert [row["contactId"] for row in rows] == [0, 1, 10, 11, 20, 21]
+
+
+def test_import_saves_objects(tmp_path):
+    source = tmp_path / "contacts.ndjson"
+    source.write_text(
+        "\n".join(json.dumps({"contactId": i, "name": f"C{i}"}) for i in range(5))
+        + "\n\n"
+    )
+    single_url = Contact._get_method_base_URL(RequestMethod.GET)
+
+    with requests_mock.Mocker() as m:
+        for i in range(5):
+            url = single_url.format(companySlug=SLUG, contactId=i)
+            m.put(url, status_code=200, headers={"Location": url})
+            m.get(url, json={"contactId": i, "name": f"C{i}"})
+
+        code = main(
+            ["--token", TOKEN, "--company", SLUG, "-q"]
+            + ["import", "contacts", "-i", str(source), "-w", "2"]
+        )
+
+    assert code == 0
+    assert sum(1 for r in m.request_history if r.method == "PUT") == 5
+    assert all(r.headers["Authorization"] == f"Bearer {TOKEN}" for r in m.request_history)
+
+
+def test_import_reports_invalid_lines(tmp_path, capsys):
+    source = tmp_path / "contacts.ndjson"
+    source.write_text(
+        json.dumps({"contactId": 1, "name": "C1"})
+        + "\n{not json\n"
+        + json.dumps({"contactId": 2, "name": "C2", "customer": "maybe"})
+        + "\n"
+    )
+    url = Contact._get_method_base_URL(RequestMethod.GET).format(companySlug=SLUG, contactId=1)
+
+    with requests_mock.Mocker() as m:
+        m.put(url, status_code=200, headers={"Location": url})
+        m.get(url, json={"contactId": 1, "name": "C1"})
+
+        code = main(
+            ["--token", TOKEN, "--company", SLUG]
+            + ["import", "contacts", "-i", str(source)]
+        )
+
+    assert code == 1
+    assert sum(1 for r in m.request_history if r.method == "PUT") == 1
+    errors = capsys.readouterr().err
+    assert "Imported 1 objects, 2 failed" in errors
+    assert "Invalid Contact on line 2" in errors
+    assert "Invalid Contact on line 3" in errors
+
+
+def test_run_bulk_collects_failures():
+    def func(i):
+        if i % 3 == 0:
+            raise ValueError(i)
+        return i
+
+    result = run_bulk(func, range(10), max_workers=2)
+
+    assert sorted(result.results) == [1, 2, 4, 5, 7, 8]
+    assert sorted(item for item, _ in result.errors) == [0, 3, 6, 9]
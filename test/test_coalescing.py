@@ -0,0 +1,84 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fiken_py.coalescing import SingleFlight
+from fiken_py.fiken_object import FikenObject
+from fiken_py.models import Contact
+
+
+@pytest.fixture
+def server_options() -> dict:
+    return {"latency": 0.2}
+
+
+@pytest.fixture(autouse=True)
+def coalescing():
+    FikenObject.set_request_coalescing(True)
+    yield
+    FikenObject.set_request_coalescing(False)
+
+
+def _concurrently(func, count: int = 8) -> list:
+    barrier = threading.Barrier(count)
+
+    def call(_):
+        barrier.wait()
+        return func()
+
+    with ThreadPoolExecutor(count) as executor:
+        return list(executor.map(call, range(count)))
+
+
+def test_concurrent_gets_share_one_request(server):
+    stored = server.add(Contact, [{"name": "First"}, {"name": "Second"}])
+    contact_id = stored[0]["contactId"]
+
+    results = _concurrently(lambda: Contact.get(contactId=contact_id))
+
+    assert len(server.requests) == 1
+    assert all(result is results[0] for result in results)
+    assert FikenObject._SINGLE_FLIGHT.shared == 7
+
+    lists = _concurrently(Contact.getAll)
+    assert len(server.requests) == 2
+    assert all(len(contacts) == 2 for contacts in lists)
+    assert lists[0] is not lists[1]
+
+
+def test_different_parameters_are_not_shared(server):
+    stored = server.add(Contact, [{"name": "First"}, {"name": "Second"}])
+
+    with ThreadPoolExecutor(2) as executor:
+        first, second = executor.map(
+            lambda contact: Contact.get(contactId=contact["contactId"]), stored
+        )
+
+    assert (first.name, second.name) == ("First", "Second")
+    assert len(server.requests) == 2
+
+
+def test_errors_are_shared():
+    single_flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait()
+        raise ValueError("Failed")
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(single_flight.do, "key", failing)
+        started.wait()
+        follower = executor.submit(single_flight.do, "key", lambda: "not called")
+        while single_flight.shared == 0:
+            time.sleep(0.001)
+        release.set()
+
+        for future in (leader, follower):
+            with pytest.raises(ValueError):
+                future.result()
+    assert single_flight.do("key", lambda: "again") == "again"
@@ -0,0 +1,86 @@
+import datetime
+
+import pytest
+
+from fiken_py.columnar import (
+    JOURNAL_ENTRY_LINES,
+    INVOICE_LINES,
+    SALE_LINES,
+    TRANSACTION_LINES,
+)
+from sample_data_reader import get_sample_from_json
+
+
+def _journal_pages(entries: int, lines_per_entry: int, page_size: int):
+    sample = get_sample_from_json("journal_entry")
+    page = []
+    for entry_id in range(entries):
+        entry = dict(sample, journalEntryId=entry_id)
+        entry["lines"] = [
+            dict(sample["lines"][0], amount=entry_id * 100 + i)
+            for i in range(lines_per_entry)
+        ]
+        page.append(entry)
+        if len(page) == page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def test_journal_lines_are_flattened():
+    chunks = list(JOURNAL_ENTRY_LINES.iter_columns(_journal_pages(3, 2, 10)))
+
+    assert len(chunks) == 1
+    columns = chunks[0]
+    assert list(columns) == JOURNAL_ENTRY_LINES.column_names
+    assert columns["journalEntryId"] == [0, 0, 1, 1, 2, 2]
+    assert columns["lineNumber"] == [0, 1, 0, 1, 0, 1]
+    assert columns["amount"] == [0, 1, 100, 101, 200, 201]
+    assert columns["date"][0] == datetime.date(2018, 4, 3)
+
+
+def test_chunks_are_bounded():
+    chunks = list(JOURNAL_ENTRY_LINES.iter_columns(_journal_pages(25, 4, 7), chunk_rows=30))
+
+    sizes = [len(chunk["amount"]) for chunk in chunks]
+    assert sizes == [30, 30, 30, 10]
+
+
+def test_invoice_and_sale_lines():
+    invoice = get_sample_from_json("invoice")
+    columns = next(INVOICE_LINES.iter_columns([[invoice]]))
+    assert columns["invoiceId"] == [invoice["invoiceId"]] * len(invoice["lines"])
+    assert columns["customerId"][0] == invoice["customer"]["contactId"]
+
+    sale = get_sample_from_json("sale")
+    columns = next(SALE_LINES.iter_columns([[sale]]))
+    assert columns["line_netPrice"] == [line["netPrice"] for line in sale["lines"]]
+
+
+def test_object_without_lines_keeps_a_row():
+    sale = dict(get_sample_from_json("sale"), lines=[])
+    columns = next(SALE_LINES.iter_columns([[sale]]))
+    assert columns["saleId"] == [sale["saleId"]]
+    assert columns["lineNumber"] == [None]
+
+
+def test_transaction_lines():
+    transaction = get_sample_from_json("transaction")
+    columns = next(TRANSACTION_LINES.iter_columns([[transaction]]))
+    assert set(columns["transactionId"]) == {transaction["transactionId"]}
+
+
+def test_parquet_roundtrip(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    path = tmp_path / "journal.parquet"
+    written = JOURNAL_ENTRY_LINES.to_parquet(
+        str(path), pages=_journal_pages(20, 3, 6), chunk_rows=16
+    )
+
+    table = pq.read_table(str(path))
+    assert written == 60
+    assert table.num_rows == 60
+    assert table.schema == JOURNAL_ENTRY_LINES.arrow_schema()
+    assert pq.ParquetFile(str(path)).num_row_groups == 4
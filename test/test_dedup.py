@@ -0,0 +1,103 @@
+import pytest
+
+from fiken_py.dedup import DuplicateIndex, normalize_name, phonetic_name
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.models import Contact, Product
+
+CONTACTS = [
+    Contact(contactId=1, name="Acme Industrier AS", organizationNumber="987654321"),
+    Contact(contactId=2, name="Hanssen Regnskap", email="Post@Hanssen.no"),
+    Contact(contactId=3, name="Nordlys ANS", organizationNumber="912345678"),
+    Contact(contactId=4, name="Fjord Bygg"),
+    Contact(contactId=5, name="Fjord Bygg AS"),
+]
+
+
+@pytest.fixture
+def index() -> DuplicateIndex:
+    return DuplicateIndex(CONTACTS)
+
+
+def test_names_are_normalized():
+    assert normalize_name("  ACME Industrier, AS ") == "acme industrier"
+    assert normalize_name("Bjørn Ærlig Å-S") == "bjorn aerlig aa s"
+    assert normalize_name("AS") is None
+    assert phonetic_name("Hansen Regnskap AS") == "h525 r252"
+    assert phonetic_name("Hanssen regnskap") == phonetic_name("Hansen Regnskap")
+
+
+def test_find(index: DuplicateIndex):
+    assert index.find(Contact(name="Other", organizationNumber="987 654 321")).contactId == 1
+    assert index.find({"name": "x", "email": "post@hanssen.no "}).contactId == 2
+    assert index.find(Contact(name="ACME industrier")).contactId == 1
+    assert index.find(Contact(name="Hansen Regnskap AS")).contactId == 2
+    assert index.find(Contact(name="Solstråle")) is None
+    # Same name, but another organization number is another company
+    assert index.find(Contact(name="Nordlys", organizationNumber="999999999")) is None
+    assert index.find(Contact(name="Nordlys")).contactId == 3
+
+    with pytest.raises(ValueError):
+        index.find(Contact(name="FJORD BYGG"))
+
+
+def test_plan_merges_duplicates_within_an_import(index: DuplicateIndex):
+    plan = index.plan(
+        [
+            {"name": "Solstråle AS", "organizationNumber": "911111111"},
+            {"name": "Solstrale", "email": "hei@solstrale.no"},
+            {"name": "Acme Industrier AS", "phoneNumber": "12345678"},
+            {"name": "Fjord Bygg"},
+        ]
+    )
+
+    assert len(plan.creates) == 1
+    assert plan.creates[0].email == "hei@solstrale.no"
+    assert plan.merged == 1
+    assert [(c.contactId, c.phoneNumber) for c in plan.updates] == [(1, "12345678")]
+    assert CONTACTS[0].phoneNumber is None
+    assert [c.contactId for c in plan.ambiguous[0][1]] == [4, 5]
+    # The new contact is found by its email from now on
+    assert index.find(Contact(name="x", email="hei@solstrale.no")) is plan.creates[0]
+
+
+def test_products_by_number_and_name():
+    index = DuplicateIndex(
+        [
+            Product(productId=1, name="Kaffe 1kg", productNumber="K-1", vatType="HIGH"),
+            Product(productId=2, name="Te", vatType="HIGH"),
+        ]
+    )
+
+    assert index.find({"name": "Coffee", "productNumber": "k-1", "vatType": "HIGH"}).productId == 1
+    assert index.find({"name": "TE", "vatType": "HIGH"}).productId == 2
+
+
+def test_upsert(server: FakeFikenServer):
+    server.add(
+        Contact,
+        [
+            {"name": "Acme Industrier AS", "organizationNumber": "987654321"},
+            {"name": "Hanssen Regnskap", "email": "post@hanssen.no"},
+        ],
+    )
+    index = DuplicateIndex.from_api(Contact)
+
+    result = index.upsert(
+        [
+            {"name": "Acme Industrier AS", "organizationNumber": "987 654 321",
+             "phoneNumber": "12345678"},
+            {"name": "Hanssen Regnskap", "email": "post@hanssen.no"},
+            {"name": "Ny Kunde AS", "customer": True},
+            {"name": "Ny kunde", "email": "ny@kunde.no"},
+        ],
+        max_workers=2,
+    )
+
+    assert len(result.created) == 1 and len(result.updated) == 2
+    assert result.unchanged == 1 and result.merged == 1 and not result.errors
+    records = {r["name"]: r for r in server.records(Contact)}
+    assert len(records) == 3
+    assert records["Acme Industrier AS"]["phoneNumber"] == "12345678"
+    # The later duplicate in the import is merged into the new contact
+    assert records["Ny kunde"]["email"] == "ny@kunde.no"
+    assert result.created[0].contactId is not None
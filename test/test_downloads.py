@@ -0,0 +1,99 @@
+import io
+import os
+
+import pytest
+import requests_mock
+
+from fiken_py.downloads import AttachmentCache, download_attachments
+from fiken_py.fiken_object import FikenObject
+from fiken_py.shared_types import Attachment
+
+PDF_URL = "https://api.fiken.no/api/v2/files/abc123"
+PDF_CONTENT = b"%PDF-1.4 sample" * 10000
+
+
+@pytest.fixture(autouse=True)
+def set_auth_token():
+    FikenObject.clear_auth_token()
+    FikenObject.set_auth_token("SAMPLE_TOKEN")
+    yield
+    FikenObject.clear_auth_token()
+
+
+@pytest.fixture
+def m():
+    with requests_mock.Mocker() as m:
+        yield m
+
+
+def _attachment(identifier="invoice.pdf", url=PDF_URL):
+    return Attachment(identifier=identifier, downloadUrl=url)
+
+
+def test_download_to_file_object(m: requests_mock.Mocker):
+    m.get(PDF_URL, content=PDF_CONTENT)
+
+    buffer = io.BytesIO()
+    written = _attachment().download_to(buffer)
+
+    assert written == len(PDF_CONTENT)
+    assert buffer.getvalue() == PDF_CONTENT
+    assert m.last_request.headers["Authorization"] == "Bearer SAMPLE_TOKEN"
+
+
+def test_iter_content_chunks(m: requests_mock.Mocker):
+    m.get(PDF_URL, content=PDF_CONTENT)
+
+    chunks = list(_attachment().iter_content(chunk_size=1024))
+
+    assert len(chunks) > 1
+    assert b"".join(chunks) == PDF_CONTENT
+
+
+def test_download_without_url():
+    with pytest.raises(ValueError):
+        _attachment(url=None).download_to(io.BytesIO())
+
+
+def test_cache_prevents_refetch(m: requests_mock.Mocker, tmp_path):
+    m.get(PDF_URL, content=PDF_CONTENT)
+    cache = AttachmentCache(str(tmp_path / "cache"))
+
+    _attachment().download_to(str(tmp_path / "first.pdf"), cache=cache)
+    _attachment().download_to(str(tmp_path / "second.pdf"), cache=cache)
+
+    assert m.call_count == 1
+    assert (tmp_path / "second.pdf").read_bytes() == PDF_CONTENT
+
+
+def test_cache_is_content_addressed(m: requests_mock.Mocker, tmp_path):
+    other_url = PDF_URL + "-copy"
+    m.get(PDF_URL, content=PDF_CONTENT)
+    m.get(other_url, content=PDF_CONTENT)
+    cache = AttachmentCache(str(tmp_path / "cache"))
+
+    _attachment().download_to(io.BytesIO(), cache=cache)
+    _attachment("copy.pdf", other_url).download_to(io.BytesIO(), cache=cache)
+
+    stored = [
+        name
+        for _, _, files in os.walk(tmp_path / "cache" / "objects")
+        for name in files
+    ]
+    assert len(stored) == 1
+    assert m.call_count == 2
+
+
+def test_bulk_download(m: requests_mock.Mocker, tmp_path):
+    attachments = []
+    for i in range(5):
+        url = f"{PDF_URL}/{i}"
+        m.get(url, content=f"file {i}".encode())
+        attachments.append(_attachment(f"file_{i}.pdf", url))
+
+    paths = download_attachments(attachments, str(tmp_path), max_workers=3)
+
+    assert [os.path.basename(p) for p in paths] == [f"file_{i}.pdf" for i in range(5)]
+    for i, path in enumerate(paths):
+        with open(path, "rb") as f:
+            assert f.read() == f"file {i}".encode()
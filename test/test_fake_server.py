@@ -0,0 +1,103 @@
+import pytest
+
+from fiken_py.errors import RequestTooManyRequestsException
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.fiken_object import FikenObject
+from fiken_py.models import Contact, InvoiceDraft, Invoice, Company
+
+
+def test_save_get_and_delete(server: FakeFikenServer):
+    contact = Contact(name="Test", customer=True)
+    contact.save()
+    assert contact.contactId is not None
+    assert contact.createdDate is not None
+
+    contact.name = "Renamed"
+    contact.save()
+    assert Contact.get(contactId=contact.contactId).name == "Renamed"
+    assert [method for method, _ in server.requests] == [
+        "POST",
+        "GET",
+        "PUT",
+        "GET",
+        "GET",
+    ]
+
+    contact_id = contact.contactId
+    contact.delete()
+    assert Contact.get(contactId=contact_id) is None
+
+
+def test_pagination_and_filters(server: FakeFikenServer):
+    server.add(
+        Contact, [{"name": f"Contact {i}", "customer": i % 2 == 0} for i in range(60)]
+    )
+
+    assert len(Contact.getAll()) == 60
+    assert len(server.requests) == 3
+    assert len(Contact.getAll(customer=True, pageSize=100)) == 30
+    assert Company.get(companySlug=server.company_slug).slug == server.company_slug
+
+    raw = Contact.getAllRaw(customer=True, max_workers=2)
+    assert [item["name"] for item in raw] == [f"Contact {i}" for i in range(0, 60, 2)]
+
+
+def test_too_many_requests_is_retried(server: FakeFikenServer):
+    server.add(Contact, [{"name": "Test"}])
+    server.inject_errors(2, retry_after=0)
+
+    assert len(Contact.getAll()) == 1
+    assert len(server.requests) == 3
+
+    server.inject_errors(FikenObject._TOO_MANY_REQUESTS_RETRIES + 1, retry_after=0)
+    with pytest.raises(RequestTooManyRequestsException):
+        Contact.getAll()
+
+
+def test_attachments(server: FakeFikenServer):
+    invoice = Invoice(**server.add(Invoice, [{"issueDate": "2024-01-01"}])[0])
+
+    assert invoice.add_attachment_bytes("test.pdf", b"%PDF-content", comment="Test")
+
+    attachments = invoice.get_attachments()
+    assert [a.comment for a in attachments] == ["Test"]
+    assert b"".join(attachments[0].iter_content()) == b"%PDF-content"
+
+
+def test_draft_creates_object_and_counts(server: FakeFikenServer):
+    contact = Contact(name="Customer", customer=True).save()
+    line = {
+        "description": "Line",
+        "unitPrice": 1000,
+        "quantity": 2,
+        "vatType": "HIGH",
+        "incomeAccount": "3000",
+    }
+    stored = server.add(
+        InvoiceDraft,
+        [{"type": "invoice", "customerId": contact.contactId, "lines": [line]}],
+    )
+    draft = InvoiceDraft(**stored[0])
+
+    invoice = draft.submit_object()
+
+    assert invoice.invoiceNumber == Invoice.get_counter()
+    assert invoice.gross == 2500
+    assert invoice.customer.contactId == contact.contactId
+    assert InvoiceDraft.get(draftId=draft.draftId) is None
+
+
+def test_routes_cover_models_not_imported_yet():
+    import subprocess
+    import sys
+
+    # In a fresh interpreter, no model module has been imported when the server builds its routes
+    code = (
+        "from fiken_py.fake_server import FakeFikenServer\n"
+        "from fiken_py.models import Contact, Purchase\n"
+        "with FakeFikenServer() as server:\n"
+        "    assert server.add(Purchase, [{'date': '2024-01-01'}])\n"
+        "    assert server.add(Contact, [{'name': 'A'}])\n"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,90 @@
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.identity_map import IdentityMap
+from fiken_py.models import Contact, ContactPerson, Invoice, Project
+
+
+def _add_invoices(server: FakeFikenServer, count: int):
+    customers = server.add(
+        Contact, [{"name": "A", "customer": True}, {"name": "B", "customer": True}]
+    )
+    project = server.add(Project, [{"name": "Project", "number": "1"}])[0]
+    server.add(
+        Invoice,
+        [
+            {
+                "issueDate": "2024-01-01",
+                "customer": customers[i % 2],
+                "project": project,
+            }
+            for i in range(count)
+        ],
+    )
+
+
+def test_embedded_objects_are_shared(server):
+    _add_invoices(server, 30)
+
+    with IdentityMap() as identity_map:
+        invoices = Invoice.getAll()
+
+    assert len(invoices) == 30
+    assert invoices[0].customer is invoices[2].customer
+    assert invoices[0].customer is not invoices[1].customer
+    assert invoices[0].project is invoices[29].project
+    assert len({id(invoice.customer) for invoice in invoices}) == 2
+    assert len(identity_map) == 3
+    assert identity_map.hits == 57
+
+
+def test_not_shared_without_identity_map(server):
+    _add_invoices(server, 2)
+
+    first, second = Invoice.getAll()
+    assert first.customer == Invoice.getAll()[0].customer
+    assert first.project is not second.project
+
+
+def test_constructor_is_not_interned():
+    with IdentityMap() as identity_map:
+        first = Contact(contactId=1, name="First")
+        second = Contact(contactId=1, name="Second")
+
+    assert (first.name, second.name) == ("First", "Second")
+    assert len(identity_map) == 0
+
+
+def test_saved_object_is_not_replaced_by_shared_instance(server):
+    server.add(Contact, [{"name": "A", "customer": True}])
+
+    with IdentityMap():
+        (contact,) = Contact.getAll()
+        renamed = contact.model_copy(update={"name": "Renamed"})
+        renamed.save()
+
+    assert renamed.name == "Renamed"
+    assert server.records(Contact)[0]["name"] == "Renamed"
+
+
+def test_refresh_after_mutation_is_not_replaced_by_shared_instance(server):
+    server.add(Contact, [{"name": "A", "customer": True}])
+
+    with IdentityMap():
+        contact = Contact.get(contactId=1)
+        contact.create_contact_person(ContactPerson(name="Person", email="person@example.com"))
+
+    assert [person.name for person in contact.contactPerson] == ["Person"]
+
+
+def test_shared_instance_read_again_matches_its_baseline(server):
+    _add_invoices(server, 2)
+
+    with IdentityMap():
+        invoice = Invoice.getAll()[0]
+        server.records(Contact)[0]["name"] = "Renamed"
+        contact = Contact.get(contactId=invoice.customer.contactId)
+
+    assert contact is invoice.customer
+    assert contact.name == "Renamed"
+    assert contact.is_unchanged()
+    contact.name = "A"
+    assert contact.changed_fields() == {"name"}
@@ -0,0 +1,124 @@
+import datetime
+
+import pytest
+
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.models import BalanceAccountBalance, Company, JournalEntry
+
+pytest.importorskip("numpy")
+
+from fiken_py.ledger import Ledger  # noqa: E402
+
+ENTRIES = [
+    {
+        "journalEntryId": 1,
+        "description": "Sale",
+        "date": "2024-01-15",
+        "lines": [
+            {"amount": 12500, "account": "1500:10001", "projectId": [7]},
+            {"amount": -10000, "account": "3000", "projectId": [7]},
+            {"amount": -2500, "account": "2700"},
+        ],
+    },
+    {
+        "journalEntryId": 2,
+        "description": "Payment",
+        "date": "2024-02-10",
+        "lines": [{"amount": 12500, "debitAccount": "1920", "creditAccount": "1500:10001"}],
+    },
+    {
+        "journalEntryId": 3,
+        "description": "Rent",
+        "date": "2024-03-01",
+        "lines": [
+            {"amount": 5000, "debitAccount": "6300", "creditAccount": "1920", "projectId": [8]}
+        ],
+    },
+]
+
+
+@pytest.fixture
+def ledger() -> Ledger:
+    return Ledger(ENTRIES)
+
+
+def test_trial_balance(ledger: Ledger):
+    assert ledger.trial_balance(datetime.date(2024, 1, 31)) == {
+        "1500:10001": 12500,
+        "2700": -2500,
+        "3000": -10000,
+    }
+    balance = ledger.trial_balance()
+    assert balance == {"1920": 7500, "2700": -2500, "3000": -10000, "6300": 5000}
+    assert sum(balance.values()) == 0
+
+
+def test_balances_for_many_dates(ledger: Ledger):
+    month_ends = [
+        datetime.date(2024, 3, 31),
+        datetime.date(2024, 1, 31),
+        datetime.date(2024, 2, 29),
+        datetime.date(2023, 12, 31),
+    ]
+
+    table = ledger.balances(month_ends, main_accounts=True)
+
+    assert table.accounts == ["1500", "1920", "2700", "3000", "6300"]
+    assert table.row("1500") == [0, 12500, 0, 0]
+    assert table.row("1920") == [7500, 0, 12500, 0]
+    assert table.column(datetime.date(2024, 2, 29)) == {
+        "1920": 12500,
+        "2700": -2500,
+        "3000": -10000,
+    }
+    assert ledger.balances(month_ends, since=datetime.date(2024, 2, 1)).row("1920") == [
+        7500,
+        0,
+        12500,
+        0,
+    ]
+
+
+def test_movements_and_projects(ledger: Ledger):
+    q1 = (datetime.date(2024, 1, 1), datetime.date(2024, 3, 31))
+    february = (datetime.date(2024, 2, 1), datetime.date(2024, 2, 29))
+
+    movements = ledger.movements([q1, february])
+    assert movements.row("1920") == [7500, 12500]
+    assert movements.column(february) == {"1500:10001": -12500, "1920": 12500}
+
+    assert ledger.trial_balance(project=7) == {"1500:10001": 12500, "3000": -10000}
+    assert ledger.movements([q1], project=8).column(q1) == {"1920": -5000, "6300": 5000}
+    assert ledger.trial_balance(project=99) == {}
+
+
+def test_running_balance(ledger: Ledger):
+    assert ledger.running_balance("1920") == [
+        (datetime.date(2024, 2, 10), 2, 12500, 12500),
+        (datetime.date(2024, 3, 1), 3, -5000, 7500),
+    ]
+    assert [line[3] for line in ledger.running_balance("1500")] == [12500, 0]
+
+
+def test_ledger_from_models_matches_dicts(ledger: Ledger):
+    from_models = Ledger(JournalEntry.model_validate(entry) for entry in ENTRIES)
+
+    assert from_models.trial_balance() == ledger.trial_balance()
+    assert len(from_models) == len(ledger) == 7
+
+
+def test_compare_with_api_balances(server: FakeFikenServer):
+    server.add(JournalEntry, ENTRIES)
+    company = Company.get(companySlug=server.company_slug)
+    date = datetime.date(2024, 12, 31)
+
+    ledger = company.get_ledger()
+    balances = BalanceAccountBalance.getAll(date=date)
+
+    assert len(ledger) == 7
+    assert ledger.compare(balances, date) == {}
+
+    # An entry the ledger has not seen shows up as a difference
+    server.add(JournalEntry, [dict(ENTRIES[0], journalEntryId=4)])
+    differences = ledger.compare(BalanceAccountBalance.getAll(date=date), date)
+    assert differences["3000"] == (-10000, -20000)
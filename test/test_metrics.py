@@ -0,0 +1,99 @@
+import pytest
+
+from fiken_py.fiken_object import FikenObject
+from fiken_py.instrumentation import RequestEvent, RequestListener, path_template
+from fiken_py.metrics import Histogram, RequestMetrics
+from fiken_py.models import Contact
+
+
+@pytest.fixture
+def metrics():
+    metrics = RequestMetrics()
+    FikenObject.add_request_listener(metrics)
+    yield metrics
+    FikenObject.remove_request_listener(metrics)
+
+
+def test_requests_are_grouped_by_path_template(server, metrics):
+    server.add(Contact, [{"name": f"Contact {i}"} for i in range(30)])
+
+    contacts = Contact.getAll()
+    Contact.get(contactId=contacts[0].contactId)
+    Contact.get(contactId=contacts[1].contactId)
+    Contact(name="New").save()
+
+    rows = {(row["method"], row["pathTemplate"]): row for row in metrics.summary()}
+    assert rows[("GET_MULTIPLE", "/companies/{companySlug}/contacts/")]["requests"] == 2
+    single = rows[("GET", "/companies/{companySlug}/contacts/{contactId}")]
+    # The two gets, and following the Location header after saving
+    assert single["requests"] == 3
+    assert single["statuses"] == {"200": 3}
+    assert single["bytesReceived"] > 0
+    post = rows[("POST", "/companies/{companySlug}/contacts/")]
+    assert post["statuses"] == {"201": 1}
+    assert post["bytesSent"] > 0
+
+    endpoint = metrics.endpoints[
+        ("Contact", "GET_MULTIPLE", "/companies/{companySlug}/contacts/")
+    ]
+    assert endpoint.validation.count == 2
+    assert endpoint.decode.sum > 0
+
+
+def test_failed_requests_are_counted(server, metrics):
+    server.inject_errors(1, retry_after=0)
+    Contact.getAll()
+
+    (row,) = metrics.summary()
+    assert row["statuses"] == {"429": 1, "200": 1}
+
+
+def test_prometheus_export(metrics):
+    event = RequestEvent(
+        model="Contact",
+        method="GET",
+        pathTemplate="/companies/{companySlug}/contacts/{contactId}",
+        status=200,
+        networkTime=0.02,
+        bytesReceived=100,
+        rateLimitWait=0.5,
+    )
+    metrics.on_request(event)
+    metrics.on_request(event)
+
+    text = metrics.to_prometheus()
+    labels = 'model="Contact",method="GET",path="/companies/{companySlug}/contacts/{contactId}"'
+    assert f'fiken_request_network_seconds_bucket{{{labels},le="0.01"}} 0' in text
+    assert f'fiken_request_network_seconds_bucket{{{labels},le="0.025"}} 2' in text
+    assert f'fiken_request_network_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f'fiken_requests_total{{{labels},status="200"}} 2' in text
+    assert f"fiken_response_bytes_total{{{labels}}} 200" in text
+    assert f"fiken_rate_limit_waits_total{{{labels}}} 2" in text
+
+
+def test_listener_errors_are_not_raised(server):
+    class Failing(RequestListener):
+        def on_request(self, event):
+            raise RuntimeError("Listener failed")
+
+    listener = Failing()
+    FikenObject.add_request_listener(listener)
+    try:
+        assert Contact.getAll() == []
+    finally:
+        FikenObject.remove_request_listener(listener)
+
+
+def test_path_template_and_histogram():
+    templates = ["/companies/{companySlug}/contacts/{contactId}"]
+    assert path_template("/companies/demo/contacts/12", templates) == templates[0]
+    assert path_template("/companies/demo/invoices/12/attachments") == (
+        "/companies/{companySlug}/invoices/{id}/attachments"
+    )
+
+    histogram = Histogram((1.0, 2.0))
+    for value in (0.5, 1.5, 1.5, 3.0):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("1.0", 1), ("2.0", 3), ("+Inf", 4)]
+    assert histogram.quantile(0.5) == 2.0
+    assert histogram.mean == pytest.approx(1.625)
@@ -0,0 +1,129 @@
+import datetime
+
+import pytest
+import requests_mock
+
+from fiken_py.fiken_object import RequestMethod
+from fiken_py.mirror import LedgerMirror
+from fiken_py.models import Invoice, JournalEntry, Contact, Project
+from sample_data_reader import get_sample_from_json
+
+SLUG = "test-company"
+
+
+@pytest.fixture
+def mirror():
+    with LedgerMirror(companySlug=SLUG, token="SAMPLE_TOKEN") as mirror:
+        yield mirror
+
+
+def _invoice(invoice_id, issue_date, kid, customer_id):
+    data = get_sample_from_json("invoice")
+    data.update(invoiceId=invoice_id, issueDate=issue_date, kid=kid)
+    data["customer"]["contactId"] = customer_id
+    return Invoice(**data)
+
+
+def _journal_entry(entry_id, date, account):
+    data = get_sample_from_json("journal_entry")
+    data.update(journalEntryId=entry_id, date=date)
+    data["lines"][0]["account"] = account
+    return JournalEntry(**data)
+
+
+def test_load_and_get(mirror: LedgerMirror):
+    invoice = _invoice(1, "2024-01-10", "1001", 5)
+    mirror.load(Invoice, [invoice])
+
+    stored = mirror.get(Invoice, 1)
+    assert stored == invoice
+    assert stored._company_slug == SLUG
+    assert stored._auth_token == "SAMPLE_TOKEN"
+    assert mirror.get(Invoice, 2) is None
+
+
+def test_query_filters(mirror: LedgerMirror):
+    mirror.load(
+        Invoice,
+        [
+            _invoice(1, "2024-01-10", "1001", 5),
+            _invoice(2, "2024-02-10", "1002", 5),
+            _invoice(3, "2024-03-10", "1003", 6),
+        ],
+    )
+
+    in_range = mirror.query(
+        Invoice,
+        date_from=datetime.date(2024, 2, 1),
+        date_to=datetime.date(2024, 3, 31),
+    )
+    assert [i.invoiceId for i in in_range] == [2, 3]
+    assert [i.invoiceId for i in mirror.query(Invoice, contact_id=5)] == [1, 2]
+    assert [i.invoiceId for i in mirror.find_by_kid("1003")] == [3]
+    assert mirror.count(Invoice) == 3
+
+
+def test_replacing_objects(mirror: LedgerMirror):
+    mirror.load(Invoice, [_invoice(1, "2024-01-10", "1001", 5)])
+    mirror.load(Invoice, [_invoice(1, "2024-01-11", "1001", 5)])
+
+    assert mirror.count(Invoice) == 1
+    assert mirror.get(Invoice, 1).issueDate == datetime.date(2024, 1, 11)
+
+
+def test_journal_entries_by_account(mirror: LedgerMirror):
+    mirror.load(
+        JournalEntry,
+        [
+            _journal_entry(1, "2024-01-01", "1920"),
+            _journal_entry(2, "2024-01-02", "1500:10001"),
+            _journal_entry(3, "2024-02-02", "1500"),
+        ],
+    )
+
+    assert [e.journalEntryId for e in mirror.journal_entries_for_account("1500")] == [
+        2,
+        3,
+    ]
+    assert [
+        e.journalEntryId
+        for e in mirror.journal_entries_for_account(
+            "1500", date_to=datetime.date(2024, 1, 31)
+        )
+    ] == [2]
+
+
+def test_refresh_is_incremental(mirror: LedgerMirror):
+    url = Contact._get_method_base_URL(RequestMethod.GET_MULTIPLE).format(
+        companySlug=SLUG
+    )
+    with requests_mock.Mocker() as m:
+        m.get(url, json=[{"contactId": 1, "name": "A", "lastModifiedDate": "2024-01-05"}])
+        delta = mirror.refresh(Contact)
+        assert len(delta.created) == 1
+
+        mirror.refresh(Contact)
+        assert m.last_request.qs["lastmodifiedge"] == ["2024-01-05"]
+
+    assert mirror.get(Contact, 1).name == "A"
+
+
+def test_refresh_all_fetches_models_without_last_modified_in_full(mirror: LedgerMirror):
+    with requests_mock.Mocker() as m:
+        for model in LedgerMirror.MODELS:
+            url = model._get_method_base_URL(RequestMethod.GET_MULTIPLE)
+            m.get(url.format(companySlug=SLUG), json=[])
+        m.get(
+            Project._get_method_base_URL(RequestMethod.GET_MULTIPLE).format(companySlug=SLUG),
+            json=[{"projectId": 1, "number": "P1", "name": "A", "startDate": "2024-01-01"}],
+        )
+
+        deltas = mirror.refresh_all()
+        assert [d.model for d in deltas] == [model.__name__ for model in LedgerMirror.MODELS]
+        assert len(deltas[LedgerMirror.MODELS.index(Project)].created) == 1
+
+        (delta,) = mirror.refresh_all([Project])
+        assert delta.unchanged == 1
+        assert "lastmodifiedge" not in m.last_request.qs
+
+    assert mirror.get(Project, 1).name == "A"
@@ -224,3 +224,58 @@ def request_object_conv_test(obj: FikenObjectRequiringRequest):
     for attr, val in obj.__dict__.items():
         if attr in obj.__dict__:
             assert getattr(req, attr) == val
+
+
+def test_invoice_request_lines_match_dumped_lines():
+    invoice = Invoice(**get_sample_from_json("invoice"))
+
+    request = invoice._to_request_object(
+        bankAccountCode="1920:10001", paymentAccount="1920:10001"
+    )
+
+    assert [line.model_dump() for line in request.lines] == [
+        line.model_dump(exclude={"grossInNok", "netInNok", "vatInNok"})
+        for line in invoice.lines
+    ]
+
+
+def test_common_field_plan_warns_once(caplog):
+    class Base(BaseModel):
+        a: int = 1
+
+    class Request(BaseModel):
+        a: int
+        b: int = 2
+
+    with caplog.at_level(logging.WARNING, logger="fiken_py"):
+        for _ in range(3):
+            packed = FikenObjectRequiringRequest._pack_common_fields(Base(), Request)
+
+    assert packed == {"a": 1}
+    assert len([r for r in caplog.records if "Field b" in r.message]) == 1
+
+
+def test_models_are_imported_lazily():
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from fiken_py.models import Contact\n"
+        "assert 'fiken_py.models.contact' in sys.modules\n"
+        "assert 'fiken_py.models.invoice' not in sys.modules\n"
+        "assert 'fiken_py.models.company' not in sys.modules\n"
+        "assert not Contact.__pydantic_complete__\n"
+        "assert Contact.model_validate({'name': 'A'}).name == 'A'\n"
+    )
+
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_models_dir_lists_all_models():
+    import fiken_py.models
+
+    assert {"Invoice", "Company", "PaymentSale", "FikenPy"} <= set(dir(fiken_py.models))
+    assert fiken_py.models.FikenPy.__name__ == "FikenPy"
+    with pytest.raises(AttributeError):
+        fiken_py.models.NotAModel
@@ -0,0 +1,119 @@
+import datetime
+
+import pytest
+
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.models import Company, Purchase, Sale
+
+pytest.importorskip("numpy")
+
+from fiken_py.open_items import OpenItems  # noqa: E402
+
+ACME = {"contactId": 1, "name": "Acme AS"}
+BETA = {"contactId": 2, "name": "Beta AS"}
+
+SALES = [
+    # Invoiced, represented by the invoice below
+    {"saleId": 10, "date": "2024-01-01", "netAmount": 8000, "vatAmount": 2000,
+     "outstandingBalance": 10000, "settled": False, "customer": ACME},
+    {"saleId": 11, "date": "2024-02-01", "dueDate": "2024-02-15", "netAmount": 4000,
+     "vatAmount": 1000, "outstandingBalance": 5000, "settled": False, "customer": BETA},
+    {"saleId": 12, "date": "2024-02-01", "netAmount": 4000, "vatAmount": 1000,
+     "outstandingBalance": 0, "settled": True, "customer": BETA},
+    {"saleId": 13, "date": "2024-03-20", "dueDate": "2024-04-03", "netAmount": 800,
+     "vatAmount": 200, "totalPaid": 400, "settled": False, "customer": ACME},
+]
+INVOICES = [
+    {"invoiceId": 100, "invoiceNumber": 10001, "issueDate": "2024-01-01",
+     "dueDate": "2024-01-15", "grossInNok": 10000, "customer": ACME,
+     "sale": {"saleId": 10, "outstandingBalance": 6000, "settled": False}},
+]
+CREDIT_NOTES = [
+    {"creditNoteId": 200, "creditNoteNumber": 5, "issueDate": "2024-03-10",
+     "grossInNok": 1500, "settled": False, "customer": BETA},
+]
+PURCHASES = [
+    {"purchaseId": 300, "date": "2024-02-20", "dueDate": "2024-03-05", "paid": False,
+     "identifier": "F-77", "supplier": BETA,
+     "lines": [{"netPrice": 2000, "vat": 500}], "payments": [{"amount": 1000}]},
+    {"purchaseId": 301, "date": "2024-02-20", "paid": True, "supplier": BETA,
+     "lines": [{"netPrice": 2000, "vat": 500}]},
+]
+
+
+@pytest.fixture
+def items() -> OpenItems:
+    return OpenItems.from_documents(
+        sales=SALES, invoices=INVOICES, credit_notes=CREDIT_NOTES, purchases=PURCHASES
+    )
+
+
+def test_open_items(items: OpenItems):
+    assert sorted(items.keys) == [
+        ("credit_note", 200),
+        ("invoice", 100),
+        ("purchase", 300),
+        ("sale", 11),
+        ("sale", 13),
+    ]
+    assert items.outstanding() == {1: 6600, 2: 3500}
+    assert items.outstanding("payable") == {2: 1500}
+
+    invoice = items.item("invoice", 100)
+    assert invoice.number == "10001"
+    assert invoice.outstanding == 6000
+    assert items.item("credit_note", 200).number == "5"
+    assert [item.documentId for item in items.items(contactId=1)] == [100, 13]
+    assert [item.documentId for item in items.items(overdue_as_of=datetime.date(2024, 2, 1))] == [100]
+
+
+def test_documents_without_numbers():
+    credit_note = dict(CREDIT_NOTES[0])
+    del credit_note["creditNoteNumber"]
+
+    items = OpenItems.from_documents(credit_notes=[credit_note])
+    assert items.item("credit_note", 200).number is None
+
+
+def test_aging(items: OpenItems):
+    report = items.aging(datetime.date(2024, 4, 1))
+
+    assert report.buckets == ["not due", "1-30", "31-60", "61-90", "over 90"]
+    assert report.names == ["Acme AS", "Beta AS"]
+    assert report.row(1) == {"not due": 600, "1-30": 0, "31-60": 0, "61-90": 6000, "over 90": 0}
+    # The credit note is due when issued
+    assert report.row(2) == {"not due": 0, "1-30": -1500, "31-60": 5000, "61-90": 0, "over 90": 0}
+    assert report.totals["61-90"] == 6000
+
+    # Documents issued after the date are left out
+    assert items.aging(datetime.date(2024, 1, 31)).to_dict() == {
+        1: {"not due": 0, "1-30": 6000, "31-60": 0, "61-90": 0, "over 90": 0}
+    }
+    assert items.aging(datetime.date(2024, 4, 1), kind="payable").row(2)["1-30"] == 1500
+
+
+def test_dso(items: OpenItems):
+    # 10100 outstanding of 14500 issued in the 91 days
+    dso = items.dso(datetime.date(2024, 1, 1), datetime.date(2024, 3, 31))
+
+    assert dso == pytest.approx(10100 / 14500 * 91)
+    assert items.dso(datetime.date(2025, 1, 1), datetime.date(2025, 1, 31)) is None
+
+
+def test_settle_is_a_what_if(items: OpenItems):
+    settled = items.settle({("invoice", 100): None, ("sale", 11): 2000})
+
+    assert settled.outstanding() == {1: 600, 2: 1500}
+    assert settled.aging(datetime.date(2024, 4, 1)).row(2)["31-60"] == 3000
+    assert items.outstanding() == {1: 6600, 2: 3500}
+
+
+def test_open_items_from_api(server: FakeFikenServer):
+    server.add(Sale, SALES[1:3])
+    server.add(Purchase, PURCHASES)
+    company = Company.get(companySlug=server.company_slug)
+
+    items = company.get_open_items()
+
+    assert items.outstanding() == {2: 5000}
+    assert items.outstanding("payable") == {2: 1500}
@@ -0,0 +1,151 @@
+import pytest
+
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.models import Purchase, Sale
+
+pytest.importorskip("numpy")
+
+from fiken_py.open_items import OpenItems  # noqa: E402
+from fiken_py.reconciliation import Reconciler, StatementLine  # noqa: E402
+
+ACME = {"contactId": 1, "name": "Acme Industrier AS"}
+BETA = {"contactId": 2, "name": "Beta Bygg AS"}
+GAMMA = {"contactId": 3, "name": "Gamma Regnskap"}
+
+
+def _sale(sale_id: int, amount: int, customer: dict, due: str, kid=None) -> dict:
+    return {
+        "saleId": sale_id,
+        "saleNumber": f"S{sale_id}",
+        "date": "2024-03-01",
+        "dueDate": due,
+        "netAmount": amount,
+        "vatAmount": 0,
+        "outstandingBalance": amount,
+        "settled": False,
+        "kid": kid,
+        "customer": customer,
+    }
+
+
+SALES = [
+    _sale(1, 10000, ACME, "2024-03-15", kid="0000123"),
+    _sale(2, 25000, BETA, "2024-03-20"),
+    _sale(3, 7000, GAMMA, "2024-03-20"),
+    _sale(4, 7000, GAMMA, "2024-03-22"),
+    _sale(5, 4000, GAMMA, "2024-01-10"),
+]
+INVOICES = [
+    {"invoiceId": 50, "invoiceNumber": 10050, "issueDate": "2024-03-01",
+     "dueDate": "2024-03-31", "grossInNok": 30000, "customer": BETA,
+     "sale": {"saleId": 6, "outstandingBalance": 30000, "settled": False}},
+]
+PURCHASES = [
+    {"purchaseId": 90, "date": "2024-03-01", "dueDate": "2024-03-10", "paid": False,
+     "supplier": ACME, "lines": [{"netPrice": 5000, "vat": 1250}], "payments": []},
+]
+
+
+@pytest.fixture
+def reconciler() -> Reconciler:
+    return Reconciler(
+        OpenItems.from_documents(sales=SALES, invoices=INVOICES, purchases=PURCHASES)
+    )
+
+
+def _line(amount: int, date: str = "2024-03-18", **kwargs) -> StatementLine:
+    return StatementLine(date=date, amount=amount, **kwargs)
+
+
+def test_match_by_kid_amount_and_reference(reconciler: Reconciler):
+    lines = [
+        _line(10000, kid="000 0123"),
+        _line(25000),
+        _line(-6250),
+        _line(12000, reference="Innbetaling faktura 10050"),
+        _line(4000, reference="Fra GAMMA REGNSKAP"),
+        _line(999),
+    ]
+
+    result = reconciler.match(lines)
+
+    matched = {
+        m.line.amount: (m.method, m.item.source, m.item.documentId, m.amount)
+        for m in result.matches
+    }
+    assert matched == {
+        10000: ("kid", "sale", 1, 10000),
+        25000: ("amount", "sale", 2, 25000),
+        -6250: ("amount", "purchase", 90, 6250),
+        12000: ("reference", "invoice", 50, 12000),
+        4000: ("reference", "sale", 5, 4000),
+    }
+    assert result.unmatched == [lines[-1]]
+    assert result.matches[3].payment_target == {"saleId": 6}
+
+
+def test_ambiguous_amounts_use_reference(reconciler: Reconciler):
+    result = reconciler.match([_line(7000), _line(7000, reference="S4 Gamma")])
+
+    assert [item.documentId for item in result.ambiguous[0][1]] == [3, 4]
+    assert result.matches[0].item.documentId == 4
+
+
+def test_items_are_not_paid_twice(reconciler: Reconciler):
+    result = reconciler.match([_line(25000), _line(25000), _line(20000, reference="faktura 10050"),
+                               _line(20000, reference="faktura 10050")])
+
+    assert [m.amount for m in result.matches] == [25000, 20000, 10000]
+    assert len(result.unmatched) == 1
+
+
+def test_fuzzy_reference_needs_a_close_name(reconciler: Reconciler):
+    result = reconciler.match(
+        [_line(1000, reference="Acme Industriar"), _line(1000, reference="Something else")]
+    )
+
+    assert result.matches[0].item.contactId == 1
+    assert result.matches[0].score < 1
+    assert len(result.unmatched) == 1
+
+
+def test_names_are_compared_without_accents():
+    sales = [_sale(7, 3000, {"contactId": 4, "name": "Bjørn Café"}, "2024-01-10")]
+    reconciler = Reconciler(OpenItems.from_documents(sales=sales))
+
+    result = reconciler.match([_line(1000, reference="Fra BJORN CAFE")])
+
+    assert result.matches[0].item.documentId == 7
+    assert result.matches[0].score == 1.0
+
+
+def test_invoices_without_sale_are_not_matched():
+    invoice = dict(INVOICES[0], invoiceId=51, invoiceNumber=10051, kid="555")
+    del invoice["sale"]
+    reconciler = Reconciler(OpenItems.from_documents(invoices=[invoice]))
+
+    lines = [_line(30000, kid="555"), _line(30000, reference="faktura 10051")]
+    result = reconciler.match(lines)
+
+    assert result.matches == []
+    assert result.unmatched == lines
+
+
+def test_post_payments(server: FakeFikenServer):
+    sales = server.add(Sale, SALES[:2])
+    purchases = server.add(Purchase, PURCHASES)
+    items = OpenItems.from_api()
+    reconciler = Reconciler(items)
+
+    result = reconciler.match(
+        [_line(25000, account="1920:10002"), _line(-6250), _line(10000, kid="0000123")]
+    )
+    posted = reconciler.post(result, account="1920:10001", max_workers=2)
+
+    assert posted.succeeded == 3 and posted.failed == 0
+    paid = {r["saleId"]: r["salePayments"] for r in server.records(Sale)}
+    assert paid[sales[1]["saleId"]][0]["account"] == "1920:10002"
+    assert paid[sales[0]["saleId"]][0]["amount"] == 10000
+    purchase = server.records(Purchase)[0]
+    assert purchase["payments"][0]["amount"] == 6250
+    assert purchase["purchaseId"] == purchases[0]["purchaseId"]
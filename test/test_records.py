@@ -0,0 +1,52 @@
+import dataclasses
+import datetime
+import sys
+
+import pytest
+
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.models import Contact, Invoice, JournalEntry
+from fiken_py.records import from_model, iter_records, record_type
+from sample_data_reader import get_sample_from_json
+
+
+def test_journal_entry_record_round_trip():
+    data = get_sample_from_json("journal_entry")
+    record = record_type(JournalEntry).from_dict(data)
+
+    assert type(record).__name__ == "JournalEntryRecord"
+    assert record.date == datetime.date.fromisoformat(data["date"])
+    assert isinstance(record.lines, tuple)
+    assert type(record.lines[0]).__name__ == "JournalEntryLineRecord"
+    assert not hasattr(record, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        record.description = "Changed"
+
+    assert record.to_model() == JournalEntry(**data)
+    assert from_model(JournalEntry(**data)) == record
+
+
+def test_records_with_scalar_lists_are_hashable():
+    contact = Contact(contactId=1, name="Test", groups=["customers", "vip"])
+    record = from_model(contact)
+
+    assert record.groups == ("customers", "vip")
+    assert hash(record) == hash(from_model(contact))
+    assert record.to_model() == contact
+
+
+def test_invoice_record_is_smaller():
+    data = get_sample_from_json("invoice")
+    record = record_type(Invoice).from_dict(data)
+
+    assert record.to_model() == Invoice(**data)
+    assert record.customer.name == data["customer"]["name"]
+    assert sys.getsizeof(record) < sys.getsizeof(Invoice(**data).__dict__)
+
+
+def test_iter_records(server: FakeFikenServer):
+    server.add(Contact, [{"name": f"Contact {i}"} for i in range(30)])
+
+    records = list(iter_records(Contact))
+    assert [record.name for record in records] == [contact.name for contact in Contact.getAll()]
+    assert records[0].createdDate is not None
@@ -0,0 +1,74 @@
+import pytest
+
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.models import Company, Contact, Invoice, Product, Project
+from fiken_py.resolver import Resolver
+
+
+def _add_products(server: FakeFikenServer, count: int) -> list[dict]:
+    return server.add(
+        Product,
+        [
+            {
+                "name": f"Product {i}",
+                "unitPrice": 100,
+                "incomeAccount": "3000",
+                "vatType": "HIGH",
+                "active": True,
+            }
+            for i in range(count)
+        ],
+    )
+
+
+def _invoice(product_ids: list[int]) -> Invoice:
+    return Invoice(
+        issueDate="2024-01-01",
+        lines=[{"productId": product_id, "quantity": 1} for product_id in product_ids],
+    )
+
+
+def test_many_references_read_the_collection_once(server):
+    products = _add_products(server, 150)
+    invoices = [
+        _invoice([products[i]["productId"], products[i + 1]["productId"]])
+        for i in range(0, 100, 2)
+    ]
+    company = Company.get(companySlug=server.company_slug)
+    server.requests.clear()
+
+    resolved = company.resolve(invoices, "lines.productId")
+
+    assert len(resolved) == 100
+    assert resolved[products[3]["productId"]].name == "Product 3"
+    # Two pages of 100 products
+    assert len(server.requests) == 2
+
+
+def test_few_references_are_fetched_one_by_one_and_cached(server):
+    products = _add_products(server, 10)
+    customer = Contact(name="Customer").save()
+    project = Project(
+        name="Project", number="1", startDate="2024-01-01", contact=customer
+    ).save()
+    resolver = Resolver()
+    server.requests.clear()
+
+    resolved = resolver.resolve(
+        [_invoice([products[0]["productId"]]), _invoice([products[0]["productId"], 999])],
+        "lines.productId",
+    )
+    assert list(resolved) == [products[0]["productId"]]
+    assert len(server.requests) == 2
+
+    resolver.resolve([_invoice([999])], "lines.productId")
+    assert len(server.requests) == 2
+
+    resolver.add([customer])
+    assert resolver.resolve([project], "contact.contactId") == {customer.contactId: customer}
+    assert len(server.requests) == 2
+
+
+def test_unknown_reference():
+    with pytest.raises(ValueError):
+        Resolver().resolve([], "lines.somethingId")
@@ -0,0 +1,113 @@
+import datetime
+
+import pytest
+
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.models import Company, CreditNote, Invoice, Product, Sale
+
+pytest.importorskip("numpy")
+
+from fiken_py.sales_analytics import ProductSales  # noqa: E402
+
+
+def _line(product_id: int, quantity: int, net: int, name: str = "Widget") -> dict:
+    return {
+        "productId": product_id,
+        "productName": name,
+        "quantity": quantity,
+        "net": net,
+        "vat": net // 4,
+        "gross": net + net // 4,
+    }
+
+
+PRODUCTS = [
+    {"productId": 1, "name": "Widget", "vatType": "HIGH"},
+    {"productId": 2, "name": "Gadget", "vatType": "HIGH"},
+]
+INVOICES = [
+    {"invoiceId": 10, "issueDate": "2024-03-01", "sale": {"saleId": 100},
+     "lines": [_line(1, 2, 2000), _line(1, 1, 1000), _line(2, 1, 500, "Gadget")]},
+    {"invoiceId": 11, "issueDate": "2024-03-02", "sale": {"saleId": 101},
+     "lines": [_line(1, 4, 4000)]},
+    {"invoiceId": 12, "issueDate": "2024-03-09", "lines": [_line(2, 3, 1500, "Gadget")]},
+]
+CREDIT_NOTES = [
+    {"creditNoteId": 20, "issueDate": "2024-03-02", "sale": {"saleId": 100},
+     "lines": [_line(1, 1, 1000)]},
+]
+SALES = [
+    # Represented by invoice 10
+    {"saleId": 100, "date": "2024-03-01", "lines": [{"netPrice": 3500, "vat": 875}]},
+    {"saleId": 102, "date": "2024-03-05", "lines": [{"netPrice": 800, "vat": 200}]},
+]
+
+MARCH_1 = datetime.date(2024, 3, 1)
+MARCH_2 = datetime.date(2024, 3, 2)
+MARCH_9 = datetime.date(2024, 3, 9)
+
+
+@pytest.fixture
+def sales() -> ProductSales:
+    return ProductSales(
+        invoices=INVOICES, credit_notes=CREDIT_NOTES, sales=SALES, products=PRODUCTS
+    )
+
+
+def test_report_for_timeframe(sales: ProductSales):
+    reports = {r.product.productId: r for r in sales.report(MARCH_1, MARCH_2)}
+
+    # Sale 102 is on March 5, and sale 100 is represented by invoice 10
+    assert set(reports) == {1, 2}
+    widget = reports[1]
+    assert widget.product.name == "Widget"
+    assert widget.sold.model_dump() == {
+        "count": 7, "sales": 2, "netAmount": 7000, "vatAmount": 1750, "grossAmount": 8750
+    }
+    assert widget.credited.netAmount == 1000
+    assert widget.sum.netAmount == 6000
+    assert widget.sum.count == 6
+    assert widget.sum.sales == 3
+    assert reports[2].sold.count == 1
+
+
+def test_series_over_many_periods(sales: ProductSales):
+    days = [(MARCH_1 + datetime.timedelta(days=i),) * 2 for i in range(10)]
+    weeks = [
+        (MARCH_1, datetime.date(2024, 3, 7)),
+        (datetime.date(2024, 3, 8), datetime.date(2024, 3, 14)),
+    ]
+
+    series = sales.series(days + weeks)
+
+    assert series.series(1)[:3] == [3000, 3000, 0]
+    assert series.series(1, "count", kind="credited")[1] == 1
+    assert series.series(2)[-2:] == [500, 1500]
+    assert series.series(None)[4] == 800
+    assert series.series(None, "grossAmount")[-2] == 1000
+    assert series.series(99) == [0] * 12
+    assert [r.product.productId for r in series.report(weeks[1])] == [2]
+    assert series.report(days[0])[0].product.productId == 1
+
+
+def test_products_without_catalog_use_line_names():
+    sales = ProductSales(invoices=INVOICES[2:])
+
+    (report,) = sales.report(MARCH_9, MARCH_9)
+    assert report.product.productId == 2
+    assert report.product.name == "Gadget"
+
+
+def test_product_sales_from_api(server: FakeFikenServer):
+    server.add(Product, PRODUCTS)
+    server.add(Invoice, INVOICES)
+    server.add(CreditNote, CREDIT_NOTES)
+    server.add(Sale, SALES)
+    company = Company.get(companySlug=server.company_slug)
+
+    sales = company.get_product_sales()
+
+    assert len(sales) == 6
+    reports = sales.report(MARCH_1, MARCH_9)
+    totals = {r.product and r.product.productId: r.sum.netAmount for r in reports}
+    assert totals == {1: 6000, 2: 2000, None: 800}
@@ -0,0 +1,91 @@
+import datetime
+
+import pytest
+
+from fiken_py.fake_server import FakeFikenServer
+from fiken_py.models import Company, Contact, Invoice, Product
+from fiken_py.search import SearchIndex
+from fiken_py.sync import IncrementalSync
+
+ADDRESS = {"streetAddress": "Storgata 1", "postCode": "0155", "city": "Oslo", "country": "Norge"}
+CONTACTS = [
+    {"contactId": 1, "name": "Hansen Regnskap AS", "email": "post@hansen.no",
+     "phoneNumber": "+47 912 34 567", "address": ADDRESS,
+     "contactPerson": [{"contactPersonId": 11, "name": "Kari Nordmann",
+                        "email": "kari@hansen.no"}]},
+    {"contactId": 2, "name": "Bjørn Bygg", "organizationNumber": "987654321",
+     "address": dict(ADDRESS, city="Tromsø")},
+    {"contactId": 3, "name": "Regnskapshuset", "phoneNumber": "41234567"},
+]
+PRODUCTS = [{"productId": 5, "name": "Regnskapstime", "productNumber": "RT-1", "vatType": "HIGH"}]
+INVOICES = [
+    {"invoiceId": 7, "invoiceNumber": 10050, "kid": "0000123", "issueDate": "2024-03-01",
+     "yourReference": "Prosjekt Fjordutsikt", "customer": {"contactId": 2, "name": "Bjørn Bygg"}},
+]
+
+
+@pytest.fixture
+def index() -> SearchIndex:
+    return SearchIndex(
+        [Contact.model_validate(c) for c in CONTACTS]
+        + [Product.model_validate(p) for p in PRODUCTS]
+        + [Invoice.model_validate(i) for i in INVOICES]
+    )
+
+
+def _ids(objects) -> list:
+    return [(type(obj).__name__, obj.id_attr[1]) for obj in objects]
+
+
+def test_search_by_partial_words(index: SearchIndex):
+    assert len(index) == 6
+    assert _ids(index.search("regnskap")) == [("Contact", 1), ("Contact", 3), ("Product", 5)]
+    assert _ids(index.search("hans REGN")) == [("Contact", 1)]
+    assert _ids(index.search("bjorn")) == [("Contact", 2), ("Invoice", 7)]
+    assert _ids(index.search("tromsø")) == [("Contact", 2)]
+    assert _ids(index.search("kari@hansen")) == [("ContactPerson", 11)]
+    assert _ids(index.search("regnskap", models=[Product])) == [("Product", 5)]
+    assert index.search("regnskap", limit=1)[0].contactId == 1
+    assert index.search("nothing") == []
+    assert index.search("  ") == []
+
+
+def test_search_phone_and_references(index: SearchIndex):
+    assert _ids(index.search("912 34")) == [("Contact", 1)]
+    assert _ids(index.search("+4791234567")) == [("Contact", 1)]
+    # The country code is left out of partial numbers, whether or not it is stored
+    assert _ids(index.search("+47 912")) == [("Contact", 1)]
+    assert _ids(index.search("+47 412")) == [("Contact", 3)]
+    assert _ids(index.search("0047 4123")) == [("Contact", 3)]
+    assert _ids(index.search("+47")) == [("Contact", 1)]
+    assert _ids(index.search("10050")) == [("Invoice", 7)]
+    assert _ids(index.search("fjordutsikt")) == [("Invoice", 7)]
+    assert _ids(index.search("987654")) == [("Contact", 2)]
+
+
+def test_updates_replace_and_remove(index: SearchIndex):
+    index.add([Contact(contactId=1, name="Olsen Revisjon")])
+
+    assert index.search("hansen") == []
+    assert index.search("kari") == []
+    assert _ids(index.search("revisjon")) == [("Contact", 1)]
+
+    index.remove(Invoice, 7)
+    assert index.search("10050") == []
+    assert len(index) == 4
+
+
+def test_refresh_from_incremental_sync(server: FakeFikenServer):
+    server.add(Contact, CONTACTS[:2])
+    company = Company.get(companySlug=server.company_slug)
+    sync = IncrementalSync()
+
+    index = company.get_search_index()
+    assert _ids(index.search("bygg")) == [("Contact", CONTACTS[1]["contactId"])]
+
+    server.add(Contact, [{"contactId": 9, "name": "Byggmester Hansen",
+                          "lastModifiedDate": datetime.date.today().isoformat()}])
+    deltas = index.refresh(sync)
+
+    assert sum(len(delta.changed) for delta in deltas) == 3
+    assert [obj.name for obj in index.search("bygg")] == ["Bjørn Bygg", "Byggmester Hansen"]
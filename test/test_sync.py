@@ -0,0 +1,99 @@
+import datetime
+
+import pytest
+import requests_mock
+
+from fiken_py.fiken_object import FikenObject, RequestMethod
+from fiken_py.models import Contact, BankAccount
+from fiken_py.sync import IncrementalSync, MemoryStore, FileStore
+
+SLUG = "test-company"
+
+
+@pytest.fixture(autouse=True)
+def set_auth_token():
+    FikenObject.clear_auth_token()
+    FikenObject.set_auth_token("SAMPLE_TOKEN")
+    yield
+    FikenObject.clear_auth_token()
+
+
+@pytest.fixture
+def m():
+    with requests_mock.Mocker() as m:
+        yield m
+
+
+def _contacts_url():
+    return Contact._get_method_base_URL(RequestMethod.GET_MULTIPLE).format(
+        companySlug=SLUG
+    )
+
+
+def _contact(contact_id, name, modified):
+    return {"contactId": contact_id, "name": name, "lastModifiedDate": modified}
+
+
+def test_first_sync_is_full(m: requests_mock.Mocker):
+    m.get(
+        _contacts_url(),
+        json=[_contact(1, "A", "2024-01-01"), _contact(2, "B", "2024-02-01")],
+    )
+    engine = IncrementalSync()
+
+    delta = engine.sync(Contact, companySlug=SLUG)
+
+    assert "lastModifiedGe" not in m.last_request.qs
+    assert len(delta.created) == 2
+    assert delta.highWaterMark == datetime.date(2024, 2, 1)
+    assert engine.store.get_high_water_mark(Contact, SLUG) == datetime.date(2024, 2, 1)
+
+
+def test_second_sync_uses_high_water_mark(m: requests_mock.Mocker):
+    m.get(
+        _contacts_url(),
+        json=[_contact(1, "A", "2024-01-01"), _contact(2, "B", "2024-02-01")],
+    )
+    engine = IncrementalSync(MemoryStore())
+    engine.sync(Contact, companySlug=SLUG)
+
+    m.get(
+        _contacts_url(),
+        json=[
+            _contact(2, "B", "2024-02-01"),
+            _contact(1, "A renamed", "2024-02-03"),
+            _contact(3, "C", "2024-02-03"),
+        ],
+    )
+    delta = engine.sync(Contact, companySlug=SLUG)
+
+    assert m.last_request.qs["lastmodifiedge"] == ["2024-02-01"]
+    assert [c.contactId for c in delta.created] == [3]
+    assert [c.contactId for c in delta.updated] == [1]
+    assert delta.unchanged == 1
+    assert delta.highWaterMark == datetime.date(2024, 2, 3)
+    assert engine.store.get_object(Contact, SLUG, 1).name == "A renamed"
+    assert len(engine.store.objects(Contact, SLUG)) == 3
+
+
+def test_file_store_persists_between_runs(m: requests_mock.Mocker, tmp_path):
+    m.get(_contacts_url(), json=[_contact(1, "A", "2024-01-01")])
+    IncrementalSync(FileStore(str(tmp_path))).sync(Contact, companySlug=SLUG)
+
+    store = FileStore(str(tmp_path))
+    assert store.get_high_water_mark(Contact, SLUG) == datetime.date(2024, 1, 1)
+    assert store.get_object(Contact, SLUG, 1).name == "A"
+
+
+def test_unsyncable_model(m: requests_mock.Mocker):
+    with pytest.raises(ValueError):
+        IncrementalSync().sync(BankAccount, companySlug=SLUG)
+
+    url = BankAccount._get_method_base_URL(RequestMethod.GET_MULTIPLE).format(companySlug=SLUG)
+    m.get(url, json=[{"bankAccountId": 1, "name": "Drift", "accountCode": "1920:10001",
+                      "bankAccountNumber": "12345678903", "type": "normal"}])
+    sync = IncrementalSync()
+
+    assert len(sync.sync(BankAccount, companySlug=SLUG, full=True).created) == 1
+    delta = sync.sync(BankAccount, companySlug=SLUG, full=True)
+    assert (delta.unchanged, delta.highWaterMark) == (1, None)
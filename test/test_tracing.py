@@ -0,0 +1,88 @@
+import pytest
+
+from fiken_py import tracing
+from fiken_py.errors import RequestErrorException
+from fiken_py.models import Company, Contact, InvoiceDraft
+
+
+@pytest.fixture
+def tracer():
+    tracer = tracing.RecordingTracer()
+    tracing.set_tracer(tracer)
+    yield tracer
+    tracing.set_tracer(None)
+
+
+def _tree(span: tracing.RecordedSpan):
+    return (span.name, [_tree(child) for child in span.children])
+
+
+def test_save_has_request_children(server, tracer):
+    Contact(name="Test").save()
+
+    (root,) = tracer.roots
+    assert _tree(root) == (
+        "Contact.save",
+        [("HTTP POST", []), ("HTTP GET", [])],
+    )
+    post, get = root.children
+    assert post.attributes["url.template"] == "/companies/{companySlug}/contacts/"
+    assert post.attributes["http.response.status_code"] == 201
+    assert get.attributes["url.template"] == "/companies/{companySlug}/contacts/{contactId}"
+
+
+def test_submit_and_credit_note_waterfall(server, tracer):
+    contact = Contact(name="Customer", customer=True).save()
+    line = {
+        "description": "Line",
+        "unitPrice": 1000,
+        "quantity": 1,
+        "vatType": "HIGH",
+        "incomeAccount": "3000",
+    }
+    stored = server.add(
+        InvoiceDraft,
+        [{"type": "invoice", "customerId": contact.contactId, "lines": [line]}],
+    )
+    tracer.clear()
+
+    invoice = InvoiceDraft(**stored[0]).submit_object()
+    company = Company.get(companySlug=server.company_slug)
+    tracer.roots.pop()
+    company.create_credit_note_from_invoice_full(invoiceId=invoice.invoiceId)
+
+    submit, credit = tracer.roots
+    assert _tree(submit) == (
+        "InvoiceDraft.submit_object",
+        [("HTTP POST", []), ("HTTP GET", [])],
+    )
+    assert _tree(credit) == (
+        "Company.create_credit_note_from_invoice_full",
+        [
+            (
+                "CreditNote.create_from_invoice_full",
+                [("Invoice.get", [("HTTP GET", [])]), ("HTTP POST", []), ("HTTP GET", [])],
+            )
+        ],
+    )
+    assert "HTTP POST /companies/{companySlug}/invoices/drafts/{draftId}/createInvoice -> 201" in (
+        tracer.waterfall()
+    )
+
+
+def test_errors_are_recorded(server, tracer):
+    server.inject_errors(1, status=500)
+    with pytest.raises(RequestErrorException):
+        Contact.getAll()
+
+    (root,) = tracer.roots
+    assert _tree(root) == ("Contact.getAll", [("HTTP GET", [])])
+    assert isinstance(root.error, RequestErrorException)
+    assert root.children[0].attributes["http.response.status_code"] == 500
+
+
+def test_no_spans_when_disabled(server):
+    assert not tracing.get_tracer().enabled
+    with tracing.get_tracer().start_span("Ignored") as span:
+        span.set_attribute("key", "value")
+    assert Contact.getAll() == []
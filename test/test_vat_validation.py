@@ -37,3 +37,71 @@ def test_sale_high_forbidden():
     assert (
         VATValidator.validate_vat_type_sale(vat_outside, account_code="3210") is False
     )
+
+
+def test_account_index_matches_patterns():
+    for vat_type, (_, match_codes) in VATValidator.vat_types_product_sale.items():
+        for account in [f"{i:04d}" for i in range(3000, 4000)] + ["1500:10001", "31"]:
+            correct = any(
+                VATValidator._account_match(account, code)
+                for code in match_codes
+                if not code.startswith("-")
+            )
+            forbidden = any(
+                VATValidator._account_match(account, code)
+                for code in match_codes
+                if code.startswith("-")
+            )
+            assert VATValidator.validate_vat_type_sale(
+                vat_type, account_code=account
+            ) == (correct and not forbidden)
+
+
+def test_validate_sale_lines():
+    np = pytest.importorskip("numpy")
+
+    result = VATValidator.validate_sale_lines(
+        [
+            "HIGH",
+            "high",
+            "MEDIUM",
+            "OUTSIDE",
+            "UNKNOWN",
+            "HIGH",
+            "EXEMPT_IMPORT_EXPORT",
+            "EXEMPT_REVERSE",
+        ],
+        account_codes=["3000", "3010", "3000", "3210", "3000", "30x0", "3100", "1234"],
+        percentages=[25, None, 15, 0, None, 25, None, 99],
+    )
+
+    assert result.valid.tolist() == [True, True, False, False, False, False, False, True]
+    assert result.messages() == {
+        2: "Account is not valid for the VAT type",
+        3: "Account is not valid for the VAT type",
+        4: "Unknown VAT type",
+        5: "Account code is not a valid account",
+        6: "Account is not valid for the VAT type",
+    }
+
+    percentages = VATValidator.validate_sale_lines(
+        [VatTypeProductSale.HIGH, VatTypeProductSale.LOW], percentages=np.array([25, 15])
+    )
+    assert percentages.invalid_lines.tolist() == [1]
+    assert percentages.messages()[1] == "Percentage does not match the VAT type"
+
+
+def test_validate_sale_lines_matches_single_validation():
+    pytest.importorskip("numpy")
+    vat_types = list(VATValidator.vat_types_product_sale)
+    accounts = [f"{i:04d}" for i in range(3000, 3300)]
+    lines = [(vat_type, account) for vat_type in vat_types for account in accounts]
+
+    result = VATValidator.validate_sale_lines(
+        [vat_type for vat_type, _ in lines], account_codes=[a for _, a in lines]
+    )
+
+    assert result.valid.tolist() == [
+        VATValidator.validate_vat_type_sale(vat_type, account_code=account)
+        for vat_type, account in lines
+    ]
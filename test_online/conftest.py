@@ -6,6 +6,7 @@ import random
 import dotenv
 import pytest
 
+from fiken_py.fake_server import FakeFikenServer
 from fiken_py.fiken_object import FikenObject
 from fiken_py.shared_enums import VatTypeProduct
 from fiken_py.models import (
@@ -20,6 +21,15 @@ from fiken_py.models import (
 def set_auth_token():
     dotenv.load_dotenv("test_online/.env")
 
+    if os.getenv("FIKEN_FAKE_SERVER"):
+        # Run against a local stand-in instead of a live Fiken account
+        with FakeFikenServer() as server:
+            FikenObject.set_auth_token("FAKE_TOKEN")
+            FikenObject.set_company_slug(server.company_slug)
+            os.environ["FIKEN_COMPANY_SLUG"] = server.company_slug
+            yield
+        return
+
     FikenObject.set_auth_token(os.getenv("FIKEN_API_TOKEN"))
     FikenObject.set_company_slug(os.getenv("FIKEN_COMPANY_SLUG"))
 